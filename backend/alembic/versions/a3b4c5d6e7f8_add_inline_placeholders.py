@@ -0,0 +1,32 @@
+"""add inline blurhash and tiny JPEG placeholders
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3b4c5d6e7f8'
+down_revision: Union[str, None] = 'f2a3b4c5d6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('processing_jobs', 'style_jobs', 'fusion_artworks', 'photos')
+
+
+def upgrade() -> None:
+    # Existing rows have no placeholders; clients show their default tile
+    for table in TABLES:
+        op.add_column(table, sa.Column('blurhash', sa.String(length=64), nullable=True))
+        op.add_column(table, sa.Column('placeholder', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'placeholder')
+        op.drop_column(table, 'blurhash')
@@ -0,0 +1,25 @@
+"""add export job master key
+
+Revision ID: a7b8c9d0e1f2
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'd3e4f5a6b7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('export_jobs', sa.Column('master_s3_key', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('export_jobs', 'master_s3_key')
@@ -0,0 +1,31 @@
+"""add photo perceptual hash and reused processing results
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c5d6e7f8a9'
+down_revision: Union[str, None] = 'a3b4c5d6e7f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Photos uploaded before this have no hash and are never matched
+    op.add_column('photos', sa.Column('perceptual_hash', sa.BigInteger(), nullable=True))
+    op.create_index(op.f('ix_photos_perceptual_hash'), 'photos', ['perceptual_hash'], unique=False)
+    op.add_column('processing_jobs', sa.Column('reused_from_job_id', postgresql.UUID(as_uuid=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('processing_jobs', 'reused_from_job_id')
+    op.drop_index(op.f('ix_photos_perceptual_hash'), table_name='photos')
+    op.drop_column('photos', 'perceptual_hash')
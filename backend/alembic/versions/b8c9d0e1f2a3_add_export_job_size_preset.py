@@ -0,0 +1,29 @@
+"""add export job size preset
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+size_preset_enum = sa.Enum('HD', 'PRINT', 'PRINT_XL', name='exportsizepreset')
+
+
+def upgrade() -> None:
+    size_preset_enum.create(op.get_bind(), checkfirst=True)
+    op.add_column('export_jobs', sa.Column('size_preset', size_preset_enum, nullable=False, server_default='HD'))
+
+
+def downgrade() -> None:
+    op.drop_column('export_jobs', 'size_preset')
+    size_preset_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""index photos by user and creation date
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d6e7f8a9b0'
+down_revision: Union[str, None] = 'b4c5d6e7f8a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Near-duplicate matching scans a user's latest photos by Hamming
+    # distance, which a B-tree on the hash itself never serves
+    op.drop_index(op.f('ix_photos_perceptual_hash'), table_name='photos')
+    op.create_index('ix_photos_user_id_created_at', 'photos', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photos_user_id_created_at', table_name='photos')
+    op.create_index(op.f('ix_photos_perceptual_hash'), 'photos', ['perceptual_hash'], unique=False)
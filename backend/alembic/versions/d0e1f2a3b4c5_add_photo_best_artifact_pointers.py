@@ -0,0 +1,96 @@
+"""add photo best artifact pointers
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('photos', sa.Column('latest_processing_job_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('photos', sa.Column('latest_style_job_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('photos', sa.Column('best_result_s3_key', sa.String(), nullable=True))
+    op.add_column('photos', sa.Column('best_mask_s3_key', sa.String(), nullable=True))
+    op.add_column('photos', sa.Column('best_mask_vector', sa.LargeBinary(), nullable=True))
+    op.add_column('photos', sa.Column('best_thumbnail_s3_key', sa.String(), nullable=True))
+    op.add_column('photos', sa.Column('style_job_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill with the same priority as refresh_best_artifacts: the latest
+    # completed style job (masked by its processing job) wins over the
+    # latest completed processing job
+    op.execute("""
+        WITH latest_style AS (
+            SELECT DISTINCT ON (sj.photo_id)
+                sj.photo_id, sj.id, sj.result_s3_key, sj.preview_s3_key,
+                pj.mask_s3_key, pj.mask_vector
+            FROM style_jobs sj
+            LEFT JOIN processing_jobs pj ON pj.id = sj.processing_job_id
+            WHERE sj.status = 'COMPLETED'
+            ORDER BY sj.photo_id, sj.created_at DESC
+        ),
+        latest_processing AS (
+            SELECT DISTINCT ON (photo_id)
+                photo_id, id, result_s3_key, mask_s3_key, mask_vector
+            FROM processing_jobs
+            WHERE status = 'completed'
+            ORDER BY photo_id, created_at DESC
+        ),
+        style_counts AS (
+            SELECT photo_id, count(*) AS style_job_count
+            FROM style_jobs
+            WHERE status = 'COMPLETED'
+            GROUP BY photo_id
+        ),
+        best AS (
+            SELECT
+                p.id AS photo_id,
+                lp.id AS processing_job_id,
+                ls.id AS style_job_id,
+                ls.result_s3_key IS NOT NULL AND ls.mask_s3_key IS NOT NULL AS use_style,
+                lp.result_s3_key IS NOT NULL AND lp.mask_s3_key IS NOT NULL AS use_processing,
+                ls.result_s3_key AS style_image, ls.mask_s3_key AS style_mask, ls.mask_vector AS style_vector,
+                lp.result_s3_key AS processing_image, lp.mask_s3_key AS processing_mask,
+                lp.mask_vector AS processing_vector,
+                COALESCE(ls.preview_s3_key, p.thumbnail_s3_key) AS thumbnail,
+                COALESCE(sc.style_job_count, 0) AS style_job_count
+            FROM photos p
+            LEFT JOIN latest_style ls ON ls.photo_id = p.id
+            LEFT JOIN latest_processing lp ON lp.photo_id = p.id
+            LEFT JOIN style_counts sc ON sc.photo_id = p.id
+        )
+        UPDATE photos SET
+            latest_processing_job_id = best.processing_job_id,
+            latest_style_job_id = best.style_job_id,
+            best_result_s3_key = CASE WHEN best.use_style THEN best.style_image
+                                      WHEN best.use_processing THEN best.processing_image END,
+            best_mask_s3_key = CASE WHEN best.use_style THEN best.style_mask
+                                    WHEN best.use_processing THEN best.processing_mask END,
+            best_mask_vector = CASE WHEN best.use_style THEN best.style_vector
+                                    WHEN best.use_processing THEN best.processing_vector END,
+            best_thumbnail_s3_key = best.thumbnail,
+            style_job_count = best.style_job_count
+        FROM best
+        WHERE photos.id = best.photo_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('photos', 'style_job_count')
+    op.drop_column('photos', 'best_thumbnail_s3_key')
+    op.drop_column('photos', 'best_mask_vector')
+    op.drop_column('photos', 'best_mask_s3_key')
+    op.drop_column('photos', 'best_result_s3_key')
+    op.drop_column('photos', 'latest_style_job_id')
+    op.drop_column('photos', 'latest_processing_job_id')
@@ -0,0 +1,30 @@
+"""add result rendition manifests
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('processing_jobs', 'style_jobs', 'fusion_artworks', 'export_jobs')
+
+
+def upgrade() -> None:
+    # Existing results have no renditions; responses fall back to result_url
+    for table in TABLES:
+        op.add_column(table, sa.Column('renditions', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'renditions')
@@ -52,6 +52,7 @@ async def request_hd_export(
             current_user.id,
             request.source_type,
             request.source_job_id,
+            request.size_preset,
         )
 
         # Submit to Celery by name (avoids importing cv2 in web process)
@@ -62,6 +63,7 @@ async def request_hd_export(
                 str(current_user.id),
                 job.source_s3_key,
                 job.is_paid,
+                job.size_preset.value,
             ],
             task_id=str(job.id),
             queue="default",
@@ -87,6 +87,7 @@ async def create_composition(
         circle_id=request.circle_id,
         layout=request.layout,
         db=db,
+        gutter=request.gutter,
     )
 
     if result["status"] == "consent_required":
@@ -1,6 +1,5 @@
 """Health check endpoints."""
 
-import boto3
 from botocore.exceptions import ClientError
 from typing import Any, Dict
 
@@ -12,6 +11,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app import __version__
 from app.api.deps import get_session
 from app.core.config import settings
+from app.services import fusion_cache
+from app.storage.async_s3 import async_s3_client
+from app.storage.s3 import get_client_stats
 
 router = APIRouter(tags=["health"])
 
@@ -51,6 +53,45 @@ async def health_check_redis() -> Dict[str, Any]:
         )
 
 
+@router.get("/health/storage")
+async def health_check_storage() -> Dict[str, Any]:
+    """Storage health check with client and presigned URL cache counters for this process."""
+    try:
+        await async_s3_client.check_bucket()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Storage connection failed: {str(e)}",
+        )
+    return {
+        "status": "healthy",
+        "service": "storage",
+        **get_client_stats(),
+        "presigned_urls": async_s3_client.presign_stats(),
+    }
+
+
+@router.get("/health/fusion-cache")
+async def health_check_fusion_cache() -> Dict[str, Any]:
+    """Fusion memo counters (shared across processes, kept in Redis)."""
+    try:
+        hits, misses, invalidations = await fusion_cache.get_memo_stats()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Fusion memo stats unavailable: {str(e)}",
+        )
+    lookups = hits + misses
+    return {
+        "status": "healthy",
+        "service": "fusion_cache",
+        "hits": hits,
+        "misses": misses,
+        "invalidations": invalidations,
+        "hit_rate": hits / lookups if lookups else None,
+    }
+
+
 @router.get("/health/liveness")
 async def health_liveness() -> Dict[str, Any]:
     """Liveness probe for container orchestration.
@@ -88,14 +129,8 @@ async def health_readiness(session: AsyncSession = Depends(get_session)) -> Dict
 
     # Check MinIO/S3 storage
     try:
-        s3_client = boto3.client(
-            "s3",
-            endpoint_url=settings.S3_ENDPOINT,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
-        )
-        # Try to head the bucket to verify access
-        s3_client.head_bucket(Bucket=settings.S3_BUCKET_NAME)
+        # Try to head the bucket to verify access (pooled client, off the event loop)
+        await async_s3_client.check_bucket()
         services_status["storage"] = "ok"
     except ClientError as e:
         services_status["storage"] = f"error: {str(e)}"
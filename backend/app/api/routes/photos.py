@@ -22,6 +22,7 @@ from app.services.photo import (
     get_photo,
     list_user_photos,
 )
+from app.workers.celery_app import celery_app
 
 router = APIRouter(prefix="/api/v1/photos", tags=["photos"])
 
@@ -57,7 +58,11 @@ async def confirm_upload(
     db: Annotated[AsyncSession, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> PhotoRead:
-    """Confirm that photo upload to S3 is complete and update metadata."""
+    """Confirm that photo upload to S3 is complete and queue its verification.
+
+    The reported metadata is provisional until the upload finalization task
+    has checked the object and written its thumbnails.
+    """
     photo = await confirm_photo_upload(
         db,
         current_user.id,
@@ -73,7 +78,12 @@ async def confirm_upload(
             detail="Photo not found or access denied",
         )
 
-    return generate_photo_read_with_urls(photo)
+    celery_app.send_task(
+        "app.workers.tasks.upload_finalization.finalize_photo_upload",
+        args=[str(photo.id)],
+    )
+
+    return await generate_photo_read_with_urls(photo)
 
 
 @router.get("", response_model=PhotoListResponse)
@@ -87,7 +97,7 @@ async def get_user_photos(
     photos, total = await list_user_photos(db, current_user.id, page, page_size)
 
     # Generate PhotoRead instances with presigned URLs
-    photo_reads = [generate_photo_read_with_urls(photo) for photo in photos]
+    photo_reads = [await generate_photo_read_with_urls(photo) for photo in photos]
 
     return PhotoListResponse(
         items=photo_reads,
@@ -112,7 +122,7 @@ async def get_single_photo(
             detail="Photo not found or access denied",
         )
 
-    return generate_photo_read_with_urls(photo)
+    return await generate_photo_read_with_urls(photo)
 
 
 @router.delete("/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -121,7 +131,7 @@ async def delete_user_photo(
     db: Annotated[AsyncSession, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> None:
-    """Delete photo from S3 and database."""
+    """Delete photo from the database (S3 objects are deleted in the background)."""
     deleted = await delete_photo(db, current_user.id, photo_id)
 
     if not deleted:
@@ -34,6 +34,11 @@ async def submit_processing_job(
 ) -> JobResponse:
     """Submit a photo for AI processing.
 
+    With reuse_duplicate set, a near-duplicate of an already processed
+    photo reuses its result: the job is returned completed, with
+    reused_from_job_id set, and can be reprocessed to run the pipeline.
+    By default every photo is processed.
+
     Args:
         request: Job submission request with photo_id
         db: Database session
@@ -47,16 +52,19 @@ async def submit_processing_job(
     """
     try:
         # Create processing job
-        job = await create_processing_job(db, current_user.id, request.photo_id)
-
-        # Submit to Celery with high priority
-        celery_app.send_task(
-            "app.workers.tasks.processing.process_iris_pipeline",
-            args=[str(job.id), str(request.photo_id), str(current_user.id)],
-            task_id=str(job.id),
-            queue="high_priority",
+        job = await create_processing_job(
+            db, current_user.id, request.photo_id, reuse_duplicate=request.reuse_duplicate
         )
 
+        # Submit to Celery with high priority (unless a duplicate's result was reused)
+        if job.reused_from_job_id is None:
+            celery_app.send_task(
+                "app.workers.tasks.processing.process_iris_pipeline",
+                args=[str(job.id), str(request.photo_id), str(current_user.id)],
+                task_id=str(job.id),
+                queue="high_priority",
+            )
+
         return JobResponse(
             job_id=job.id,
             status=job.status,
@@ -64,6 +72,7 @@ async def submit_processing_job(
             progress=job.progress,
             created_at=job.created_at,
             websocket_url=f"/ws/jobs/{job.id}",
+            reused_from_job_id=job.reused_from_job_id,
         )
 
     except ValueError as e:
@@ -91,17 +100,20 @@ async def submit_batch_processing(
     for idx, photo_id in enumerate(request.photo_ids):
         try:
             # Create job
-            job = await create_processing_job(db, current_user.id, photo_id)
+            job = await create_processing_job(
+                db, current_user.id, photo_id, reuse_duplicate=request.reuse_duplicate
+            )
 
             # Submit with descending priority (first = 9, last = 0)
-            priority = len(request.photo_ids) - idx - 1
-            celery_app.send_task(
-                "app.workers.tasks.processing.process_iris_pipeline",
-                args=[str(job.id), str(photo_id), str(current_user.id)],
-                task_id=str(job.id),
-                queue="high_priority",
-                priority=priority,
-            )
+            if job.reused_from_job_id is None:
+                priority = len(request.photo_ids) - idx - 1
+                celery_app.send_task(
+                    "app.workers.tasks.processing.process_iris_pipeline",
+                    args=[str(job.id), str(photo_id), str(current_user.id)],
+                    task_id=str(job.id),
+                    queue="high_priority",
+                    priority=priority,
+                )
 
             jobs.append(
                 JobResponse(
@@ -111,6 +123,7 @@ async def submit_batch_processing(
                     progress=job.progress,
                     created_at=job.created_at,
                     websocket_url=f"/ws/jobs/{job.id}",
+                    reused_from_job_id=job.reused_from_job_id,
                 )
             )
 
@@ -192,7 +205,7 @@ async def reprocess_job(
     db: Annotated[AsyncSession, Depends(get_session)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> JobResponse:
-    """Reprocess a job (creates new job for same photo).
+    """Reprocess a job (creates new job for same photo, never reusing a duplicate's result).
 
     Args:
         job_id: Original job ID
@@ -0,0 +1,36 @@
+"""Signed object routes for the local filesystem storage backend.
+
+Only mounted when STORAGE_BACKEND is "local": they stand in for the S3
+endpoint that presigned URLs would otherwise point at.
+"""
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from app.storage import local
+from app.storage.s3 import s3_client
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+
+def _check_signature(method: str, key: str, expires: int, signature: str) -> None:
+    if not local.verify(method, key, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+
+
+@router.get("/{key:path}")
+async def get_object(key: str, expires: int, signature: str) -> FileResponse:
+    """Serve an object for a presigned GET URL."""
+    _check_signature("GET", key, expires, signature)
+    head = s3_client.head(key)
+    if head is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Object not found")
+    return FileResponse(s3_client.path_for(key), media_type=head["ContentType"], headers={"ETag": head["ETag"]})
+
+
+@router.put("/{key:path}", status_code=status.HTTP_200_OK)
+async def put_object(key: str, expires: int, signature: str, request: Request, content_type: str = "") -> None:
+    """Store an object for a presigned PUT URL."""
+    _check_signature("PUT", key, expires, signature)
+    data = await request.body()
+    s3_client.upload_file(key, data, content_type or request.headers.get("content-type", "application/octet-stream"))
@@ -11,12 +11,15 @@ from app.api.dependencies.rate_limit import check_ai_generation_limit
 from app.models.processing_job import ProcessingJob
 from app.models.user import User
 from app.schemas.styles import (
+    PreviewFormat,
     StyleJobListResponse,
     StyleJobResponse,
     StyleJobSubmitRequest,
     StyleListResponse,
     StylePresetResponse,
 )
+from app.services import fusion_cache
+from app.services.encoding import resolve_format
 from app.services.rate_limiting import RateLimitService
 from app.services.styles import (
     create_style_job,
@@ -25,7 +28,7 @@ from app.services.styles import (
     list_presets,
     list_style_jobs,
 )
-from app.storage.s3 import s3_client
+from app.storage.async_s3 import async_s3_client
 from app.workers.celery_app import celery_app
 
 router = APIRouter(prefix="/api/v1/styles", tags=["styles"])
@@ -49,7 +52,7 @@ async def get_style_presets(
     for preset in presets["free"]:
         thumbnail_url = None
         if preset.thumbnail_s3_key:
-            thumbnail_url = s3_client.generate_presigned_url(preset.thumbnail_s3_key, expiration=3600)
+            thumbnail_url = await async_s3_client.generate_presigned_url(preset.thumbnail_s3_key, expiry=3600)
 
         free_responses.append(
             StylePresetResponse(
@@ -68,7 +71,7 @@ async def get_style_presets(
     for preset in presets["premium"]:
         thumbnail_url = None
         if preset.thumbnail_s3_key:
-            thumbnail_url = s3_client.generate_presigned_url(preset.thumbnail_s3_key, expiration=3600)
+            thumbnail_url = await async_s3_client.generate_presigned_url(preset.thumbnail_s3_key, expiry=3600)
 
         premium_responses.append(
             StylePresetResponse(
@@ -177,6 +180,7 @@ async def apply_style(
                 photo_s3_key,
                 preset.name,
                 preset.model_s3_key,
+                resolve_format(request.preview_format),
             ],
             task_id=str(job.id),
             queue="high_priority",
@@ -185,6 +189,9 @@ async def apply_style(
         # Increment rate limit usage after successful dispatch
         await RateLimitService.increment_usage(db, current_user)
 
+        # Restyling changes the photo's fusion source artifact
+        await fusion_cache.invalidate_sources([request.photo_id])
+
         return await generate_job_response_with_urls(db, job)
 
     except ValueError as e:
@@ -267,6 +274,7 @@ async def generate_ai_art_endpoint(
     current_user: Annotated[User, Depends(check_ai_generation_limit)],
     prompt: str | None = None,
     style_hint: str | None = None,
+    preview_format: PreviewFormat = "jpeg",
 ) -> StyleJobResponse:
     """Submit AI art generation job.
 
@@ -282,6 +290,7 @@ async def generate_ai_art_endpoint(
         current_user: Authenticated user (rate-limited for free users)
         prompt: Optional user prompt for generation
         style_hint: Optional style hint (cosmic, abstract, watercolor, etc.)
+        preview_format: Encoding of the stored preview (WebP/AVIF only if the client decodes them)
 
     Returns:
         StyleJobResponse with job details and WebSocket URL
@@ -343,6 +352,7 @@ async def generate_ai_art_endpoint(
                 str(processing_job_id),
                 prompt,
                 style_hint,
+                resolve_format(preview_format),
             ],
             task_id=str(ai_job.id),
             queue="high_priority",
@@ -356,6 +366,9 @@ async def generate_ai_art_endpoint(
         # Increment rate limit usage after successful dispatch
         await RateLimitService.increment_usage(db, current_user)
 
+        # AI art changes the photo's fusion source artifact
+        await fusion_cache.invalidate_sources([photo_id])
+
         return await generate_job_response_with_urls(db, ai_job)
 
     except ValueError as e:
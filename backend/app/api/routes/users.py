@@ -8,10 +8,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user, get_session
 from app.models.user import User
-from app.schemas.privacy import AccountDeletionRequest, AccountDeletionResponse
+from app.schemas.privacy import (
+    AccountDeletionRequest,
+    AccountDeletionResponse,
+    AccountDeletionStatusResponse,
+)
 from app.schemas.user import UserRead
+from app.services.account_deletion import get_deletion_status
 from app.services.user import delete_user_account
-from app.storage.s3 import s3_client
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +49,8 @@ async def delete_current_user_account(
     """Delete current user account and all associated data (GDPR Article 17).
 
     This implements the "Right to be Forgotten" by removing:
-    - All S3 objects (iris images, generated art, exports)
+    - All S3 objects (originals, results, exports, fusions), in the background;
+      track with GET /deletions/{deletion_id}
     - All refresh tokens from Redis
     - All consent records from database
     - User record from database
@@ -69,15 +74,43 @@ async def delete_current_user_account(
     deleted_at = datetime.now(timezone.utc)
 
     # Delete account and all data
-    await delete_user_account(
+    deletion_id = await delete_user_account(
         db=db,
         user_id=current_user.id,
-        s3_client=s3_client,
     )
 
     logger.info(f"Account deleted via API: user_id={current_user.id}")
 
     return AccountDeletionResponse(
-        message="Account and all associated data have been permanently deleted",
+        message="Account deleted. Stored files are being permanently deleted in the background",
         deleted_at=deleted_at,
+        deletion_id=deletion_id,
+    )
+
+
+@router.get("/deletions/{deletion_id}", response_model=AccountDeletionStatusResponse)
+async def get_account_deletion_status(deletion_id: str) -> AccountDeletionStatusResponse:
+    """Get progress of the background file deletion of a deleted account.
+
+    Unauthenticated, since the account no longer exists: the deletion ID
+    is an unguessable UUID, and only counts are returned.
+
+    Returns:
+        Deletion status and progress counts
+
+    Raises:
+        HTTPException: If the deletion is unknown or its status expired (404)
+    """
+    progress = await get_deletion_status(deletion_id)
+    if not progress:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deletion not found")
+
+    return AccountDeletionStatusResponse(
+        deletion_id=deletion_id,
+        status=progress["status"],
+        objects_deleted=int(progress["deleted"]),
+        objects_failed=int(progress["failed"]),
+        passes=int(progress["passes"]),
+        prefixes_done=int(progress["prefixes_done"]),
+        prefixes_total=int(progress["prefixes_total"]),
     )
@@ -16,7 +16,7 @@ from app.core.config import settings
 from app.core.db import async_session_maker
 from app.models.processing_job import ProcessingJob
 from app.models.user import User
-from app.storage.s3 import s3_client
+from app.storage.async_s3 import async_s3_client
 from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
@@ -148,7 +148,8 @@ async def job_progress_websocket(websocket: WebSocket, job_id: str, token: Optio
 
     Message types sent:
         - Progress: {job_id, status, progress, step, timestamp}
-        - Completion: extends Progress with {result_url, processing_time_ms, dimensions}
+        - Completion: extends Progress with {result_url, processing_time_ms, dimensions,
+          blurhash, placeholder}
         - Error: extends Progress with {error_type, message, suggestion}
     """
     await websocket.accept()
@@ -219,7 +220,7 @@ async def job_progress_websocket(websocket: WebSocket, job_id: str, token: Optio
                 # Determine current state (prefer Celery state for in-progress, DB for completed/failed)
                 if job.status == "completed":
                     # Job completed - send completion message
-                    result_url = s3_client.generate_presigned_url(job.result_s3_key, expiry=3600)
+                    result_url = await async_s3_client.generate_presigned_url(job.result_s3_key, expiry=3600)
 
                     await websocket.send_json(
                         {
@@ -232,6 +233,8 @@ async def job_progress_websocket(websocket: WebSocket, job_id: str, token: Optio
                             "processing_time_ms": job.processing_time_ms,
                             "result_width": job.result_width,
                             "result_height": job.result_height,
+                            "blurhash": job.blurhash,
+                            "placeholder": job.placeholder,
                         }
                     )
                     logger.info(f"Job {job_id} completed, closing WebSocket")
@@ -29,6 +29,24 @@ class Settings(BaseSettings):
     S3_ACCESS_KEY: str = "minioadmin"
     S3_SECRET_KEY: str = "minioadmin"
     S3_BUCKET_NAME: str = "iris-art"
+    S3_ASYNC_MAX_WORKERS: int = 16  # threads serving blocking S3 calls for the API event loop
+    S3_MAX_POOL_CONNECTIONS: int = 50  # per-process HTTP pool (async workers + transfer threads)
+    S3_RETRY_MODE: str = "standard"  # botocore retry mode: legacy, standard or adaptive
+    S3_MAX_ATTEMPTS: int = 5
+    S3_TRANSFER_CONCURRENCY: int = 8  # parallel parts per large upload/download
+
+    # Storage backend: "s3", or "local" (filesystem, for dev and tests without MinIO)
+    STORAGE_BACKEND: str = "s3"
+    LOCAL_STORAGE_ROOT: str = ""  # empty means {tmpdir}/irisvue-storage
+    LOCAL_STORAGE_BASE_URL: str = "http://localhost:8000"  # API base serving /storage/ URLs
+
+    # Uploaded photo limits, checked server-side before thumbnails are generated
+    PHOTO_MAX_BYTES: int = 30 * 1024 * 1024
+    PHOTO_MAX_PIXELS: int = 60_000_000  # decompression-bomb guard, from the image header
+
+    # Worker read-through cache of decoded images
+    IMAGE_CACHE_DIR: str = ""  # empty means {tmpdir}/irisvue-image-cache
+    IMAGE_CACHE_MAX_BYTES: int = 4 * 1024 * 1024 * 1024  # 0 disables the cache
 
     # JWT Authentication
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -50,5 +68,15 @@ class Settings(BaseSettings):
     # CDN
     CDN_BASE_URL: str = ""  # e.g., https://d1234.cloudfront.net — empty means direct MinIO
 
+    # AI generation (SDXL Turbo)
+    SD_BACKEND: str = "auto"  # auto (CUDA, then ONNX CPU), cuda, or onnx
+    SD_ONNX_MODEL_DIR: str = ""  # empty means app/workers/models/weights/sdxl_turbo_onnx
+    SD_ONNX_PRECISION: str = "fp16"  # fp16 or int8
+    SD_ONNX_SEQUENTIAL: bool = True  # keep only one ONNX component resident at a time
+    SD_ONNX_NUM_THREADS: int = 0  # 0 lets ONNX Runtime pick
+
+    # HD exports
+    WATERMARK_CACHE_DIR: str = ""  # empty means {tmpdir}/irisvue-watermarks
+
 
 settings = Settings()
@@ -23,6 +23,7 @@ from app.api.routes import (
     privacy,
     processing,
     purchases,
+    storage,
     styles,
     users,
     webhooks,
@@ -89,3 +90,7 @@ app.include_router(fusion.router)
 app.include_router(purchases.router, prefix="/api/v1/purchases", tags=["purchases"])
 app.include_router(webhooks.router, prefix="/api/v1/webhooks", tags=["webhooks"])
 app.include_router(websocket.router)
+
+if settings.STORAGE_BACKEND == "local":
+    # Serves the local backend's presigned URLs (S3 does this in production)
+    app.include_router(storage.router)
@@ -4,7 +4,7 @@ import enum
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -18,6 +18,22 @@ class ExportSourceType(str, enum.Enum):
     PROCESSED = "processed"
 
 
+class ExportSizePreset(str, enum.Enum):
+    """Output size preset for HD export."""
+
+    HD = "hd"  # 2048px, in-memory pipeline
+    PRINT = "print"  # 4096px, tiled streaming pipeline
+    PRINT_XL = "print_xl"  # 8192px, tiled streaming pipeline
+
+
+# Output edge length in pixels per preset
+EXPORT_SIZE_PIXELS = {
+    ExportSizePreset.HD: 2048,
+    ExportSizePreset.PRINT: 4096,
+    ExportSizePreset.PRINT_XL: 8192,
+}
+
+
 class ExportJobStatus(str, enum.Enum):
     """Status enum for HD export jobs."""
 
@@ -31,7 +47,8 @@ class ExportJob(Base):
     """HD export job tracking.
 
     Each job upscales a styled, AI-generated, or processed image to HD
-    resolution (2048x2048) and applies watermark based on payment status.
+    resolution (2048x2048, or 4096/8192 for print presets) and applies
+    watermark based on payment status.
 
     Attributes:
         id: UUID primary key
@@ -39,12 +56,15 @@ class ExportJob(Base):
         source_type: Type of source image (styled, ai_generated, processed)
         source_job_id: UUID of source job (StyleJob or ProcessingJob)
         source_s3_key: S3 key of source image to upscale
+        size_preset: Output size preset (hd, print, print_xl)
         status: Job status (pending, processing, completed, failed)
         progress: Progress percentage (0-100)
         current_step: Current processing step (user-facing)
         celery_task_id: Celery task ID for tracking
         is_paid: Whether user paid for watermark-free export
-        result_s3_key: S3 key for HD export result
+        master_s3_key: S3 key of the clean HD master shared by exports of the same source
+        result_s3_key: S3 key for HD export result (the master itself for paid exports)
+        renditions: Manifest of the result's downscaled renditions
         result_width: Result image width in pixels
         result_height: Result image height in pixels
         file_size_bytes: Result file size in bytes
@@ -62,6 +82,9 @@ class ExportJob(Base):
     source_type: Mapped[ExportSourceType] = mapped_column(Enum(ExportSourceType), nullable=False)
     source_job_id: Mapped[UUID] = mapped_column(String(36), nullable=False, index=True)
     source_s3_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    size_preset: Mapped[ExportSizePreset] = mapped_column(
+        Enum(ExportSizePreset), nullable=False, default=ExportSizePreset.HD
+    )
     status: Mapped[ExportJobStatus] = mapped_column(
         Enum(ExportJobStatus), nullable=False, default=ExportJobStatus.PENDING
     )
@@ -69,7 +92,9 @@ class ExportJob(Base):
     current_step: Mapped[str | None] = mapped_column(String(100), nullable=True)
     celery_task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     is_paid: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    master_s3_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
     result_s3_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    renditions: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     result_width: Mapped[int | None] = mapped_column(Integer, nullable=True)
     result_height: Mapped[int | None] = mapped_column(Integer, nullable=True)
     file_size_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,6 +49,9 @@ class FusionArtwork(Base):
     status: Mapped[str] = mapped_column(String, default="pending", nullable=False)
     result_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     thumbnail_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    renditions: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # see services/renditions
+    blurhash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # see services/placeholders
+    placeholder: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # ~32px JPEG data URI
     error_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     processing_time_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -39,9 +39,39 @@ class Photo(Base):
     width: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     height: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    # SHA-256 of the original, set by upload finalization
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+
+    # 64-bit pHash, set by upload finalization (see services/perceptual_hash)
+    perceptual_hash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+    # Inline gallery placeholders of the thumbnail (see services/placeholders)
+    blurhash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    placeholder: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     # Upload status tracking
     upload_status: Mapped[str] = mapped_column(String, default="pending", nullable=False)
 
+    # Best artifacts, maintained by the workers when a job completes (see
+    # app.services.fusion_sources.refresh_best_artifacts) and read by the
+    # fusion source resolution, the shared gallery and consent previews
+    # (best_thumbnail_s3_key is the latest style preview, else the photo's
+    # thumbnail). The job pointers carry no foreign key: jobs reference
+    # photos, and are only deleted together with their photo.
+    latest_processing_job_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    latest_style_job_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    best_result_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    best_mask_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    best_mask_vector: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    best_thumbnail_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    style_job_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -62,5 +92,8 @@ class Photo(Base):
         "StyleJob", back_populates="photo", cascade="all, delete-orphan"
     )
 
+    # A user's most recent photos (near-duplicate scan, galleries)
+    __table_args__ = (Index("ix_photos_user_id_created_at", "user_id", "created_at"),)
+
     def __repr__(self) -> str:
         return f"<Photo(id={self.id}, user_id={self.user_id}, status={self.upload_status})>"
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, LargeBinary, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -46,6 +46,14 @@ class ProcessingJob(Base):
     # Result storage
     result_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     mask_s3_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    renditions: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # see services/renditions
+    blurhash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # see services/placeholders
+    placeholder: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # ~32px JPEG data URI
+    # Completed job of a near-duplicate photo whose result this job reuses
+    reused_from_job_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    mask_vector: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, comment="Parametric mask (see workers/models/mask_codec)"
+    )
 
     # Performance and quality metrics
     processing_time_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
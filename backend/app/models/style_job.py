@@ -4,7 +4,7 @@ import enum
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -35,8 +35,11 @@ class StyleJob(Base):
         progress: Progress percentage (0-100)
         current_step: Current processing step (user-facing)
         celery_task_id: Celery task ID for tracking
-        preview_s3_key: S3 key for low-res preview (256x256 JPEG)
+        preview_s3_key: S3 key for low-res preview (256x256 JPEG, WebP or AVIF)
         result_s3_key: S3 key for full-res result (1024x1024 JPEG)
+        renditions: Manifest of the result's downscaled renditions
+        blurhash: BlurHash of the result
+        placeholder: Data URI of a ~32px JPEG of the result
         result_width: Result image width in pixels
         result_height: Result image height in pixels
         processing_time_ms: Total processing time in milliseconds
@@ -61,6 +64,9 @@ class StyleJob(Base):
     celery_task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     preview_s3_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
     result_s3_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    renditions: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    blurhash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    placeholder: Mapped[str | None] = mapped_column(Text, nullable=True)
     result_width: Mapped[int | None] = mapped_column(Integer, nullable=True)
     result_height: Mapped[int | None] = mapped_column(Integer, nullable=True)
     processing_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -1,7 +1,7 @@
 """Circle schemas for API requests and responses."""
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -76,6 +76,8 @@ class SharedGalleryItemResponse(BaseModel):
 
     id: UUID
     thumbnail_url: str
+    blurhash: Optional[str] = None
+    placeholder: Optional[str] = None  # ~32px JPEG data URI
     owner_user_id: UUID
     owner_email: str
     created_at: datetime
@@ -1,6 +1,6 @@
 """Pydantic schemas for HD export endpoints."""
 
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -11,6 +11,9 @@ class HDExportRequest(BaseModel):
 
     source_type: str = Field(..., description="Source type: styled, ai_generated, or processed")
     source_job_id: UUID = Field(..., description="Source job ID (StyleJob or ProcessingJob)")
+    size_preset: str = Field(
+        "hd", description="Output size: hd (2048px), print (4096px), or print_xl (8192px)"
+    )
 
 
 class ExportJobResponse(BaseModel):
@@ -21,7 +24,9 @@ class ExportJobResponse(BaseModel):
     progress: int = Field(ge=0, le=100)
     current_step: Optional[str] = None
     is_paid: bool
+    size_preset: str = "hd"
     result_url: Optional[str] = None  # Presigned URL (only if completed)
+    result_urls: Optional[Dict[int, str]] = None  # Renditions by longest edge (only if completed)
     result_width: Optional[int] = None
     result_height: Optional[int] = None
     file_size_bytes: Optional[int] = None
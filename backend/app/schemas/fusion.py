@@ -1,10 +1,11 @@
 """Fusion and composition schemas for API requests and responses."""
 
+import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class FusionCreateRequest(BaseModel):
@@ -12,13 +13,13 @@ class FusionCreateRequest(BaseModel):
 
     artwork_ids: List[UUID] = Field(..., min_length=2, max_length=4)
     circle_id: Optional[UUID] = None
-    blend_mode: str = Field(default="poisson", description="poisson or alpha")
+    blend_mode: str = Field(default="poisson", description="poisson, alpha, or multiband")
 
     @field_validator("blend_mode")
     @classmethod
     def validate_blend_mode(cls, v: str) -> str:
-        if v not in ["poisson", "alpha"]:
-            raise ValueError("blend_mode must be 'poisson' or 'alpha'")
+        if v not in ["poisson", "alpha", "multiband"]:
+            raise ValueError("blend_mode must be 'poisson', 'alpha', or 'multiband'")
         return v
 
 
@@ -27,15 +28,29 @@ class CompositionCreateRequest(BaseModel):
 
     artwork_ids: List[UUID] = Field(..., min_length=2, max_length=4)
     circle_id: Optional[UUID] = None
-    layout: str = Field(default="horizontal", description="horizontal, vertical, or grid_2x2")
+    layout: str = Field(
+        default="horizontal",
+        description="horizontal, vertical, or grid_RxC (e.g. grid_2x2, grid_1x3)",
+    )
+    gutter: int = Field(default=0, ge=0, le=64, description="Pixels between cells")
 
     @field_validator("layout")
     @classmethod
     def validate_layout(cls, v: str) -> str:
-        if v not in ["horizontal", "vertical", "grid_2x2"]:
-            raise ValueError("layout must be 'horizontal', 'vertical', or 'grid_2x2'")
+        if v in ["horizontal", "vertical"]:
+            return v
+        match = re.match(r"^grid_([1-4])x([1-4])$", v)
+        if not match:
+            raise ValueError("layout must be 'horizontal', 'vertical', or 'grid_RxC' with R, C in 1-4")
         return v
 
+    @model_validator(mode="after")
+    def validate_grid_cells(self) -> "CompositionCreateRequest":
+        match = re.match(r"^grid_(\d)x(\d)$", self.layout)
+        if match and int(match.group(1)) * int(match.group(2)) < len(self.artwork_ids):
+            raise ValueError(f"layout {self.layout} has fewer cells than artworks")
+        return self
+
 
 class FusionResponse(BaseModel):
     """Response for fusion/composition creation."""
@@ -46,6 +61,9 @@ class FusionResponse(BaseModel):
     blend_mode: Optional[str]
     status: str
     result_url: Optional[str] = None
+    result_urls: Optional[Dict[int, str]] = None  # renditions by longest edge
+    blurhash: Optional[str] = None
+    placeholder: Optional[str] = None  # ~32px JPEG data URI
     thumbnail_url: Optional[str] = None
     source_artwork_ids: List[str]
     created_at: datetime
@@ -63,6 +81,9 @@ class FusionStatusResponse(BaseModel):
     progress: int = Field(default=0, ge=0, le=100)
     current_step: Optional[str] = None
     result_url: Optional[str] = None
+    result_urls: Optional[Dict[int, str]] = None  # renditions by longest edge
+    blurhash: Optional[str] = None
+    placeholder: Optional[str] = None  # ~32px JPEG data URI
     thumbnail_url: Optional[str] = None
     error_message: Optional[str] = None
     processing_time_ms: Optional[int] = None
@@ -1,7 +1,7 @@
 """Photo schemas for API requests and responses."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -14,6 +14,7 @@ class PhotoRead(BaseModel):
     user_id: UUID
     s3_key: str
     thumbnail_url: Optional[str] = None
+    thumbnail_urls: Optional[Dict[int, str]] = None  # by longest edge (128, 256, 512)
     original_url: str
     width: Optional[int] = None
     height: Optional[int] = None
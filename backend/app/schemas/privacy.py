@@ -89,3 +89,18 @@ class AccountDeletionResponse(BaseModel):
 
     message: str
     deleted_at: datetime
+    deletion_id: Optional[str] = Field(
+        None, description="ID for tracking the background deletion of stored files"
+    )
+
+
+class AccountDeletionStatusResponse(BaseModel):
+    """Progress of the background deletion of a deleted account's files."""
+
+    deletion_id: str
+    status: str = Field(..., description="Deletion status: pending, running, completed, failed")
+    objects_deleted: int
+    objects_failed: int
+    passes: int = Field(..., description="Listing passes so far (the last one verifies nothing is left)")
+    prefixes_done: int
+    prefixes_total: int
@@ -1,7 +1,7 @@
 """Processing job schemas for API requests and responses."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -11,12 +11,18 @@ class JobSubmitRequest(BaseModel):
     """Request to submit a photo for processing."""
 
     photo_id: UUID
+    reuse_duplicate: bool = Field(
+        False, description="Reuse the result of a near-duplicate photo instead of processing (opt-in)"
+    )
 
 
 class BatchJobSubmitRequest(BaseModel):
     """Request to submit multiple photos for batch processing."""
 
     photo_ids: List[UUID] = Field(..., max_length=10, description="Maximum 10 photos per batch")
+    reuse_duplicate: bool = Field(
+        False, description="Reuse the result of a near-duplicate photo instead of processing (opt-in)"
+    )
 
 
 class JobResponse(BaseModel):
@@ -28,6 +34,7 @@ class JobResponse(BaseModel):
     progress: int
     created_at: datetime
     websocket_url: str
+    reused_from_job_id: Optional[UUID] = None  # set when a near-duplicate's result was reused
 
     model_config = {"from_attributes": True}
 
@@ -51,6 +58,10 @@ class JobStatusResponse(BaseModel):
 
     # Result details
     result_url: Optional[str] = None
+    result_urls: Optional[Dict[int, str]] = None  # renditions by longest edge
+    reused_from_job_id: Optional[UUID] = None
+    blurhash: Optional[str] = None
+    placeholder: Optional[str] = None  # ~32px JPEG data URI
     original_url: Optional[str] = None
     processing_time_ms: Optional[int] = None
     result_width: Optional[int] = None
@@ -1,10 +1,14 @@
 """Pydantic schemas for style transfer API."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+# Encodings a client can ask for; falls back to JPEG if the server build lacks one
+PreviewFormat = Literal["jpeg", "webp", "avif"]
+
 
 class StylePresetResponse(BaseModel):
     """Response schema for a single style preset."""
@@ -36,6 +40,9 @@ class StyleJobSubmitRequest(BaseModel):
     processing_job_id: UUID | None = Field(
         None, description="Optional processing job ID to use processed iris result"
     )
+    preview_format: PreviewFormat = Field(
+        "jpeg", description="Encoding of the stored preview (WebP/AVIF only if the client decodes them)"
+    )
 
 
 class StyleJobResponse(BaseModel):
@@ -47,6 +54,9 @@ class StyleJobResponse(BaseModel):
     current_step: str | None = None
     preview_url: str | None = None
     result_url: str | None = None
+    result_urls: dict[int, str] | None = None  # renditions by longest edge
+    blurhash: str | None = None
+    placeholder: str | None = None  # ~32px JPEG data URI
     style_preset: StylePresetResponse
     processing_time_ms: int | None = None
     error_type: str | None = None
@@ -31,6 +31,8 @@ class CompletionMessage(ProgressMessage):
     processing_time_ms: int = Field(..., description="Total processing time in milliseconds")
     result_width: int = Field(..., description="Enhanced image width in pixels")
     result_height: int = Field(..., description="Enhanced image height in pixels")
+    blurhash: Optional[str] = Field(None, description="BlurHash of the result")
+    placeholder: Optional[str] = Field(None, description="Data URI of a ~32px JPEG of the result")
 
 
 class ErrorMessage(ProgressMessage):
@@ -0,0 +1,121 @@
+"""Background deletion of a deleted account's stored objects.
+
+The API removes the user's rows and tokens synchronously, then hands the
+objects to a worker task (delete_account_objects) so the request doesn't
+wait on tens of thousands of deletes. What a user owns in storage:
+
+- Every object under ACCOUNT_PREFIXES/{user_id}/ (originals, thumbnails,
+  processing, style and AI results, exports and masters, renditions).
+- Fusion and composition results, which are keyed by fusion ID rather
+  than user (fusion/{fusion_id}...): collected from the user's
+  FusionArtwork rows before those rows are deleted. The fusion memo lets
+  other users' rows point at the same objects; those are left in place.
+
+Progress lives in a Redis hash per deletion (status, deleted, failed,
+passes, prefixes_done, prefixes_total), readable without authentication
+by deletion ID since the account no longer exists.
+"""
+
+import uuid
+from typing import Dict, List, Optional
+
+from redis import Redis
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import redis_client
+from app.models.fusion_artwork import FusionArtwork
+from app.services.renditions import all_rendition_keys
+
+# Top-level prefixes with one {user_id}/ folder per user ("art" is legacy)
+ACCOUNT_PREFIXES = ("iris", "processed", "styled", "ai_art", "exports", "art")
+
+DELETE_TASK = "app.workers.tasks.account_deletion.delete_account_objects"
+
+# Deletion status is kept for a week after the last update
+STATUS_TTL_SECONDS = 7 * 24 * 3600
+
+_STATUS_PREFIX = "account_deletion"
+
+# Sync client for workers (redis_client is asyncio-only)
+_sync_redis = Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+
+
+def account_prefixes(user_id) -> List[str]:
+    """Storage prefixes holding a user's objects."""
+    return [f"{prefix}/{user_id}/" for prefix in ACCOUNT_PREFIXES]
+
+
+async def fusion_keys(db: AsyncSession, user_id: uuid.UUID) -> List[str]:
+    """Keys of the user's fusion and composition results (outside the account prefixes).
+
+    Args:
+        db: Database session
+        user_id: Creator's user ID
+
+    Returns:
+        Result, thumbnail and rendition keys of every FusionArtwork the user
+        created, except those another user's FusionArtwork still references
+        (memoized copies share the original's objects)
+    """
+    result = await db.execute(
+        select(FusionArtwork.result_s3_key, FusionArtwork.thumbnail_s3_key).where(
+            FusionArtwork.creator_id == user_id
+        )
+    )
+    owned = result.all()
+    candidates = {key for row in owned for key in row if key}
+    if not candidates:
+        return []
+
+    result = await db.execute(
+        select(FusionArtwork.result_s3_key, FusionArtwork.thumbnail_s3_key).where(
+            FusionArtwork.creator_id != user_id,
+            or_(
+                FusionArtwork.result_s3_key.in_(candidates),
+                FusionArtwork.thumbnail_s3_key.in_(candidates),
+            ),
+        )
+    )
+    shared = {key for row in result for key in row if key}
+
+    keys = sorted(candidates - shared)
+    # Renditions are derived from the result key, so they are shared along with it
+    for result_key in sorted({result_key for result_key, _ in owned if result_key} - shared):
+        keys.extend(all_rendition_keys(result_key))
+    return keys
+
+
+def _status_key(deletion_id: str) -> str:
+    return f"{_STATUS_PREFIX}:{deletion_id}"
+
+
+async def init_deletion_status(deletion_id: str, prefixes_total: int) -> None:
+    """Record a pending deletion (before its task is dispatched)."""
+    key = _status_key(deletion_id)
+    await redis_client.hset(
+        key,
+        mapping={
+            "status": "pending",
+            "deleted": 0,
+            "failed": 0,
+            "passes": 0,
+            "prefixes_done": 0,
+            "prefixes_total": prefixes_total,
+        },
+    )
+    await redis_client.expire(key, STATUS_TTL_SECONDS)
+
+
+async def get_deletion_status(deletion_id: str) -> Optional[Dict[str, str]]:
+    """Current progress of a deletion, or None if unknown or expired."""
+    status = await redis_client.hgetall(_status_key(deletion_id))
+    return status or None
+
+
+def update_deletion_status(deletion_id: str, **fields) -> None:
+    """Update a deletion's progress from a worker."""
+    key = _status_key(deletion_id)
+    _sync_redis.hset(key, mapping=fields)
+    _sync_redis.expire(key, STATUS_TTL_SECONDS)
@@ -12,9 +12,8 @@ from sqlalchemy.orm import selectinload
 from app.models.circle import Circle
 from app.models.circle_membership import CircleMembership
 from app.models.photo import Photo
-from app.models.style_job import StyleJob, StyleJobStatus
 from app.models.user import User
-from app.storage.s3 import S3Client
+from app.storage.async_s3 import async_s3_client
 
 
 async def create_circle(name: str, user_id: uuid.UUID, db: AsyncSession) -> Circle:
@@ -406,36 +405,24 @@ async def get_shared_gallery(
         .limit(limit)
     )
 
-    s3_client = S3Client()
     gallery_items = []
 
     for photo, owner_email in photos_result:
-        # Get completed style jobs for this photo
-        style_jobs_result = await db.execute(
-            select(StyleJob)
-            .where(
-                and_(
-                    StyleJob.photo_id == photo.id,
-                    StyleJob.status == StyleJobStatus.COMPLETED
-                )
-            )
-            .order_by(StyleJob.created_at.desc())
-        )
-        style_jobs = style_jobs_result.scalars().all()
-
-        # Generate presigned URL for thumbnail
-        thumbnail_url = s3_client.generate_presigned_url(
-            photo.thumbnail_s3_key or photo.s3_key, expiry=3600
+        # Best thumbnail (latest style preview, else the photo's), kept by the workers
+        thumbnail_url = await async_s3_client.generate_presigned_url(
+            photo.best_thumbnail_s3_key or photo.thumbnail_s3_key or photo.s3_key, expiry=3600
         )
 
         gallery_items.append({
             "id": photo.id,
             "thumbnail_url": thumbnail_url,
+            "blurhash": photo.blurhash,
+            "placeholder": photo.placeholder,
             "owner_user_id": photo.user_id,
             "owner_email": owner_email,
             "created_at": photo.created_at,
-            "style_job_count": len(style_jobs),
-            "has_styled_versions": len(style_jobs) > 0,
+            "style_job_count": photo.style_job_count,
+            "has_styled_versions": photo.style_job_count > 0,
         })
 
     return gallery_items
@@ -0,0 +1,133 @@
+"""Set-based consent resolution with a Redis-cached permission matrix.
+
+Answers "what is the consent status of each of these artworks for user U
+and purpose P" with one query, however many artworks are asked about.
+Consent is unique per (artwork, grantee, purpose), so the matrix row for a
+(grantee, purpose) pair is a Redis hash of artwork ID -> status. Fusion
+attempts in an active circle then resolve from Redis; only artworks not
+yet in the hash reach Postgres.
+
+Statuses: "self" (requester owns the artwork), "granted", "pending",
+"denied", "revoked", or "none" (no consent record, or no such artwork).
+Entries are invalidated whenever a consent is requested, granted, denied
+or revoked, and expire after an hour in any case. If Redis is unavailable,
+every artwork is resolved from Postgres and nothing is cached.
+"""
+
+import logging
+import uuid
+from typing import Dict, Iterable, List
+
+from redis.exceptions import RedisError
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import redis_client
+from app.models.artwork_consent import ArtworkConsent
+from app.models.photo import Photo
+
+logger = logging.getLogger(__name__)
+
+# Statuses that allow the requester to use an artwork
+ALLOWED_STATUSES = frozenset({"self", "granted"})
+
+CONSENT_TTL_SECONDS = 3600
+
+_MATRIX_PREFIX = "consent_matrix"
+
+
+def _matrix_key(requester_id: uuid.UUID, purpose: str) -> str:
+    return f"{_MATRIX_PREFIX}:{requester_id}:{purpose}"
+
+
+async def _query_statuses(
+    artwork_ids: List[uuid.UUID],
+    requester_id: uuid.UUID,
+    purpose: str,
+    db: AsyncSession,
+) -> Dict[uuid.UUID, str]:
+    """Resolve statuses for existing artworks in one query."""
+    result = await db.execute(
+        select(Photo.id, Photo.user_id, ArtworkConsent.status)
+        .outerjoin(
+            ArtworkConsent,
+            and_(
+                ArtworkConsent.artwork_id == Photo.id,
+                ArtworkConsent.grantee_user_id == requester_id,
+                ArtworkConsent.purpose == purpose,
+            ),
+        )
+        .where(Photo.id.in_(artwork_ids))
+    )
+
+    statuses = {}
+    for artwork_id, owner_id, consent_status in result:
+        if owner_id == requester_id:
+            statuses[artwork_id] = "self"
+        else:
+            statuses[artwork_id] = consent_status or "none"
+    return statuses
+
+
+async def resolve_consents(
+    artwork_ids: List[uuid.UUID],
+    requester_id: uuid.UUID,
+    purpose: str,
+    db: AsyncSession,
+) -> Dict[uuid.UUID, str]:
+    """Get the consent status of each artwork for a requester and purpose.
+
+    Args:
+        artwork_ids: Artwork (photo) IDs
+        requester_id: User who wants to use the artworks
+        purpose: Purpose of usage (fusion or composition)
+        db: Database session
+
+    Returns:
+        Mapping of every requested artwork ID to its status
+    """
+    key = _matrix_key(requester_id, purpose)
+    try:
+        cached = await redis_client.hmget(key, [str(artwork_id) for artwork_id in artwork_ids])
+    except RedisError as e:
+        logger.warning(f"Consent matrix unavailable, resolving from the database: {e}")
+        resolved = await _query_statuses(artwork_ids, requester_id, purpose, db)
+        return {artwork_id: resolved.get(artwork_id, "none") for artwork_id in artwork_ids}
+
+    missing = [artwork_id for artwork_id, value in zip(artwork_ids, cached) if value is None]
+    resolved = {}
+    if missing:
+        resolved = await _query_statuses(missing, requester_id, purpose, db)
+
+    if resolved:
+        # Only existing artworks are cached; unknown IDs stay "none" uncached
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={str(artwork_id): value for artwork_id, value in resolved.items()})
+                pipe.expire(key, CONSENT_TTL_SECONDS)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Could not cache consent statuses: {e}")
+
+    return {
+        artwork_id: value if value is not None else resolved.get(artwork_id, "none")
+        for artwork_id, value in zip(artwork_ids, cached)
+    }
+
+
+def pending_artworks(statuses: Dict[uuid.UUID, str]) -> List[uuid.UUID]:
+    """Artworks the requester may not use yet, in request order."""
+    return [artwork_id for artwork_id, value in statuses.items() if value not in ALLOWED_STATUSES]
+
+
+async def invalidate(requester_id: uuid.UUID, purpose: str, artwork_ids: Iterable[uuid.UUID]) -> None:
+    """Drop cached statuses after consents change.
+
+    Args:
+        requester_id: Grantee of the changed consents
+        purpose: Purpose of the changed consents
+        artwork_ids: Affected artworks
+    """
+    fields = [str(artwork_id) for artwork_id in artwork_ids]
+    if fields:
+        await redis_client.hdel(_matrix_key(requester_id, purpose), *fields)
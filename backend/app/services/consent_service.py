@@ -14,7 +14,8 @@ from app.models.circle import Circle
 from app.models.photo import Photo
 from app.models.user import User
 from app.schemas.consent import ConsentResponse, PendingConsentResponse
-from app.storage.s3 import S3Client
+from app.services import consent_resolution
+from app.storage.async_s3 import async_s3_client
 
 
 async def request_consent(
@@ -104,6 +105,9 @@ async def request_consent(
         created_consents.append(consent)
 
     await db.commit()
+    await consent_resolution.invalidate(
+        requester_id, purpose, [c.artwork_id for c in created_consents]
+    )
 
     # Refresh to get IDs
     for consent in created_consents:
@@ -156,6 +160,9 @@ async def grant_consent(
     consent.status = "granted"
     consent.decided_at = datetime.now(timezone.utc)
     await db.commit()
+    await consent_resolution.invalidate(
+        consent.grantee_user_id, consent.purpose, [consent.artwork_id]
+    )
     await db.refresh(consent)
 
     return ConsentResponse.model_validate(consent)
@@ -200,6 +207,9 @@ async def deny_consent(
     consent.status = "denied"
     consent.decided_at = datetime.now(timezone.utc)
     await db.commit()
+    await consent_resolution.invalidate(
+        consent.grantee_user_id, consent.purpose, [consent.artwork_id]
+    )
     await db.refresh(consent)
 
     return ConsentResponse.model_validate(consent)
@@ -251,6 +261,9 @@ async def revoke_consent(
     consent.status = "revoked"
     consent.decided_at = datetime.now(timezone.utc)
     await db.commit()
+    await consent_resolution.invalidate(
+        consent.grantee_user_id, consent.purpose, [consent.artwork_id]
+    )
     await db.refresh(consent)
 
     return ConsentResponse.model_validate(consent)
@@ -276,38 +289,8 @@ async def check_all_consents_granted(
     Returns:
         True if all consents are granted, False otherwise
     """
-    for artwork_id in artwork_ids:
-        # Get photo to check ownership
-        result = await db.execute(
-            select(Photo).where(Photo.id == artwork_id)
-        )
-        photo = result.scalar_one_or_none()
-
-        if not photo:
-            return False
-
-        # Skip if requester owns artwork (implicit consent)
-        if photo.user_id == requester_id:
-            continue
-
-        # Check for granted consent
-        consent_result = await db.execute(
-            select(ArtworkConsent)
-            .where(
-                and_(
-                    ArtworkConsent.artwork_id == artwork_id,
-                    ArtworkConsent.grantee_user_id == requester_id,
-                    ArtworkConsent.purpose == purpose,
-                    ArtworkConsent.status == "granted"
-                )
-            )
-        )
-        consent = consent_result.scalar_one_or_none()
-
-        if not consent:
-            return False
-
-    return True
+    statuses = await consent_resolution.resolve_consents(artwork_ids, requester_id, purpose, db)
+    return not consent_resolution.pending_artworks(statuses)
 
 
 async def get_pending_consents_for_user(
@@ -341,13 +324,13 @@ async def get_pending_consents_for_user(
     consents = result.scalars().all()
 
     # Generate presigned URLs for artwork previews
-    s3_client = S3Client()
     pending_consents = []
 
     for consent in consents:
-        # Generate presigned URL for thumbnail or original
-        s3_key = consent.artwork.thumbnail_s3_key or consent.artwork.s3_key
-        preview_url = s3_client.generate_presigned_url(s3_key, expiry=3600)
+        # Generate presigned URL for the best thumbnail, the photo's, or the original
+        artwork = consent.artwork
+        s3_key = artwork.best_thumbnail_s3_key or artwork.thumbnail_s3_key or artwork.s3_key
+        preview_url = await async_s3_client.generate_presigned_url(s3_key, expiry=3600)
 
         pending_consents.append(
             PendingConsentResponse(
@@ -381,41 +364,5 @@ async def get_consent_status(
     Returns:
         Dict mapping artwork_id to status: "self", "granted", "pending", "denied", "none"
     """
-    status_map = {}
-
-    for artwork_id in artwork_ids:
-        # Get photo to check ownership
-        result = await db.execute(
-            select(Photo).where(Photo.id == artwork_id)
-        )
-        photo = result.scalar_one_or_none()
-
-        if not photo:
-            status_map[str(artwork_id)] = "none"
-            continue
-
-        # Check if requester owns artwork
-        if photo.user_id == requester_id:
-            status_map[str(artwork_id)] = "self"
-            continue
-
-        # Check for consent
-        consent_result = await db.execute(
-            select(ArtworkConsent)
-            .where(
-                and_(
-                    ArtworkConsent.artwork_id == artwork_id,
-                    ArtworkConsent.grantee_user_id == requester_id,
-                    ArtworkConsent.purpose == purpose,
-                )
-            )
-            .order_by(ArtworkConsent.requested_at.desc())
-        )
-        consent = consent_result.scalar_one_or_none()
-
-        if consent:
-            status_map[str(artwork_id)] = consent.status
-        else:
-            status_map[str(artwork_id)] = "none"
-
-    return status_map
+    statuses = await consent_resolution.resolve_consents(artwork_ids, requester_id, purpose, db)
+    return {str(artwork_id): value for artwork_id, value in statuses.items()}
@@ -0,0 +1,310 @@
+"""Perceptual quality-targeted image encoding for result artifacts.
+
+Each artifact class has a profile with a target SSIM (luma) and a quality
+range. encode_image binary-searches the lowest quality that still meets the
+target on a native-resolution proxy (the full image for small artifacts, a
+4x4 mosaic of block-aligned tiles otherwise), then encodes the full image
+once at that quality. JPEG output is progressive and Huffman-optimized;
+both are lossless entropy-coding options, so the search uses fast baseline
+encodes. WebP and AVIF are available for clients that request them.
+
+Per-class counters (count, bytes, encode time) are kept in-process and
+logged. The comparison with the previously hard-coded JPEG quality needs a
+second full-size encode, so it lives in benchmarks/encoding.py rather than
+on the production path.
+
+OpenCV is imported lazily so the API can use resolve_format without
+pulling cv2 into the web process.
+"""
+
+import io
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, features
+
+logger = logging.getLogger(__name__)
+
+# Edge length of the square proxy used for the quality search, sampled as
+# PROXY_GRID x PROXY_GRID native-resolution tiles
+PROXY_SIZE = 512
+PROXY_GRID = 4
+
+# Tile offsets are aligned to the JPEG MCU (16px with 4:2:0) so the proxy
+# sees the same block grid as the full encode
+MCU_SIZE = 16
+
+FORMAT_CONTENT_TYPES = {
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+FORMAT_EXTENSIONS = {
+    "jpeg": "jpg",
+    "webp": "webp",
+    "avif": "avif",
+}
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """Encoder targets for one artifact class."""
+
+    target_ssim: float
+    min_quality: int
+    max_quality: int
+    legacy_quality: int  # Fixed JPEG quality used before quality targeting (benchmark only)
+
+
+# Intermediates that feed later stages (processed, full results) get stricter
+# targets than previews/thumbnails, which are only ever displayed small.
+ENCODING_PROFILES = {
+    "processed": EncodingProfile(target_ssim=0.99, min_quality=85, max_quality=95, legacy_quality=95),
+    "styled": EncodingProfile(target_ssim=0.98, min_quality=75, max_quality=92, legacy_quality=90),
+    "styled_preview": EncodingProfile(target_ssim=0.95, min_quality=55, max_quality=80, legacy_quality=70),
+    "ai_art": EncodingProfile(target_ssim=0.98, min_quality=75, max_quality=92, legacy_quality=90),
+    "ai_art_preview": EncodingProfile(target_ssim=0.95, min_quality=55, max_quality=80, legacy_quality=70),
+    "export": EncodingProfile(target_ssim=1.0, min_quality=95, max_quality=95, legacy_quality=95),
+    "fusion": EncodingProfile(target_ssim=0.98, min_quality=75, max_quality=92, legacy_quality=90),
+    "fusion_thumb": EncodingProfile(target_ssim=0.95, min_quality=55, max_quality=80, legacy_quality=70),
+    "composition": EncodingProfile(target_ssim=0.98, min_quality=75, max_quality=92, legacy_quality=90),
+    "composition_thumb": EncodingProfile(target_ssim=0.95, min_quality=55, max_quality=80, legacy_quality=70),
+    "rendition": EncodingProfile(target_ssim=0.95, min_quality=55, max_quality=85, legacy_quality=80),
+    "photo_thumb": EncodingProfile(target_ssim=0.95, min_quality=55, max_quality=80, legacy_quality=70),
+}
+
+
+@dataclass
+class EncodedImage:
+    """Encoder output plus the settings that produced it."""
+
+    data: bytes
+    format: str
+    quality: int
+    ssim: float
+    encode_ms: float
+
+    @property
+    def content_type(self) -> str:
+        return FORMAT_CONTENT_TYPES[self.format]
+
+    @property
+    def extension(self) -> str:
+        return FORMAT_EXTENSIONS[self.format]
+
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, float]] = {}
+
+
+def supported_formats() -> list[str]:
+    """List output formats available in this Pillow build, best first."""
+    formats = []
+    if features.check("avif"):
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    formats.append("jpeg")
+    return formats
+
+
+def resolve_format(requested: str | None) -> str:
+    """Map a client-requested output format to one this build can encode.
+
+    Args:
+        requested: "jpeg", "webp" or "avif" from the request body/query
+
+    Returns:
+        The requested format, or "jpeg" when it is missing or unavailable
+    """
+    if requested and requested in supported_formats():
+        return requested
+    return "jpeg"
+
+
+def ssim(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean SSIM between two single-channel uint8 images (Gaussian window)."""
+    import cv2
+
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+
+    x = reference.astype(np.float32)
+    y = candidate.astype(np.float32)
+
+    def blur(img):
+        return cv2.GaussianBlur(img, (11, 11), 1.5)
+
+    mu_x, mu_y = blur(x), blur(y)
+    mu_xx, mu_yy, mu_xy = mu_x * mu_x, mu_y * mu_y, mu_x * mu_y
+    sigma_x = blur(x * x) - mu_xx
+    sigma_y = blur(y * y) - mu_yy
+    sigma_xy = blur(x * y) - mu_xy
+
+    ssim_map = ((2 * mu_xy + c1) * (2 * sigma_xy + c2)) / (
+        (mu_xx + mu_yy + c1) * (sigma_x + sigma_y + c2)
+    )
+    return float(ssim_map.mean())
+
+
+def _to_pil(image: Image.Image | np.ndarray, bgr: bool) -> Image.Image:
+    if isinstance(image, Image.Image):
+        return image if image.mode in ("RGB", "L") else image.convert("RGB")
+    if image.ndim == 2:
+        return Image.fromarray(image)
+    if bgr:
+        image = np.ascontiguousarray(image[..., ::-1])
+    return Image.fromarray(image)
+
+
+def _proxy(image: Image.Image) -> Image.Image:
+    """Native-resolution proxy for the quality search.
+
+    Small images are used whole. Larger ones are sampled as a mosaic of
+    tiles spread evenly over a PROXY_GRID x PROXY_GRID grid, so the proxy
+    sees the same mix of detailed and flat regions as the full image.
+    """
+    width, height = image.size
+    if width <= PROXY_SIZE and height <= PROXY_SIZE:
+        return image
+
+    tile = PROXY_SIZE // PROXY_GRID
+    mosaic = Image.new(image.mode, (PROXY_SIZE, PROXY_SIZE))
+    for row in range(PROXY_GRID):
+        for col in range(PROXY_GRID):
+            cx = width * (1 + 2 * col) // (2 * PROXY_GRID)
+            cy = height * (1 + 2 * row) // (2 * PROXY_GRID)
+            left = min(max(cx - tile // 2, 0), max(width - tile, 0)) // MCU_SIZE * MCU_SIZE
+            top = min(max(cy - tile // 2, 0), max(height - tile, 0)) // MCU_SIZE * MCU_SIZE
+            mosaic.paste(image.crop((left, top, left + tile, top + tile)), (col * tile, row * tile))
+    return mosaic
+
+
+def _encode(image: Image.Image, fmt: str, quality: int, final: bool = True) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        if final:
+            image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        else:
+            image.save(buffer, format="JPEG", quality=quality)
+    elif fmt == "webp":
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+    elif fmt == "avif":
+        image.save(buffer, format="AVIF", quality=quality, speed=8)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    return buffer.getvalue()
+
+
+def _luma(image: Image.Image) -> np.ndarray:
+    return np.asarray(image.convert("L"))
+
+
+def _decode(data: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(data))
+
+
+def _search_quality(proxy: Image.Image, fmt: str, profile: EncodingProfile) -> tuple[int, float]:
+    """Find the lowest quality meeting the profile's SSIM target on the proxy.
+
+    Returns:
+        Tuple of (quality, proxy SSIM)
+    """
+    reference = _luma(proxy)
+    low, high = profile.min_quality, profile.max_quality
+
+    # Quality is monotone in fidelity, so bisect on it
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = _encode(proxy, fmt, quality, final=False)
+        score = ssim(reference, _luma(_decode(data)))
+        if score >= profile.target_ssim:
+            best = (quality, score)
+            high = quality - 1
+        else:
+            low = quality + 1
+
+    if best is None:
+        data = _encode(proxy, fmt, profile.max_quality, final=False)
+        best = (profile.max_quality, ssim(reference, _luma(_decode(data))))
+    return best
+
+
+def encode_image(
+    image: Image.Image | np.ndarray,
+    artifact: str,
+    fmt: str = "jpeg",
+    bgr: bool = True,
+) -> EncodedImage:
+    """Encode an artifact at the lowest quality meeting its perceptual target.
+
+    Args:
+        image: PIL image, or numpy array (BGR by default, matching OpenCV tasks)
+        artifact: Artifact class key in ENCODING_PROFILES
+        fmt: Output format ("jpeg", "webp", "avif")
+        bgr: Whether a numpy input is BGR (ignored for PIL input)
+
+    Returns:
+        EncodedImage with bytes, chosen quality, proxy SSIM (NaN for
+        fixed-quality profiles, which skip the search) and encode time
+
+    Raises:
+        ValueError: If artifact class or format is unknown
+    """
+    if artifact not in ENCODING_PROFILES:
+        raise ValueError(f"Unknown artifact class: {artifact}")
+    if fmt not in FORMAT_CONTENT_TYPES:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+    start = time.perf_counter()
+    profile = ENCODING_PROFILES[artifact]
+    pil_image = _to_pil(image, bgr)
+
+    if profile.min_quality == profile.max_quality:
+        # Fixed quality (e.g. exports): nothing to search, and no SSIM to report
+        quality, score = profile.max_quality, float("nan")
+    else:
+        quality, score = _search_quality(_proxy(pil_image), fmt, profile)
+    data = _encode(pil_image, fmt, quality)
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    _record(artifact, fmt, len(data), encode_ms)
+    logger.info(
+        f"Encoded {artifact} as {fmt} q={quality} ssim={score:.4f} "
+        f"{len(data)} bytes in {encode_ms:.0f}ms"
+    )
+
+    return EncodedImage(data=data, format=fmt, quality=quality, ssim=score, encode_ms=encode_ms)
+
+
+def _record(artifact: str, fmt: str, size: int, encode_ms: float) -> None:
+    key = f"{artifact}:{fmt}"
+    with _stats_lock:
+        entry = _stats.setdefault(key, {"count": 0, "bytes": 0, "encode_ms": 0.0})
+        entry["count"] += 1
+        entry["bytes"] += size
+        entry["encode_ms"] += encode_ms
+
+
+def get_encoding_stats() -> dict[str, dict[str, float]]:
+    """Get per artifact class/format totals since process start.
+
+    Returns:
+        Mapping of "artifact:format" to count, bytes, mean_bytes and
+        mean_encode_ms
+    """
+    with _stats_lock:
+        report = {}
+        for key, entry in _stats.items():
+            report[key] = {
+                "count": entry["count"],
+                "bytes": entry["bytes"],
+                "mean_bytes": entry["bytes"] / entry["count"],
+                "mean_encode_ms": entry["encode_ms"] / entry["count"],
+            }
+        return report
@@ -6,11 +6,12 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.export_job import ExportJob, ExportSourceType
+from app.models.export_job import ExportJob, ExportJobStatus, ExportSizePreset, ExportSourceType
 from app.models.processing_job import ProcessingJob
 from app.models.style_job import StyleJob
 from app.schemas.exports import ExportJobResponse
-from app.storage.s3 import s3_client
+from app.services.renditions import rendition_urls
+from app.storage.async_s3 import async_s3_client
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ async def create_export_job(
     user_id: UUID,
     source_type: str,
     source_job_id: UUID,
+    size_preset: str = "hd",
 ) -> ExportJob:
     """Create a new HD export job.
 
@@ -31,6 +33,7 @@ async def create_export_job(
         user_id: User ID
         source_type: Source type (styled, ai_generated, processed)
         source_job_id: Source job ID
+        size_preset: Output size preset (hd, print, print_xl)
 
     Returns:
         Created ExportJob
@@ -44,6 +47,12 @@ async def create_export_job(
     except ValueError:
         raise ValueError(f"Invalid source type: {source_type}")
 
+    # Validate size preset
+    try:
+        size_preset_enum = ExportSizePreset(size_preset)
+    except ValueError:
+        raise ValueError(f"Invalid size preset: {size_preset}")
+
     # Look up source S3 key based on source type
     source_s3_key = None
 
@@ -92,6 +101,7 @@ async def create_export_job(
         source_type=source_type_enum,
         source_job_id=source_job_id,
         source_s3_key=source_s3_key,
+        size_preset=size_preset_enum,
         is_paid=False,  # Default: free export with watermark
     )
 
@@ -172,6 +182,11 @@ async def mark_as_paid(
 ) -> ExportJob:
     """Mark export job as paid (called by payment webhook in Phase 6).
 
+    Completed jobs switch their result and file size to the clean HD master
+    without re-running the export. The watermarked renditions go with it:
+    the master's manifest is taken from another export whose result is the
+    master, if any (clients fall back to result_url otherwise).
+
     Args:
         db: Database session
         job_id: Export job ID
@@ -189,6 +204,17 @@ async def mark_as_paid(
         raise ValueError("Export job not found")
 
     job.is_paid = True
+    if job.status == ExportJobStatus.COMPLETED and job.master_s3_key:
+        job.result_s3_key = job.master_s3_key
+        master_size = await async_s3_client.get_file_size(job.master_s3_key)
+        if master_size is not None:
+            job.file_size_bytes = master_size
+        result = await db.execute(
+            select(ExportJob.renditions)
+            .where(ExportJob.result_s3_key == job.master_s3_key, ExportJob.renditions.isnot(None))
+            .limit(1)
+        )
+        job.renditions = result.scalar_one_or_none()
     await db.commit()
     await db.refresh(job)
 
@@ -210,13 +236,15 @@ async def generate_export_response_with_url(
         ExportJobResponse with presigned URL if completed
     """
     result_url = None
+    result_urls = None
 
     if job.status == "completed" and job.result_s3_key:
         # Generate presigned URL (expires in 1 hour)
-        result_url = s3_client.generate_presigned_url(
+        result_url = await async_s3_client.generate_presigned_url(
             job.result_s3_key,
-            expiration=3600,
+            expiry=3600,
         )
+        result_urls = await rendition_urls(job.result_s3_key, job.renditions)
 
     return ExportJobResponse(
         id=job.id,
@@ -224,7 +252,9 @@ async def generate_export_response_with_url(
         progress=job.progress,
         current_step=job.current_step,
         is_paid=job.is_paid,
+        size_preset=job.size_preset.value,
         result_url=result_url,
+        result_urls=result_urls,
         result_width=job.result_width,
         result_height=job.result_height,
         file_size_bytes=job.file_size_bytes,
@@ -0,0 +1,185 @@
+"""Memoization of fusion and composition results.
+
+A fusion's output is fully determined by its type, blend mode/layout, the
+ordered source artifacts and the engine version. Source artifacts are
+identified by their S3 keys, which are unique per completed job (a restyle
+produces a new key), so they stand in for content hashes without
+downloading anything.
+
+Entries live in Redis as memo digest -> FusionArtwork ID, with a reverse
+index per source photo so restyles and deletions can invalidate every
+entry that used it. Hits and misses are counted in Redis.
+
+The memo is an optimization only: when Redis is unavailable, lookups are
+misses and writes/invalidations are skipped (entries are keyed by source
+S3 keys, so a restyle never hits a stale entry anyway).
+"""
+
+import hashlib
+import logging
+import uuid
+from typing import List, Optional, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import redis_client
+from app.models.fusion_artwork import FusionArtwork
+from app.services.fusion_sources import pick_source_keys, source_keys_statement
+
+logger = logging.getLogger(__name__)
+
+# Bump when an engine's output changes so old results are not reused
+ALGORITHM_VERSIONS = {
+    "fusion": "2",  # DST Poisson solver, multiband mode
+    "composition": "2",  # layout-plan engine
+}
+
+# Memo entries expire after 30 days
+MEMO_TTL_SECONDS = 30 * 24 * 3600
+
+_ENTRY_PREFIX = "fusion_memo"
+_SOURCE_PREFIX = "fusion_memo_source"
+_STATS_KEY = "fusion_memo_stats"
+
+
+async def memo_key(
+    fusion_type: str, mode: str, artwork_ids: List[uuid.UUID], db: AsyncSession
+) -> Optional[str]:
+    """Compute the memo digest for a fusion request.
+
+    Args:
+        fusion_type: "fusion" or "composition"
+        mode: Blend mode, or layout (plus gutter) for compositions
+        artwork_ids: Source photo IDs, in request order
+        db: Database session
+
+    Returns:
+        Hex digest, or None if a source has no usable artifact yet
+    """
+    result = await db.execute(source_keys_statement(artwork_ids))
+    try:
+        keys = pick_source_keys(result.all(), artwork_ids)
+    except ValueError:
+        return None
+
+    parts = [fusion_type, mode, ALGORITHM_VERSIONS[fusion_type]]
+    for artwork_id in artwork_ids:
+        source = keys[str(artwork_id)]
+        parts.append(f"{source.image_key}|{source.mask_key}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+async def _count(field: str) -> None:
+    try:
+        await redis_client.hincrby(_STATS_KEY, field, 1)
+    except RedisError as e:
+        logger.warning(f"Could not count fusion memo {field}: {e}")
+
+
+async def lookup(digest: Optional[str], db: AsyncSession) -> Optional[FusionArtwork]:
+    """Find the memoized artwork for a digest and count the hit or miss.
+
+    Entries pointing at failed or deleted artworks are dropped and count
+    as misses.
+
+    Args:
+        digest: Digest from memo_key (None is always a miss)
+        db: Database session
+
+    Returns:
+        The memoized FusionArtwork (completed or still in flight), or None
+    """
+    if not digest:
+        await _count("misses")
+        return None
+
+    try:
+        fusion_id = await redis_client.get(f"{_ENTRY_PREFIX}:{digest}")
+    except RedisError as e:
+        logger.warning(f"Fusion memo unavailable, treating as a miss: {e}")
+        return None
+
+    fusion = None
+    if fusion_id:
+        result = await db.execute(select(FusionArtwork).where(FusionArtwork.id == uuid.UUID(fusion_id)))
+        fusion = result.scalar_one_or_none()
+        if fusion is None or fusion.status == "failed":
+            fusion = None
+            try:
+                await redis_client.delete(f"{_ENTRY_PREFIX}:{digest}")
+            except RedisError as e:
+                logger.warning(f"Could not drop stale fusion memo entry {digest[:12]}: {e}")
+
+    await _count("hits" if fusion else "misses")
+    if fusion:
+        logger.info(f"Fusion memo hit {digest[:12]} -> {fusion.id} ({fusion.status})")
+    return fusion
+
+
+async def remember(digest: Optional[str], fusion_id: uuid.UUID, artwork_ids: List[uuid.UUID]) -> None:
+    """Record a newly dispatched artwork as the result for a digest.
+
+    Args:
+        digest: Digest from memo_key (ignored when None)
+        fusion_id: FusionArtwork ID that will hold the result
+        artwork_ids: Source photo IDs (for invalidation)
+    """
+    if not digest:
+        return
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(f"{_ENTRY_PREFIX}:{digest}", MEMO_TTL_SECONDS, str(fusion_id))
+            for artwork_id in artwork_ids:
+                source_key = f"{_SOURCE_PREFIX}:{artwork_id}"
+                pipe.sadd(source_key, digest)
+                pipe.expire(source_key, MEMO_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Fusion memo unavailable, not remembering {fusion_id}: {e}")
+
+
+async def invalidate_sources(photo_ids: List[uuid.UUID]) -> int:
+    """Drop every memo entry that used any of the given source photos.
+
+    Call when a source artwork is restyled or deleted.
+
+    Args:
+        photo_ids: Source photo IDs
+
+    Returns:
+        Number of memo entries removed
+    """
+    removed = 0
+    try:
+        for photo_id in photo_ids:
+            source_key = f"{_SOURCE_PREFIX}:{photo_id}"
+            digests = await redis_client.smembers(source_key)
+            if digests:
+                removed += await redis_client.delete(*[f"{_ENTRY_PREFIX}:{d}" for d in digests])
+            await redis_client.delete(source_key)
+
+        if removed:
+            await redis_client.hincrby(_STATS_KEY, "invalidations", removed)
+    except RedisError as e:
+        logger.warning(f"Fusion memo unavailable, skipping invalidation: {e}")
+
+    if removed:
+        logger.info(f"Invalidated {removed} fusion memo entries for {len(photo_ids)} sources")
+    return removed
+
+
+async def get_memo_stats() -> Tuple[int, int, int]:
+    """Get memo counters since they were last reset.
+
+    Returns:
+        Tuple of (hits, misses, invalidated entries)
+    """
+    stats = await redis_client.hgetall(_STATS_KEY)
+    return (
+        int(stats.get("hits", 0)),
+        int(stats.get("misses", 0)),
+        int(stats.get("invalidations", 0)),
+    )
@@ -1,8 +1,10 @@
 """Fusion service for creating and managing fusion/composition artworks."""
 
 import uuid
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
+from celery.result import AsyncResult
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,14 +12,120 @@ from sqlalchemy.orm import selectinload
 
 from app.models.fusion_artwork import FusionArtwork
 from app.models.photo import Photo
-from app.models.processing_job import ProcessingJob
-from app.models.style_job import StyleJob
 from app.schemas.fusion import ConsentRequiredResponse, FusionResponse, FusionStatusResponse
-from app.services.consent_service import check_all_consents_granted
-from app.storage.s3 import S3Client
+from app.services import consent_resolution, fusion_cache
+from app.services.renditions import rendition_urls
+from app.storage.async_s3 import async_s3_client
 from app.workers.celery_app import celery_app
 
 
+async def _reuse_memoized(
+    digest: Optional[str],
+    creator_id: uuid.UUID,
+    circle_id: Optional[uuid.UUID],
+    artwork_ids: List[uuid.UUID],
+    fusion_type: str,
+    blend_mode: str,
+    db: AsyncSession,
+) -> Optional[FusionArtwork]:
+    """Resolve a request against the fusion memo without dispatching work.
+
+    A resubmission by the same creator in the same circle returns the
+    existing artwork (even while it is still processing). Anyone else gets
+    a new completed artwork sharing the memoized result, thumbnail,
+    renditions and inline placeholders.
+
+    Returns:
+        Artwork to return to the client, or None to run the task
+    """
+    memoized = await fusion_cache.lookup(digest, db)
+    if not memoized:
+        return None
+
+    if memoized.creator_id == creator_id and memoized.circle_id == circle_id:
+        return memoized
+
+    if memoized.status != "completed" or not memoized.result_s3_key:
+        return None
+
+    fusion = FusionArtwork(
+        creator_id=creator_id,
+        circle_id=circle_id,
+        source_artwork_ids=[str(aid) for aid in artwork_ids],
+        fusion_type=fusion_type,
+        blend_mode=blend_mode,
+        status="completed",
+        result_s3_key=memoized.result_s3_key,
+        thumbnail_s3_key=memoized.thumbnail_s3_key,
+        renditions=memoized.renditions,
+        blurhash=memoized.blurhash,
+        placeholder=memoized.placeholder,
+        processing_time_ms=0,
+        completed_at=datetime.now(timezone.utc),
+    )
+    db.add(fusion)
+    await db.commit()
+    await db.refresh(fusion)
+    return fusion
+
+
+async def _fusion_response(fusion: FusionArtwork) -> FusionResponse:
+    """Build a FusionResponse with presigned URLs for whatever is available."""
+    result_url = None
+    result_urls = None
+    thumbnail_url = None
+
+    if fusion.status == "completed" and fusion.result_s3_key:
+        result_url = await async_s3_client.generate_presigned_url(fusion.result_s3_key, expiry=3600)
+        result_urls = await rendition_urls(fusion.result_s3_key, fusion.renditions)
+    if fusion.status != "failed" and fusion.thumbnail_s3_key:
+        thumbnail_url = await async_s3_client.generate_presigned_url(fusion.thumbnail_s3_key, expiry=3600)
+
+    return FusionResponse(
+        id=fusion.id,
+        creator_id=fusion.creator_id,
+        fusion_type=fusion.fusion_type,
+        blend_mode=fusion.blend_mode,
+        status=fusion.status,
+        result_url=result_url,
+        result_urls=result_urls,
+        blurhash=fusion.blurhash,
+        placeholder=fusion.placeholder,
+        thumbnail_url=thumbnail_url,
+        source_artwork_ids=fusion.source_artwork_ids,
+        created_at=fusion.created_at,
+        completed_at=fusion.completed_at,
+        websocket_url=f"/ws/jobs/{fusion.id}",
+    )
+
+
+async def _validate_source_photos(artwork_ids: List[uuid.UUID], db: AsyncSession) -> None:
+    """Check that the source photos of a fusion or composition are usable.
+
+    One query for all sources: whether a photo has been processed is read
+    from its denormalized latest-job pointers.
+
+    Raises:
+        HTTPException: 404 if a photo does not exist, 400 if it has no
+            completed processing or style job
+    """
+    result = await db.execute(select(Photo).where(Photo.id.in_(artwork_ids)))
+    photos = {photo.id: photo for photo in result.scalars()}
+
+    for artwork_id in artwork_ids:
+        photo = photos.get(artwork_id)
+        if not photo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Artwork {artwork_id} not found"
+            )
+        if not photo.latest_processing_job_id and not photo.latest_style_job_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Artwork {artwork_id} has not been processed yet"
+            )
+
+
 async def submit_fusion(
     artwork_ids: List[uuid.UUID],
     creator_id: uuid.UUID,
@@ -31,7 +139,7 @@ async def submit_fusion(
         artwork_ids: List of 2-4 photo IDs to fuse
         creator_id: User creating the fusion
         circle_id: Optional circle context
-        blend_mode: "poisson" or "alpha"
+        blend_mode: "poisson", "alpha", or "multiband"
         db: Database session
 
     Returns:
@@ -48,62 +156,15 @@ async def submit_fusion(
         )
 
     # Validate all artworks exist and are processed
-    for artwork_id in artwork_ids:
-        result = await db.execute(
-            select(Photo).where(Photo.id == artwork_id)
-        )
-        photo = result.scalar_one_or_none()
-
-        if not photo:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Artwork {artwork_id} not found"
-            )
-
-        # Check if photo has been processed (has at least one completed processing job or style job)
-        processing_result = await db.execute(
-            select(ProcessingJob)
-            .where(
-                ProcessingJob.photo_id == artwork_id,
-                ProcessingJob.status == "completed"
-            )
-            .limit(1)
-        )
-        has_processing = processing_result.scalar_one_or_none() is not None
-
-        style_result = await db.execute(
-            select(StyleJob)
-            .where(
-                StyleJob.photo_id == artwork_id,
-                StyleJob.status == "completed"
-            )
-            .limit(1)
-        )
-        has_style = style_result.scalar_one_or_none() is not None
-
-        if not has_processing and not has_style:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Artwork {artwork_id} has not been processed yet"
-            )
+    await _validate_source_photos(artwork_ids, db)
 
-    # Check consent for fusion
-    all_granted = await check_all_consents_granted(
+    # Check consent for fusion (one cached lookup for all artworks)
+    consents = await consent_resolution.resolve_consents(
         artwork_ids, creator_id, "fusion", db
     )
+    pending = consent_resolution.pending_artworks(consents)
 
-    if not all_granted:
-        # Find which artworks need consent
-        pending = []
-        for artwork_id in artwork_ids:
-            result = await db.execute(
-                select(Photo).where(Photo.id == artwork_id)
-            )
-            photo = result.scalar_one_or_none()
-
-            # Skip self-owned artworks
-            if photo and photo.user_id != creator_id:
-                pending.append(artwork_id)
+    if pending:
 
         return {
             "status": "consent_required",
@@ -111,6 +172,12 @@ async def submit_fusion(
             "message": "Consent required for one or more artworks"
         }
 
+    # Reuse a memoized result for the same sources and mode if there is one
+    digest = await fusion_cache.memo_key("fusion", blend_mode, artwork_ids, db)
+    reused = await _reuse_memoized(digest, creator_id, circle_id, artwork_ids, "fusion", blend_mode, db)
+    if reused:
+        return {"status": "success", "fusion": await _fusion_response(reused)}
+
     # Create fusion artwork record
     fusion = FusionArtwork(
         creator_id=creator_id,
@@ -130,6 +197,7 @@ async def submit_fusion(
         args=[str(fusion.id), [str(aid) for aid in artwork_ids], blend_mode],
         task_id=str(fusion.id),
     )
+    await fusion_cache.remember(digest, fusion.id, artwork_ids)
 
     return {
         "status": "success",
@@ -155,6 +223,7 @@ async def submit_composition(
     circle_id: Optional[uuid.UUID],
     layout: str,
     db: AsyncSession,
+    gutter: int = 0,
 ) -> Dict:
     """Submit a composition artwork creation request.
 
@@ -162,8 +231,9 @@ async def submit_composition(
         artwork_ids: List of 2-4 photo IDs to compose
         creator_id: User creating the composition
         circle_id: Optional circle context
-        layout: "horizontal", "vertical", or "grid_2x2"
+        layout: "horizontal", "vertical", or "grid_RxC" (e.g. "grid_2x2")
         db: Database session
+        gutter: Pixels between cells
 
     Returns:
         Dict with fusion response or consent_required status
@@ -179,62 +249,15 @@ async def submit_composition(
         )
 
     # Validate all artworks exist and are processed
-    for artwork_id in artwork_ids:
-        result = await db.execute(
-            select(Photo).where(Photo.id == artwork_id)
-        )
-        photo = result.scalar_one_or_none()
-
-        if not photo:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Artwork {artwork_id} not found"
-            )
-
-        # Check if photo has been processed
-        processing_result = await db.execute(
-            select(ProcessingJob)
-            .where(
-                ProcessingJob.photo_id == artwork_id,
-                ProcessingJob.status == "completed"
-            )
-            .limit(1)
-        )
-        has_processing = processing_result.scalar_one_or_none() is not None
+    await _validate_source_photos(artwork_ids, db)
 
-        style_result = await db.execute(
-            select(StyleJob)
-            .where(
-                StyleJob.photo_id == artwork_id,
-                StyleJob.status == "completed"
-            )
-            .limit(1)
-        )
-        has_style = style_result.scalar_one_or_none() is not None
-
-        if not has_processing and not has_style:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Artwork {artwork_id} has not been processed yet"
-            )
-
-    # Check consent for composition
-    all_granted = await check_all_consents_granted(
+    # Check consent for composition (one cached lookup for all artworks)
+    consents = await consent_resolution.resolve_consents(
         artwork_ids, creator_id, "composition", db
     )
+    pending = consent_resolution.pending_artworks(consents)
 
-    if not all_granted:
-        # Find which artworks need consent
-        pending = []
-        for artwork_id in artwork_ids:
-            result = await db.execute(
-                select(Photo).where(Photo.id == artwork_id)
-            )
-            photo = result.scalar_one_or_none()
-
-            # Skip self-owned artworks
-            if photo and photo.user_id != creator_id:
-                pending.append(artwork_id)
+    if pending:
 
         return {
             "status": "consent_required",
@@ -242,6 +265,12 @@ async def submit_composition(
             "message": "Consent required for one or more artworks"
         }
 
+    # Reuse a memoized result for the same sources, layout and gutter
+    digest = await fusion_cache.memo_key("composition", f"{layout}:{gutter}", artwork_ids, db)
+    reused = await _reuse_memoized(digest, creator_id, circle_id, artwork_ids, "composition", layout, db)
+    if reused:
+        return {"status": "success", "fusion": await _fusion_response(reused)}
+
     # Create fusion artwork record (type=composition)
     fusion = FusionArtwork(
         creator_id=creator_id,
@@ -258,9 +287,10 @@ async def submit_composition(
     # Submit Celery task
     celery_app.send_task(
         "app.workers.tasks.composition.create_composition",
-        args=[str(fusion.id), [str(aid) for aid in artwork_ids], layout],
+        args=[str(fusion.id), [str(aid) for aid in artwork_ids], layout, gutter],
         task_id=str(fusion.id),
     )
+    await fusion_cache.remember(digest, fusion.id, artwork_ids)
 
     return {
         "status": "success",
@@ -315,31 +345,43 @@ async def get_fusion_status(
             detail="Access denied"
         )
 
-    # Generate presigned URLs if completed
-    s3_client = S3Client()
+    # Presigned URLs: the thumbnail is published by the preview pass while
+    # the full-resolution result is still processing
     result_url = None
+    result_urls = None
     thumbnail_url = None
 
     if fusion.status == "completed" and fusion.result_s3_key:
-        result_url = s3_client.generate_presigned_url(fusion.result_s3_key, expiry=3600)
-        if fusion.thumbnail_s3_key:
-            thumbnail_url = s3_client.generate_presigned_url(fusion.thumbnail_s3_key, expiry=3600)
+        result_url = await async_s3_client.generate_presigned_url(fusion.result_s3_key, expiry=3600)
+        result_urls = await rendition_urls(fusion.result_s3_key, fusion.renditions)
+    if fusion.status != "failed" and fusion.thumbnail_s3_key:
+        thumbnail_url = await async_s3_client.generate_presigned_url(fusion.thumbnail_s3_key, expiry=3600)
 
-    # Calculate progress from status
+    # Calculate progress from status, or from the task's reported progress
     progress_map = {
         "pending": 0,
-        "processing": 50,
+        "processing": 0,
         "completed": 100,
         "failed": 0,
     }
     progress = progress_map.get(fusion.status, 0)
+    current_step = fusion.status
+
+    if fusion.status == "processing":
+        task_result = AsyncResult(str(fusion.id), app=celery_app)
+        if task_result.state == "PROGRESS" and isinstance(task_result.info, dict):
+            progress = task_result.info.get("progress", progress)
+            current_step = task_result.info.get("step", current_step)
 
     return FusionStatusResponse(
         id=fusion.id,
         status=fusion.status,
         progress=progress,
-        current_step=fusion.status,
+        current_step=current_step,
         result_url=result_url,
+        result_urls=result_urls,
+        blurhash=fusion.blurhash,
+        placeholder=fusion.placeholder,
         thumbnail_url=thumbnail_url,
         error_message=fusion.error_message,
         processing_time_ms=fusion.processing_time_ms,
@@ -370,17 +412,18 @@ async def get_user_fusions(
     fusions = result.scalars().all()
 
     # Generate presigned URLs
-    s3_client = S3Client()
     responses = []
 
     for fusion in fusions:
         result_url = None
+        result_urls = None
         thumbnail_url = None
 
         if fusion.status == "completed" and fusion.result_s3_key:
-            result_url = s3_client.generate_presigned_url(fusion.result_s3_key, expiry=3600)
-            if fusion.thumbnail_s3_key:
-                thumbnail_url = s3_client.generate_presigned_url(fusion.thumbnail_s3_key, expiry=3600)
+            result_url = await async_s3_client.generate_presigned_url(fusion.result_s3_key, expiry=3600)
+            result_urls = await rendition_urls(fusion.result_s3_key, fusion.renditions)
+        if fusion.status != "failed" and fusion.thumbnail_s3_key:
+            thumbnail_url = await async_s3_client.generate_presigned_url(fusion.thumbnail_s3_key, expiry=3600)
 
         responses.append(
             FusionResponse(
@@ -390,6 +433,9 @@ async def get_user_fusions(
                 blend_mode=fusion.blend_mode,
                 status=fusion.status,
                 result_url=result_url,
+                result_urls=result_urls,
+                blurhash=fusion.blurhash,
+                placeholder=fusion.placeholder,
                 thumbnail_url=thumbnail_url,
                 source_artwork_ids=fusion.source_artwork_ids,
                 created_at=fusion.created_at,
@@ -0,0 +1,132 @@
+"""Resolution of the best source artifacts for fusion and composition.
+
+The best artifact of each photo is denormalized onto the Photo row by the
+workers (refresh_best_artifacts) whenever a job completes, so the API
+(validation, memoization keys) and the workers (source loading) resolve
+sources with one primary-key read and agree on which artifact a photo
+contributes. Works with sync and async sessions: callers execute the
+statement themselves.
+"""
+
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.models.photo import Photo
+from app.models.processing_job import ProcessingJob
+from app.models.style_job import StyleJob, StyleJobStatus
+
+
+class SourceArtifact(NamedTuple):
+    """Best artifact of a photo: image key, mask key and parametric mask."""
+
+    image_key: str
+    mask_key: str
+    mask_vector: Optional[bytes]
+
+
+def source_keys_statement(photo_ids: Iterable) -> Select:
+    """Build one query returning the best source keys of each photo.
+
+    Rows are (photo_id, image key, mask key, mask vector), read from the
+    denormalized columns on Photo.
+
+    Args:
+        photo_ids: Photo IDs (UUIDs or strings)
+
+    Returns:
+        Select statement, one row per existing photo
+    """
+    ids = [uuid.UUID(str(photo_id)) for photo_id in photo_ids]
+    return select(
+        Photo.id,
+        Photo.best_result_s3_key,
+        Photo.best_mask_s3_key,
+        Photo.best_mask_vector,
+    ).where(Photo.id.in_(ids))
+
+
+def refresh_best_artifacts(db: Session, photo_id) -> None:
+    """Recompute the denormalized best-artifact columns of a photo.
+
+    Called by the workers in the transaction that marks a job completed.
+    The photo row is locked first so concurrent completions for the same
+    photo apply in order and the latest job always wins.
+
+    Priority: latest completed StyleJob result (with its ProcessingJob's
+    mask) > latest completed ProcessingJob result and mask.
+
+    Args:
+        db: Sync database session (committed by the caller)
+        photo_id: Photo ID
+    """
+    photo = db.query(Photo).filter(Photo.id == photo_id).with_for_update().first()
+    if not photo:
+        return
+
+    processing_job = (
+        db.query(ProcessingJob)
+        .filter(ProcessingJob.photo_id == photo.id, ProcessingJob.status == "completed")
+        .order_by(ProcessingJob.created_at.desc())
+        .first()
+    )
+    style_job = (
+        db.query(StyleJob)
+        .filter(StyleJob.photo_id == photo.id, StyleJob.status == StyleJobStatus.COMPLETED)
+        .order_by(StyleJob.created_at.desc())
+        .first()
+    )
+    style_mask = (
+        db.query(ProcessingJob).filter(ProcessingJob.id == style_job.processing_job_id).first()
+        if style_job and style_job.processing_job_id
+        else None
+    )
+
+    best = None
+    if style_job and style_job.result_s3_key and style_mask and style_mask.mask_s3_key:
+        best = SourceArtifact(style_job.result_s3_key, style_mask.mask_s3_key, style_mask.mask_vector)
+    elif processing_job and processing_job.result_s3_key and processing_job.mask_s3_key:
+        best = SourceArtifact(
+            processing_job.result_s3_key, processing_job.mask_s3_key, processing_job.mask_vector
+        )
+
+    photo.latest_processing_job_id = processing_job.id if processing_job else None
+    photo.latest_style_job_id = style_job.id if style_job else None
+    photo.best_result_s3_key = best.image_key if best else None
+    photo.best_mask_s3_key = best.mask_key if best else None
+    photo.best_mask_vector = best.mask_vector if best else None
+    photo.best_thumbnail_s3_key = (
+        style_job.preview_s3_key if style_job and style_job.preview_s3_key else photo.thumbnail_s3_key
+    )
+    photo.style_job_count = (
+        db.query(func.count(StyleJob.id))
+        .filter(StyleJob.photo_id == photo.id, StyleJob.status == StyleJobStatus.COMPLETED)
+        .scalar()
+    )
+
+
+def pick_source_keys(rows: Iterable, photo_ids: List) -> Dict[str, SourceArtifact]:
+    """Collect the resolved sources from rows of source_keys_statement.
+
+    Args:
+        rows: Result rows of source_keys_statement
+        photo_ids: Photo IDs that must all resolve
+
+    Returns:
+        Mapping of photo ID (string) to SourceArtifact
+
+    Raises:
+        ValueError: If a photo has no processed image with a mask
+    """
+    resolved = {}
+    for photo_id, image_key, mask_key, mask_vector in rows:
+        if image_key and mask_key:
+            resolved[str(photo_id)] = SourceArtifact(image_key, mask_key, mask_vector)
+
+    for photo_id in photo_ids:
+        if str(photo_id) not in resolved:
+            raise ValueError(f"No processed image found for photo {photo_id}")
+
+    return resolved
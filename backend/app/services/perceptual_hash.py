@@ -0,0 +1,53 @@
+"""Perceptual hashes of uploaded photos, for near-duplicate detection.
+
+Users often capture the same eye several times in a row. Upload
+finalization stores a 64-bit pHash of each photo (Photo.perceptual_hash),
+and processing-job creation compares it by Hamming distance with the
+user's recent processed photos, so a near-duplicate capture can reuse the
+existing result instead of running the pipeline again.
+
+pHash (low frequencies of a 32x32 DCT, thresholded at their median) is
+used rather than dHash: it is more stable under the small exposure and
+framing changes between consecutive captures. Iris photos all share the
+same overall layout, so MAX_DUPLICATE_DISTANCE is kept tight.
+
+OpenCV is imported lazily so the API can compare hashes without pulling
+cv2 into the web process.
+"""
+
+import numpy as np
+
+# Largest Hamming distance (of 64 bits) still considered the same capture
+MAX_DUPLICATE_DISTANCE = 4
+
+# How many of the user's most recent processed photos are compared
+RECENT_PHOTOS_SCANNED = 50
+
+_DCT_SIZE = 32
+_HASH_SIZE = 8
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """Compute the 64-bit pHash of an image.
+
+    Args:
+        image: BGR or grayscale array; a thumbnail is plenty
+
+    Returns:
+        Hash as a signed 64-bit integer (fits a BIGINT column)
+    """
+    import cv2
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (_DCT_SIZE, _DCT_SIZE), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(small.astype(np.float32))[:_HASH_SIZE, :_HASH_SIZE].flatten()
+    # The DC term only carries overall brightness
+    bits = low > np.median(low[1:])
+
+    value = int("".join("1" if bit else "0" for bit in bits), 2)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return ((a ^ b) & ((1 << 64) - 1)).bit_count()
@@ -1,5 +1,6 @@
 """Photo service for managing photo uploads and metadata."""
 
+import asyncio
 import uuid
 from typing import List, Optional
 
@@ -8,7 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.photo import Photo
 from app.schemas.photo import PhotoRead
-from app.storage.s3 import s3_client
+from app.services import fusion_cache
+from app.services.upload_finalization import THUMBNAIL_SIZES, thumbnail_key
+from app.storage.async_s3 import async_s3_client
+from app.storage.deletion_queue import schedule_deletion
 
 
 async def create_photo_upload(
@@ -42,7 +46,7 @@ async def create_photo_upload(
     await db.refresh(photo)
 
     # Generate presigned PUT URL (1 hour expiry)
-    presigned_url = s3_client.generate_presigned_put_url(
+    presigned_url = await async_s3_client.generate_presigned_put_url(
         s3_key, content_type=content_type, expiry=3600
     )
 
@@ -57,7 +61,11 @@ async def confirm_photo_upload(
     width: int,
     height: int,
 ) -> Optional[Photo]:
-    """Confirm photo upload and update metadata.
+    """Confirm photo upload and record the client-reported metadata.
+
+    The metadata is provisional: the caller queues the upload finalization
+    task, which replaces it with values read from the object itself and
+    writes the thumbnails (or marks the photo "failed").
 
     Args:
         db: Database session
@@ -144,7 +152,10 @@ async def get_photo(
 async def delete_photo(
     db: AsyncSession, user_id: uuid.UUID, photo_id: uuid.UUID
 ) -> bool:
-    """Delete photo from database and S3.
+    """Delete photo from the database and queue its S3 objects for deletion.
+
+    Returns once the row is gone; the objects are removed in the background
+    by the batched deletion pipeline (see deletion_queue).
 
     Args:
         db: Database session
@@ -158,19 +169,21 @@ async def delete_photo(
     if not photo:
         return False
 
-    # Delete from S3
-    s3_client.delete_file(photo.s3_key)
-    if photo.thumbnail_s3_key:
-        s3_client.delete_file(photo.thumbnail_s3_key)
+    object_keys = [photo.s3_key] + [thumbnail_key(user_id, photo_id, size) for size in THUMBNAIL_SIZES]
 
     # Delete from database
     await db.delete(photo)
     await db.commit()
 
+    await schedule_deletion(object_keys)
+
+    # Fusions built from this photo must not be reused
+    await fusion_cache.invalidate_sources([photo_id])
+
     return True
 
 
-def generate_photo_read_with_urls(photo: Photo, url_expiry: int = 3600) -> PhotoRead:
+async def generate_photo_read_with_urls(photo: Photo, url_expiry: int = 3600) -> PhotoRead:
     """Generate PhotoRead schema with presigned URLs.
 
     Args:
@@ -180,19 +193,28 @@ def generate_photo_read_with_urls(photo: Photo, url_expiry: int = 3600) -> Photo
     Returns:
         PhotoRead schema with presigned URLs
     """
-    # Generate presigned GET URLs
-    original_url = s3_client.generate_presigned_url(photo.s3_key, expiry=url_expiry)
+    # Generate presigned GET URLs concurrently (each may round-trip to the Redis presign cache)
+    keys = [photo.s3_key]
+    if photo.thumbnail_s3_key:
+        keys.append(photo.thumbnail_s3_key)
+        keys.extend(thumbnail_key(photo.user_id, photo.id, size) for size in THUMBNAIL_SIZES)
+    urls = await asyncio.gather(
+        *(async_s3_client.generate_presigned_url(key, expiry=url_expiry) for key in keys)
+    )
+
+    original_url = urls[0]
     thumbnail_url = None
+    thumbnail_urls = None
     if photo.thumbnail_s3_key:
-        thumbnail_url = s3_client.generate_presigned_url(
-            photo.thumbnail_s3_key, expiry=url_expiry
-        )
+        thumbnail_url = urls[1]
+        thumbnail_urls = dict(zip(THUMBNAIL_SIZES, urls[2:]))
 
     return PhotoRead(
         id=photo.id,
         user_id=photo.user_id,
         s3_key=photo.s3_key,
         thumbnail_url=thumbnail_url,
+        thumbnail_urls=thumbnail_urls,
         original_url=original_url,
         width=photo.width,
         height=photo.height,
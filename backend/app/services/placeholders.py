@@ -0,0 +1,119 @@
+"""Inline placeholders for result artifacts: BlurHash and a tiny JPEG.
+
+Responses that list or complete artifacts carry these inline, so clients
+can paint something the moment the response arrives instead of waiting
+for a second round trip to fetch the image:
+
+- blurhash: a ~30 character BlurHash (https://blurha.sh) of the image,
+  decoded client-side into a blurred gradient.
+- placeholder: a data URI of a PLACEHOLDER_SIZE px JPEG (under 1 KB),
+  usable directly as an image source.
+
+Both are computed once by the worker that writes the artifact and stored
+on its row. The BlurHash encoder is implemented here with numpy (it is a
+few lines of DCT), rather than adding a dependency.
+"""
+
+import base64
+import io
+
+import numpy as np
+from PIL import Image
+
+from app.services.renditions import downscale_chain
+
+# Longest edge of the inline JPEG (BlurHash is computed from the same image)
+PLACEHOLDER_SIZE = 32
+PLACEHOLDER_QUALITY = 60
+
+# BlurHash components along the longer and shorter edge
+BLURHASH_COMPONENTS = (4, 3)
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _base83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(channel: np.ndarray) -> np.ndarray:
+    v = channel / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = min(max(value, 0.0), 1.0)
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash_encode(rgb: np.ndarray, x_components: int = 4, y_components: int = 3) -> str:
+    """Encode an RGB image as a BlurHash string.
+
+    Args:
+        rgb: RGB uint8 array (H, W, 3); a few dozen pixels a side is plenty
+        x_components: Horizontal components (1-9)
+        y_components: Vertical components (1-9)
+
+    Returns:
+        BlurHash string (4 + 2 * x_components * y_components characters)
+    """
+    height, width = rgb.shape[:2]
+    linear = _srgb_to_linear(rgb[..., :3].astype(np.float64))
+
+    basis_x = np.cos(np.pi * np.arange(x_components)[:, None] * np.arange(width)[None, :] / width)
+    basis_y = np.cos(np.pi * np.arange(y_components)[:, None] * np.arange(height)[None, :] / height)
+    # factors[j, i] = mean over pixels of basis_x[i] * basis_y[j] * linear, scaled 2x for AC
+    factors = np.einsum("jh,iw,hwc->jic", basis_y, basis_x, linear) / (width * height)
+    factors[1:, :] *= 2
+    factors[0, 1:] *= 2
+    factors = factors.reshape(-1, 3)
+
+    dc, ac = factors[0], factors[1:]
+    size_flag = (x_components - 1) + (y_components - 1) * 9
+    result = _base83(size_flag, 1)
+
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1.0
+    result += _base83(quantised_max, 1)
+
+    r, g, b = (_linear_to_srgb(c) for c in dc)
+    result += _base83((r << 16) + (g << 8) + b, 4)
+
+    quantised = np.clip(np.floor(np.sign(ac) * np.sqrt(np.abs(ac / maximum)) * 9 + 9.5), 0, 18).astype(int)
+    for qr, qg, qb in quantised:
+        result += _base83(qr * 19 * 19 + qg * 19 + qb, 2)
+    return result
+
+
+def compute_placeholders(image: Image.Image | np.ndarray, bgr: bool = True) -> dict:
+    """Compute the inline placeholders of an artifact.
+
+    Args:
+        image: Full-size artifact: PIL image, or array (BGR by default; a
+            fourth channel is ignored)
+        bgr: Whether an array input is BGR (ignored for PIL input)
+
+    Returns:
+        Dict with "blurhash" and "placeholder" (JPEG data URI), matching the
+        column names on the job rows
+    """
+    if isinstance(image, Image.Image):
+        image, bgr = np.asarray(image.convert("RGB")), False
+
+    tiny = downscale_chain(image, (256, PLACEHOLDER_SIZE)).get(PLACEHOLDER_SIZE, image)
+    tiny = tiny[..., 2::-1] if bgr else tiny[..., :3]
+    tiny = np.ascontiguousarray(tiny)
+
+    height, width = tiny.shape[:2]
+    components = BLURHASH_COMPONENTS if width >= height else BLURHASH_COMPONENTS[::-1]
+
+    buffer = io.BytesIO()
+    Image.fromarray(tiny).save(buffer, format="JPEG", quality=PLACEHOLDER_QUALITY, optimize=True)
+    data_uri = "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    return {"blurhash": blurhash_encode(tiny, *components), "placeholder": data_uri}
@@ -9,21 +9,85 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.photo import Photo
 from app.models.processing_job import ProcessingJob
 from app.schemas.processing import JobStatusResponse
-from app.storage.s3 import s3_client
+from app.services.fusion_sources import refresh_best_artifacts
+from app.services.perceptual_hash import MAX_DUPLICATE_DISTANCE, RECENT_PHOTOS_SCANNED, hamming_distance
+from app.services.renditions import rendition_urls
+from app.storage.async_s3 import async_s3_client
+
+
+# Result fields copied from a near-duplicate's completed job
+_REUSED_FIELDS = (
+    "result_s3_key",
+    "mask_s3_key",
+    "mask_vector",
+    "renditions",
+    "blurhash",
+    "placeholder",
+    "result_width",
+    "result_height",
+    "quality_score",
+)
+
+
+async def find_near_duplicate(db: AsyncSession, photo: Photo) -> Optional[ProcessingJob]:
+    """Find the completed processing job of a near-duplicate of a photo.
+
+    Compares the photo's perceptual hash with the user's most recent photos
+    whose latest processing job completed, and picks the closest within
+    MAX_DUPLICATE_DISTANCE. Photos whose job failed or is still running are
+    never candidates, so they cannot hide a further match.
+
+    Args:
+        db: Database session
+        photo: Photo to match (not matched until upload finalization hashed it)
+
+    Returns:
+        Latest completed ProcessingJob of the closest near-duplicate, or None
+    """
+    if photo.perceptual_hash is None:
+        return None
+
+    result = await db.execute(
+        select(Photo.perceptual_hash, ProcessingJob)
+        .join(ProcessingJob, ProcessingJob.id == Photo.latest_processing_job_id)
+        .where(
+            Photo.user_id == photo.user_id,
+            Photo.id != photo.id,
+            Photo.perceptual_hash.isnot(None),
+            ProcessingJob.status == "completed",
+        )
+        .order_by(Photo.created_at.desc())
+        .limit(RECENT_PHOTOS_SCANNED)
+    )
+    candidates = [
+        (hamming_distance(photo.perceptual_hash, other_hash), job) for other_hash, job in result
+    ]
+    candidates = [candidate for candidate in candidates if candidate[0] <= MAX_DUPLICATE_DISTANCE]
+    if not candidates:
+        return None
+
+    _, job = min(candidates, key=lambda candidate: candidate[0])
+    return job
 
 
 async def create_processing_job(
-    db: AsyncSession, user_id: UUID, photo_id: UUID
+    db: AsyncSession, user_id: UUID, photo_id: UUID, reuse_duplicate: bool = False
 ) -> ProcessingJob:
     """Create a new processing job for a photo.
 
+    With reuse_duplicate, a photo that is a near-duplicate of an already
+    processed one (see find_near_duplicate) gets a job that is completed
+    on creation with the existing result, and reused_from_job_id set; the
+    caller must not dispatch it. Reprocessing it creates a regular job.
+
     Args:
         db: Database session
         user_id: User ID for authorization
         photo_id: Photo ID to process
+        reuse_duplicate: Whether to reuse a near-duplicate's result
 
     Returns:
-        Created ProcessingJob instance
+        Created ProcessingJob instance (status "completed" if reused)
 
     Raises:
         ValueError: If photo doesn't exist or doesn't belong to user
@@ -37,6 +101,26 @@ async def create_processing_job(
     if not photo:
         raise ValueError("Photo not found or access denied")
 
+    duplicate = await find_near_duplicate(db, photo) if reuse_duplicate else None
+    if duplicate is not None:
+        job = ProcessingJob(
+            user_id=user_id,
+            photo_id=photo_id,
+            status="completed",
+            current_step="completed",
+            progress=100,
+            attempt_count=0,
+            processing_time_ms=0,
+            reused_from_job_id=duplicate.id,
+            **{field: getattr(duplicate, field) for field in _REUSED_FIELDS},
+        )
+        db.add(job)
+        await db.flush()
+        await db.run_sync(lambda session: refresh_best_artifacts(session, photo_id))
+        await db.commit()
+        await db.refresh(job)
+        return job
+
     # Create job
     job = ProcessingJob(
         user_id=user_id,
@@ -172,11 +256,12 @@ async def generate_job_response_with_urls(
     # Generate presigned URLs
     result_url = None
     if job.result_s3_key:
-        result_url = s3_client.generate_presigned_url(job.result_s3_key, expiry=3600)
+        result_url = await async_s3_client.generate_presigned_url(job.result_s3_key, expiry=3600)
+    result_urls = await rendition_urls(job.result_s3_key, job.renditions)
 
     original_url = None
     if photo and photo.s3_key:
-        original_url = s3_client.generate_presigned_url(photo.s3_key, expiry=3600)
+        original_url = await async_s3_client.generate_presigned_url(photo.s3_key, expiry=3600)
 
     return JobStatusResponse(
         job_id=job.id,
@@ -191,6 +276,10 @@ async def generate_job_response_with_urls(
         suggestion=job.suggestion,
         attempt_count=job.attempt_count,
         result_url=result_url,
+        result_urls=result_urls,
+        reused_from_job_id=job.reused_from_job_id,
+        blurhash=job.blurhash,
+        placeholder=job.placeholder,
         original_url=original_url,
         processing_time_ms=job.processing_time_ms,
         result_width=job.result_width,
@@ -0,0 +1,131 @@
+"""Multi-resolution renditions of result artifacts.
+
+Every worker result (processed, styled, AI, fusion, export) is also written
+at RENDITION_SIZES (longest edge, only those smaller than the result), in
+each of RENDITION_FORMATS the worker's Pillow supports. All sizes come from
+one downscale chain: each rendition is an area resize of the previous,
+larger one, so the total cost is close to a single resize of the result.
+
+Keys are derived from the result key ({stem}_{size}.{ext}), and a small
+manifest ({"sizes", "formats", "full"}) is stored on the job row. API
+responses expose it as a size-keyed URL map (rendition_urls), so clients
+fetch only the size they render instead of the full result.
+
+OpenCV is imported lazily so the API can build URL maps without pulling
+cv2 into the web process.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from app.services.encoding import FORMAT_EXTENSIONS, encode_image, supported_formats
+from app.storage.async_s3 import async_s3_client
+
+# Longest edge of each rendition
+RENDITION_SIZES = (256, 512, 1024)
+
+# In URL-map preference order; JPEG is the universal fallback. AVIF is left
+# out: its encoder is too slow to run for every result.
+RENDITION_FORMATS = ("webp", "jpeg")
+
+
+def rendition_key(result_key: str, size: int, fmt: str) -> str:
+    """Key of one rendition of a result (next to the result itself)."""
+    stem = result_key.rsplit(".", 1)[0]
+    return f"{stem}_{size}.{FORMAT_EXTENSIONS[fmt]}"
+
+
+def all_rendition_keys(result_key: str) -> List[str]:
+    """Every key a rendition of result_key may have been written to (for cleanup)."""
+    return [rendition_key(result_key, size, fmt) for size in RENDITION_SIZES for fmt in RENDITION_FORMATS]
+
+
+def downscale_chain(image: np.ndarray, sizes: Iterable[int]) -> Dict[int, np.ndarray]:
+    """Downscale an image to each size (longest edge), largest first.
+
+    Each output is an area resize of the previous one, so the total cost is
+    close to a single resize. Sizes at or above the image's longest edge are
+    skipped (callers that need them use the image itself).
+
+    Args:
+        image: Image array (H, W) or (H, W, C)
+        sizes: Target longest edges
+
+    Returns:
+        Dict of size to downscaled array, for sizes below the image's longest edge
+    """
+    import cv2
+
+    outputs = {}
+    current = image
+    for size in sorted(sizes, reverse=True):
+        height, width = current.shape[:2]
+        scale = size / max(width, height)
+        if scale >= 1.0:
+            continue
+        target = (max(round(width * scale), 1), max(round(height * scale), 1))
+        current = cv2.resize(current, target, interpolation=cv2.INTER_AREA)
+        outputs[size] = current
+    return outputs
+
+
+def write_renditions(client, image: Image.Image | np.ndarray, result_key: str, bgr: bool = True) -> dict:
+    """Write every rendition of a result and return its manifest.
+
+    Args:
+        client: Storage client (S3Client API)
+        image: Full-size result: PIL image, or array (BGR by default; a
+            fourth channel, as in RGBX canvases, is ignored)
+        result_key: Key of the full-size result the renditions belong to
+        bgr: Whether an array input is BGR (ignored for PIL input)
+
+    Returns:
+        Manifest {"sizes": [...], "formats": [...], "full": longest edge}
+    """
+    if isinstance(image, Image.Image):
+        image, bgr = np.asarray(image.convert("RGB")), False
+
+    formats = [fmt for fmt in RENDITION_FORMATS if fmt in supported_formats()]
+    renditions = downscale_chain(image, RENDITION_SIZES)
+    for size, rendition in renditions.items():
+        if rendition.ndim == 3 and rendition.shape[2] == 4:
+            rendition = np.ascontiguousarray(rendition[..., :3])
+        for fmt in formats:
+            encoded = encode_image(rendition, "rendition", fmt=fmt, bgr=bgr)
+            client.upload_file(
+                rendition_key(result_key, size, fmt),
+                encoded.data,
+                content_type=encoded.content_type,
+                server_side_encryption=False,
+            )
+
+    return {"sizes": sorted(renditions), "formats": formats, "full": max(image.shape[:2])}
+
+
+def rendition_keys(result_key: str, manifest: Optional[dict]) -> Dict[int, str]:
+    """Size-keyed map of a result's renditions, plus the result itself at its full size.
+
+    Uses the first of RENDITION_FORMATS present in the manifest.
+    """
+    keys: Dict[int, str] = {}
+    if manifest:
+        fmt = next((fmt for fmt in RENDITION_FORMATS if fmt in manifest.get("formats", [])), None)
+        if fmt:
+            keys = {size: rendition_key(result_key, size, fmt) for size in manifest.get("sizes", [])}
+        if manifest.get("full"):
+            keys[manifest["full"]] = result_key
+    return keys
+
+
+async def rendition_urls(
+    result_key: Optional[str], manifest: Optional[dict], expiry: int = 3600
+) -> Optional[Dict[int, str]]:
+    """Presigned size-keyed URL map for a result, or None when it has no renditions."""
+    if not result_key or not manifest:
+        return None
+    return {
+        size: await async_s3_client.generate_presigned_url(key, expiry=expiry)
+        for size, key in rendition_keys(result_key, manifest).items()
+    }
@@ -12,7 +12,8 @@ from app.models.processing_job import ProcessingJob
 from app.models.style_job import StyleJob, StyleJobStatus
 from app.models.style_preset import StylePreset, StyleTier
 from app.schemas.styles import StyleJobResponse, StylePresetResponse
-from app.storage.s3 import s3_client
+from app.services.renditions import rendition_urls
+from app.storage.async_s3 import async_s3_client
 
 logger = logging.getLogger(__name__)
 
@@ -197,16 +198,17 @@ async def generate_job_response_with_urls(db: AsyncSession, job: StyleJob) -> St
     # Generate presigned URLs for preview and result
     preview_url = None
     if job.preview_s3_key:
-        preview_url = s3_client.generate_presigned_url(job.preview_s3_key, expiration=3600)
+        preview_url = await async_s3_client.generate_presigned_url(job.preview_s3_key, expiry=3600)
 
     result_url = None
     if job.result_s3_key:
-        result_url = s3_client.generate_presigned_url(job.result_s3_key, expiration=3600)
+        result_url = await async_s3_client.generate_presigned_url(job.result_s3_key, expiry=3600)
+    result_urls = await rendition_urls(job.result_s3_key, job.renditions)
 
     # Generate presigned URL for style preset thumbnail
     thumbnail_url = None
     if job.style_preset.thumbnail_s3_key:
-        thumbnail_url = s3_client.generate_presigned_url(job.style_preset.thumbnail_s3_key, expiration=3600)
+        thumbnail_url = await async_s3_client.generate_presigned_url(job.style_preset.thumbnail_s3_key, expiry=3600)
 
     preset_response = StylePresetResponse(
         id=job.style_preset.id,
@@ -226,6 +228,9 @@ async def generate_job_response_with_urls(db: AsyncSession, job: StyleJob) -> St
         current_step=job.current_step,
         preview_url=preview_url,
         result_url=result_url,
+        result_urls=result_urls,
+        blurhash=job.blurhash,
+        placeholder=job.placeholder,
         style_preset=preset_response,
         processing_time_ms=job.processing_time_ms,
         error_type=job.error_type,
@@ -0,0 +1,189 @@
+"""Server-side verification and thumbnailing of uploaded photos.
+
+Photos are uploaded straight to S3 with a presigned PUT, so the size and
+dimensions the client reports on confirm can't be trusted. The upload
+finalization task checks the object itself, in increasing order of cost:
+
+1. HEAD: the object exists and its size is within PHOTO_MAX_BYTES.
+2. Ranged GET of the first HEADER_BYTES: the header parses as JPEG or PNG
+   and the pixel count is within PHOTO_MAX_PIXELS. Oversized or bogus
+   files are rejected before the body is downloaded or decoded.
+3. Full GET: a SHA-256 content hash, then a reduced-resolution decode
+   (libjpeg DCT scaling by 2, 4 or 8 for JPEG) that is still at least as
+   large as the biggest thumbnail. From that, THUMBNAIL_SIZES thumbnails
+   are written, along with inline placeholders of the gallery thumbnail
+   and a perceptual hash for near-duplicate detection.
+
+Galleries then load a thumbnail of a few KB instead of a multi-MB original.
+
+OpenCV is imported lazily so the API can use thumbnail_key without pulling
+cv2 into the web process.
+"""
+
+import hashlib
+import io
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+from app.services.encoding import encode_image
+from app.services.perceptual_hash import perceptual_hash
+from app.services.placeholders import compute_placeholders
+from app.services.renditions import downscale_chain
+
+logger = logging.getLogger(__name__)
+
+# Longest edge of each thumbnail; GALLERY_THUMBNAIL_SIZE is Photo.thumbnail_s3_key
+THUMBNAIL_SIZES = (128, 256, 512)
+GALLERY_THUMBNAIL_SIZE = 256
+
+# Enough for the JPEG SOF (after typical EXIF/ICC segments) or the PNG IHDR
+HEADER_BYTES = 64 * 1024
+
+ALLOWED_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png"}
+
+# EXIF orientations that rotate by 90 degrees (cv2.imdecode applies them)
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class UploadRejected(ValueError):
+    """The uploaded object is missing, too large, or not a supported image."""
+
+
+@dataclass(frozen=True)
+class FinalizedUpload:
+    """Verified metadata and thumbnails of an uploaded photo."""
+
+    file_size: int
+    width: int
+    height: int
+    content_type: str
+    content_hash: str
+    thumbnail_keys: Dict[int, str]
+    placeholders: Dict[str, str]  # inline blurhash and placeholder of the gallery thumbnail
+    perceptual_hash: int
+
+
+def thumbnail_key(user_id, photo_id, size: int) -> str:
+    """S3 key of a photo thumbnail (under the user's iris/ prefix)."""
+    return f"iris/{user_id}/thumbs/{photo_id}_{size}.jpg"
+
+
+def _parse_header(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """Get (format, displayed width, displayed height) from leading bytes, or None if incomplete.
+
+    Raises:
+        UploadRejected: If PIL flags the header as a decompression bomb
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            width, height = image.size
+            orientation = image.getexif().get(0x0112) if image.format == "JPEG" else None
+            fmt = image.format
+    except Image.DecompressionBombError as e:
+        raise UploadRejected(f"Image too large: {e}")
+    except Exception:
+        return None
+    if orientation in _TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    return fmt, width, height
+
+
+def _check_header(header: Tuple[str, int, int]) -> None:
+    fmt, width, height = header
+    if fmt not in ALLOWED_FORMATS:
+        raise UploadRejected(f"Unsupported image format: {fmt}")
+    if width * height > settings.PHOTO_MAX_PIXELS:
+        raise UploadRejected(f"Image too large: {width}x{height}")
+
+
+def reduced_decode_flag(width: int, height: int, min_edge: int) -> int:
+    """cv2.imdecode flag for the smallest 1/2^n scale whose long edge is still >= min_edge."""
+    import cv2
+
+    reductions = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+    for factor, flag in reductions:
+        if max(width, height) // factor >= min_edge:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def render_thumbnails(image: np.ndarray, sizes: Tuple[int, ...] = THUMBNAIL_SIZES) -> Dict[int, np.ndarray]:
+    """Downscale a BGR image to each size (longest edge) with one downscale chain.
+
+    Images already smaller than a size are used as they are.
+    """
+    chain = downscale_chain(image, sizes)
+    return {size: chain.get(size, image) for size in sizes}
+
+
+def finalize_object(client, key: str, user_id, photo_id) -> FinalizedUpload:
+    """Verify an uploaded photo and write its thumbnails.
+
+    Args:
+        client: Storage client (S3Client API)
+        key: Object key of the original
+        user_id: Owner (for thumbnail keys)
+        photo_id: Photo ID (for thumbnail keys)
+
+    Returns:
+        FinalizedUpload with server-side size, dimensions, type and hash
+
+    Raises:
+        UploadRejected: If the object is missing, too large, or not a JPEG/PNG
+    """
+    import cv2
+
+    file_size = client.get_file_size(key)
+    if not file_size:
+        raise UploadRejected("Uploaded file not found")
+    if file_size > settings.PHOTO_MAX_BYTES:
+        raise UploadRejected(f"File too large: {file_size} bytes")
+
+    # Reject bogus or oversized images from the header alone when possible
+    header = _parse_header(client.download_range(key, 0, HEADER_BYTES - 1))
+    if header is not None:
+        _check_header(header)
+
+    data = client.download_file(key)
+    if header is None:
+        header = _parse_header(data)
+        if header is None:
+            raise UploadRejected("File is not a readable image")
+        _check_header(header)
+    fmt, width, height = header
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    flag = reduced_decode_flag(width, height, max(THUMBNAIL_SIZES))
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), flag)
+    del data
+    if image is None:
+        raise UploadRejected("Image data is corrupt")
+
+    thumbnails = render_thumbnails(image)
+    thumbnail_keys = {}
+    for size, thumbnail in thumbnails.items():
+        thumbnail_keys[size] = thumbnail_key(user_id, photo_id, size)
+        encoded = encode_image(thumbnail, "photo_thumb")
+        client.upload_file(
+            thumbnail_keys[size], encoded.data, content_type=encoded.content_type, server_side_encryption=False
+        )
+
+    logger.info(
+        f"Finalized upload {key}: {width}x{height} {fmt}, {file_size} bytes, "
+        f"decoded at {image.shape[1]}x{image.shape[0]}"
+    )
+    return FinalizedUpload(
+        file_size=file_size,
+        width=width,
+        height=height,
+        content_type=ALLOWED_FORMATS[fmt],
+        content_hash=content_hash,
+        thumbnail_keys=thumbnail_keys,
+        placeholders=compute_placeholders(thumbnails[GALLERY_THUMBNAIL_SIZE]),
+        perceptual_hash=perceptual_hash(thumbnails[min(THUMBNAIL_SIZES)]),
+    )
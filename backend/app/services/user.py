@@ -14,7 +14,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import revoke_all_user_tokens
 from app.models.consent import ConsentRecord
 from app.models.user import User
-from app.storage.s3 import S3Client
+from app.services.account_deletion import (
+    DELETE_TASK,
+    account_prefixes,
+    fusion_keys,
+    init_deletion_status,
+)
+from app.storage.async_s3 import AsyncS3Client
+from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +29,12 @@ logger = logging.getLogger(__name__)
 async def delete_user_account(
     db: AsyncSession,
     user_id: uuid.UUID,
-    s3_client: S3Client,
-) -> None:
+) -> str:
     """Completely delete user account and all associated data (GDPR Article 17).
 
     This function implements the "Right to be Forgotten" by removing:
-    - All S3 objects (iris images, generated art, exports)
+    - All S3 objects (every account prefix and fusion results), in the
+      background: see app.services.account_deletion
     - All refresh tokens from Redis
     - All consent records from database
     - User record from database
@@ -35,7 +42,9 @@ async def delete_user_account(
     Args:
         db: Database session
         user_id: User UUID to delete
-        s3_client: S3 client for deleting files
+
+    Returns:
+        Deletion ID for tracking the background object deletion
 
     Raises:
         Exception: If deletion fails at any step
@@ -45,11 +54,8 @@ async def delete_user_account(
     logger.info(f"Starting account deletion for user_id={user_id_str}")
 
     try:
-        # Step 1: Delete all S3 objects for user
-        # Pattern: iris/{user_id}/, art/{user_id}/, exports/{user_id}/
-        for prefix in [f"iris/{user_id_str}/", f"art/{user_id_str}/", f"exports/{user_id_str}/"]:
-            s3_client.delete_user_files(prefix)
-            logger.debug(f"Deleted S3 objects with prefix: {prefix}")
+        # Step 1: Collect the keys that can't be found by prefix once the rows are gone
+        extra_keys = await fusion_keys(db, user_id)
 
         # Step 2: Revoke all refresh tokens from Redis
         await revoke_all_user_tokens(user_id_str)
@@ -68,11 +74,17 @@ async def delete_user_account(
         # Step 5: Commit transaction
         await db.commit()
 
-        # Step 6: Log deletion for compliance audit trail (ONLY log user_id, NOT personal data)
+        # Step 6: Delete stored objects in the background
+        deletion_id = str(uuid.uuid4())
+        await init_deletion_status(deletion_id, len(account_prefixes(user_id_str)))
+        celery_app.send_task(DELETE_TASK, args=[user_id_str, extra_keys], task_id=deletion_id)
+
+        # Step 7: Log deletion for compliance audit trail (ONLY log user_id, NOT personal data)
         logger.info(
-            f"Account deletion complete: user_id={user_id_str}, "
+            f"Account deletion complete: user_id={user_id_str}, deletion_id={deletion_id}, "
             f"deleted_at={datetime.now(timezone.utc).isoformat()}"
         )
+        return deletion_id
 
     except Exception as e:
         await db.rollback()
@@ -83,7 +95,7 @@ async def delete_user_account(
 async def export_user_data(
     db: AsyncSession,
     user_id: uuid.UUID,
-    s3_client: S3Client,
+    s3_client: AsyncS3Client,
 ) -> str:
     """Generate GDPR data export for user (Article 20: Right to Data Portability).
 
@@ -150,21 +162,16 @@ async def export_user_data(
         for prefix in [f"iris/{user_id_str}/", f"art/{user_id_str}/"]:
             try:
                 # List objects with prefix
-                paginator = s3_client.client.get_paginator("list_objects_v2")
-                pages = paginator.paginate(Bucket=s3_client.bucket_name, Prefix=prefix)
-
-                for page in pages:
-                    if "Contents" in page:
-                        for obj in page["Contents"]:
-                            key = obj["Key"]
-                            # Generate presigned URL (1 hour expiry)
-                            presigned_url = s3_client.generate_presigned_url(key, expiry=3600)
-                            s3_files.append({
-                                "key": key,
-                                "size": obj["Size"],
-                                "last_modified": obj["LastModified"].isoformat(),
-                                "download_url": presigned_url,
-                            })
+                for obj in await s3_client.list_objects(prefix):
+                    key = obj["Key"]
+                    # Generate presigned URL (1 hour expiry)
+                    presigned_url = await s3_client.generate_presigned_url(key, expiry=3600)
+                    s3_files.append({
+                        "key": key,
+                        "size": obj["Size"],
+                        "last_modified": obj["LastModified"].isoformat(),
+                        "download_url": presigned_url,
+                    })
             except Exception as e:
                 logger.warning(f"Error listing S3 objects for prefix {prefix}: {e}")
 
@@ -207,7 +214,7 @@ async def export_user_data(
 
         # Step 6: Upload ZIP to S3 export path
         export_key = f"exports/{user_id_str}/data_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.zip"
-        s3_client.upload_file(
+        await s3_client.upload_file(
             key=export_key,
             data=zip_buffer.getvalue(),
             content_type="application/zip",
@@ -215,7 +222,7 @@ async def export_user_data(
         )
 
         # Step 7: Generate presigned URL for ZIP download (24 hours)
-        download_url = s3_client.generate_presigned_url(export_key, expiry=86400)
+        download_url = await s3_client.generate_presigned_url(export_key, expiry=86400)
 
         logger.info(f"Data export complete for user_id={user_id_str}")
 
@@ -1,135 +1,342 @@
-"""Server-side watermark application for free exports."""
+"""Server-side watermark application for free exports.
 
+The tiled watermark overlay only depends on output size and text, so it is
+rendered once per (width, height, text) as a single-channel alpha mask and
+cached on disk. Masks up to MEMORY_CACHE_MAX_PIXELS are also kept in memory;
+print-size masks (64 MB at 8192px) are only memory-mapped from disk, so a
+worker never pins them; they are also rendered in bands straight into
+their cache file, so even a cold print export holds no full-frame mask.
+Because the watermark is white, the mask is
+also its premultiplied color, and compositing reduces to one vectorized
+blend on the RGB array: out = rgb + (255 - rgb) * alpha.
+"""
+
+import hashlib
 import logging
 import math
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+WATERMARK_TEXT = "IrisVue"
+PREVIEW_TEXT = "Free Preview"
 
-def apply_watermark(image: Image.Image, is_paid: bool) -> Image.Image:
-    """Apply semi-transparent watermark to image.
+# Watermark opacity (alpha=80/255, white)
+WATERMARK_ALPHA = 80
 
-    Free exports get a tiled diagonal "IrisVue" watermark that is difficult
-    to remove by cropping. Paid exports are returned unmodified.
+# Bump when the overlay rendering changes so stale disk entries are ignored
+OVERLAY_VERSION = 3
 
-    Args:
-        image: Input image (PIL Image)
-        is_paid: Whether user paid for watermark-free export
+# Largest mask kept in the in-process LRU (2048^2: 4 MB each, 64 MB for all 16)
+MEMORY_CACHE_MAX_PIXELS = 2048 * 2048
 
-    Returns:
-        Image with watermark applied (or original if paid)
-    """
-    if is_paid:
-        logger.info("Paid export - no watermark applied")
-        return image
+# Mask rows rendered at a time (4 MB at 8192px wide)
+MASK_BAND_ROWS = 512
 
-    logger.info("Free export - applying watermark")
 
-    # Create a copy to avoid modifying original
-    watermarked = image.copy()
-    width, height = watermarked.size
+def _load_font(candidates: list[str], size: int, fallback=None):
+    """Load the first available TrueType font, falling back to PIL's default."""
+    for path in candidates:
+        try:
+            return ImageFont.truetype(path, size)
+        except Exception:
+            continue
 
-    # Create transparent overlay for watermark
-    overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    if fallback is not None:
+        return fallback
 
-    # Calculate font size (proportional to image size)
-    font_size = max(width // 8, 60)
+    logger.warning("TrueType fonts not available, using default font")
+    return ImageFont.load_default()
 
-    # Try to load a nice font, fall back to default if unavailable
-    try:
-        # Try DejaVu Sans (common on Linux)
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-    except Exception:
-        try:
-            # Try Arial (common on Windows)
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except Exception:
-            # Fall back to default font
-            logger.warning("TrueType fonts not available, using default font")
-            font = ImageFont.load_default()
 
-    # Watermark text
-    watermark_text = "IrisVue"
+class _MaskLayout(NamedTuple):
+    """Pre-rotated text stamps and where they land in the output."""
 
-    # Get text bounding box
-    bbox = draw.textbbox((0, 0), watermark_text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+    tile: np.ndarray  # rotated tiled-text stamp (h, w) uint8
+    tile_positions: List[Tuple[int, int]]  # (left, top) of every stamp touching the output
+    label: np.ndarray  # "Free Preview" label (h, w) uint8
+    label_position: Tuple[int, int]
 
-    # Calculate diagonal spacing for tiled pattern
-    # Rotate 45 degrees, so diagonal length is sqrt(2) * dimension
-    diagonal = math.sqrt(width**2 + height**2)
-    num_repeats = int(diagonal / (text_width * 1.5)) + 2
 
-    # Create rotated overlay for diagonal watermark
-    rotated_overlay = Image.new("RGBA", (int(diagonal * 2), int(diagonal * 2)), (0, 0, 0, 0))
-    rotated_draw = ImageDraw.Draw(rotated_overlay)
+def _text_stamp(text: str, font) -> Tuple[Image.Image, Tuple[int, int, int, int]]:
+    """Render text alone on a canvas cropped to its ink box."""
+    bbox = ImageDraw.Draw(Image.new("L", (1, 1))).textbbox((0, 0), text, font=font)
+    stamp = Image.new("L", (max(bbox[2] - bbox[0], 1), max(bbox[3] - bbox[1], 1)), 0)
+    ImageDraw.Draw(stamp).text((-bbox[0], -bbox[1]), text, fill=WATERMARK_ALPHA, font=font)
+    return stamp, bbox
 
-    # Draw tiled watermark pattern
-    semi_transparent_white = (255, 255, 255, 80)  # RGBA with alpha=80/255
 
-    y_spacing = text_height * 3
+def _mask_layout(width: int, height: int, text: str) -> _MaskLayout:
+    """Lay out the watermark for an output size without drawing the full frame.
+
+    The text is drawn once and rotated 45 degrees as a small stamp; each
+    repeat of the tiled pattern is then just a position, found by rotating
+    its center about the output center.
+    """
+    # Calculate font size (proportional to image size)
+    font_size = max(width // 8, 60)
+    font = _load_font(
+        ["/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "arial.ttf"], font_size
+    )
+    stamp, bbox = _text_stamp(text, font)
+    text_width, text_height = stamp.size
+    tile = stamp.rotate(45, resample=Image.BICUBIC, expand=True)
+
+    # Tiled pattern on a plane of side 2 * diagonal centered on the output
+    diagonal = math.sqrt(width**2 + height**2)
+    num_repeats = int(diagonal / (text_width * 1.5)) + 2
     x_spacing = text_width * 2
+    y_spacing = text_height * 3
 
+    cos = sin = math.sqrt(0.5)
+    positions = []
     for i in range(-2, num_repeats + 2):
         for j in range(-2, num_repeats + 2):
-            x = int(diagonal) + (i * x_spacing)
-            y = int(diagonal / 2) + (j * y_spacing)
+            # Stamp center relative to the plane center, rotated like Image.rotate(45)
+            dx = i * x_spacing + bbox[0] + text_width / 2
+            dy = -diagonal / 2 + j * y_spacing + bbox[1] + text_height / 2
+            cx = width / 2 + dx * cos + dy * sin
+            cy = height / 2 - dx * sin + dy * cos
+            left = round(cx - tile.width / 2)
+            top = round(cy - tile.height / 2)
+            if left < width and top < height and left + tile.width > 0 and top + tile.height > 0:
+                positions.append((left, top))
 
-            rotated_draw.text(
-                (x, y),
-                watermark_text,
-                fill=semi_transparent_white,
-                font=font,
-            )
+    # "Free Preview" label in bottom-right corner with padding
+    small_font_size = max(width // 40, 20)
+    small_font = _load_font(
+        ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"], small_font_size, fallback=font
+    )
+    label, label_bbox = _text_stamp(PREVIEW_TEXT, small_font)
+    padding = 20
+    label_left = width - label.width - padding + label_bbox[0]
+    label_top = height - label.height - padding + label_bbox[1]
 
-    # Rotate overlay 45 degrees
-    rotated_overlay = rotated_overlay.rotate(45, expand=False)
+    return _MaskLayout(
+        np.asarray(tile, dtype=np.uint8),
+        positions,
+        np.asarray(label, dtype=np.uint8),
+        (label_left, label_top),
+    )
 
-    # Crop rotated overlay to original image size (centered)
-    crop_x = (rotated_overlay.width - width) // 2
-    crop_y = (rotated_overlay.height - height) // 2
-    rotated_overlay = rotated_overlay.crop((crop_x, crop_y, crop_x + width, crop_y + height))
 
-    # Add "Free Preview" text in bottom-right corner
-    small_font_size = max(width // 40, 20)
+def _paste_rows(
+    band: np.ndarray, y0: int, stamp: np.ndarray, left: int, top: int
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """Overlapping views of a band (starting at output row y0) and a stamp."""
+    band_height, width = band.shape
+    row0, row1 = max(top, y0), min(top + stamp.shape[0], y0 + band_height)
+    col0, col1 = max(left, 0), min(left + stamp.shape[1], width)
+    if row0 >= row1 or col0 >= col1:
+        return None, None
+    return (
+        band[row0 - y0 : row1 - y0, col0:col1],
+        stamp[row0 - top : row1 - top, col0 - left : col1 - left],
+    )
+
+
+def render_watermark_mask(
+    width: int, height: int, text: str = WATERMARK_TEXT, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Render the watermark overlay as a premultiplied alpha mask.
+
+    Free exports get a tiled diagonal watermark that is difficult to remove
+    by cropping, plus a "Free Preview" label in the bottom-right corner.
+    The mask is rendered MASK_BAND_ROWS rows at a time, so with a
+    memory-mapped `out` a print-size mask never exists in memory at once.
+
+    Args:
+        width: Output image width
+        height: Output image height
+        text: Tiled watermark text
+        out: Optional (H, W) uint8 array to render into (e.g. a memmap)
+
+    Returns:
+        Alpha mask (H, W) uint8, 0 = transparent
+    """
+    layout = _mask_layout(width, height, text)
+    if out is None:
+        out = np.empty((height, width), dtype=np.uint8)
+
+    band = np.empty((min(MASK_BAND_ROWS, height), width), dtype=np.uint8)
+    for y0 in range(0, height, MASK_BAND_ROWS):
+        rows = band[: min(MASK_BAND_ROWS, height - y0)]
+        rows.fill(0)
+
+        # Repeats of the tiled text never overlap, so max() merges their boxes
+        for left, top in layout.tile_positions:
+            target, source = _paste_rows(rows, y0, layout.tile, left, top)
+            if target is not None:
+                np.maximum(target, source, out=target)
+
+        # Alpha "over" of the label onto the pattern, a = a1 + a2 * (1 - a1)
+        target, source = _paste_rows(rows, y0, layout.label, *layout.label_position)
+        if target is not None:
+            tiled_alpha = target.astype(np.uint16)
+            target[:] = tiled_alpha + (source.astype(np.uint16) * (255 - tiled_alpha) + 127) // 255
+
+        out[y0 : y0 + len(rows)] = rows
+
+    return out
+
+
+def _cache_dir() -> Path:
+    """Get the on-disk watermark cache directory."""
+    if settings.WATERMARK_CACHE_DIR:
+        return Path(settings.WATERMARK_CACHE_DIR)
+    return Path(tempfile.gettempdir()) / "irisvue-watermarks"
+
+
+def _cache_path(width: int, height: int, text: str) -> Path:
+    """Get the disk cache file for an overlay."""
+    text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+    return _cache_dir() / f"v{OVERLAY_VERSION}_{width}x{height}_{text_hash}.npy"
+
+
+def get_watermark_mask(width: int, height: int, text: str = WATERMARK_TEXT) -> np.ndarray:
+    """Get the cached watermark mask for an output size.
+
+    Lookup order: in-process LRU (masks up to MEMORY_CACHE_MAX_PIXELS only),
+    then disk (memory-mapped .npy), then render.
+
+    Args:
+        width: Output image width
+        height: Output image height
+        text: Tiled watermark text
+
+    Returns:
+        Read-only alpha mask (H, W) uint8
+    """
+    if width * height <= MEMORY_CACHE_MAX_PIXELS:
+        return _memory_cached_mask(width, height, text)
+    return _load_mask(width, height, text)
+
+
+def clear_mask_cache() -> None:
+    """Drop the in-process masks (the disk cache is kept)."""
+    _memory_cached_mask.cache_clear()
+
+
+@lru_cache(maxsize=16)
+def _memory_cached_mask(width: int, height: int, text: str) -> np.ndarray:
+    return _load_mask(width, height, text)
+
+
+def _load_mask(width: int, height: int, text: str) -> np.ndarray:
+    """Load a mask from the disk cache, rendering and persisting it on a miss."""
+    path = _cache_path(width, height, text)
+
+    if path.exists():
+        try:
+            mask = np.load(path, mmap_mode="r")
+            if mask.shape == (height, width):
+                return mask
+        except Exception as e:
+            logger.warning(f"Discarding unreadable watermark cache {path}: {e}")
+
+    logger.info(f"Rendering watermark overlay for {width}x{height}")
+    if width * height > MEMORY_CACHE_MAX_PIXELS:
+        try:
+            return _render_to_disk(path, width, height, text)
+        except OSError as e:
+            logger.warning(f"Could not persist watermark cache {path}, rendering in memory: {e}")
+
+    mask = render_watermark_mask(width, height, text)
+    mask.setflags(write=False)
+
     try:
-        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", small_font_size)
-    except Exception:
-        small_font = font  # Use same font if small font not available
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file then rename so concurrent workers never read partial files
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, mask)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not persist watermark cache {path}: {e}")
 
-    preview_text = "Free Preview"
-    preview_bbox = draw.textbbox((0, 0), preview_text, font=small_font)
-    preview_width = preview_bbox[2] - preview_bbox[0]
-    preview_height = preview_bbox[3] - preview_bbox[1]
+    return mask
 
-    # Position in bottom-right with padding
-    padding = 20
-    preview_x = width - preview_width - padding
-    preview_y = height - preview_height - padding
-
-    preview_overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    preview_draw = ImageDraw.Draw(preview_overlay)
-    preview_draw.text(
-        (preview_x, preview_y),
-        preview_text,
-        fill=semi_transparent_white,
-        font=small_font,
-    )
 
-    # Composite watermarks onto image
-    if watermarked.mode != "RGBA":
-        watermarked = watermarked.convert("RGBA")
+def _render_to_disk(path: Path, width: int, height: int, text: str) -> np.ndarray:
+    """Render a print-size mask straight into its cache file, band by band."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".npy.tmp")
+    os.close(fd)
+    try:
+        mask = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8, shape=(height, width))
+        render_watermark_mask(width, height, text, out=mask)
+        mask.flush()
+        del mask
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return np.load(path, mmap_mode="r")
+
+
+def blend_watermark(rgb: np.ndarray, mask: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Composite a white premultiplied watermark mask onto an RGB array.
+
+    Computes out = rgb + round((255 - rgb) * alpha / 255) in uint16 fixed point.
+
+    Args:
+        rgb: Image array (H, W, 3) uint8
+        mask: Alpha mask (H, W) uint8
+        out: Optional output array (may be rgb itself for in-place blending)
+
+    Returns:
+        Watermarked image array (H, W, 3) uint8
+    """
+    delta = np.subtract(255, rgb, dtype=np.uint16)
+    delta *= mask[..., np.newaxis]
+    delta += 127
+    delta //= 255
+
+    if out is None:
+        out = np.empty_like(rgb)
+    np.add(rgb, delta, out=out, casting="unsafe")
+    return out
+
+
+def apply_watermark(image: Image.Image, is_paid: bool) -> Image.Image:
+    """Apply semi-transparent watermark to image.
+
+    Free exports get a tiled diagonal "IrisVue" watermark that is difficult
+    to remove by cropping. Paid exports are returned unmodified.
+
+    Args:
+        image: Input image (PIL Image)
+        is_paid: Whether user paid for watermark-free export
+
+    Returns:
+        Image with watermark applied (or original if paid): RGB for RGB
+        input, RGBA with its transparency kept for any other mode
+    """
+    if is_paid:
+        logger.info("Paid export - no watermark applied")
+        return image
+
+    logger.info("Free export - applying watermark")
 
-    watermarked = Image.alpha_composite(watermarked, rotated_overlay)
-    watermarked = Image.alpha_composite(watermarked, preview_overlay)
+    width, height = image.size
+    mask = get_watermark_mask(width, height)
 
-    # Convert back to RGB if original was RGB
     if image.mode == "RGB":
-        watermarked = watermarked.convert("RGB")
+        watermarked = Image.fromarray(blend_watermark(np.asarray(image), mask))
+    else:
+        # The blend assumes an opaque base; composite properly over alpha
+        white = Image.new("L", (width, height), 255)
+        overlay = Image.merge("RGBA", (white, white, white, Image.fromarray(np.asarray(mask))))
+        watermarked = Image.alpha_composite(image.convert("RGBA"), overlay)
 
     logger.info("Watermark applied successfully")
     return watermarked
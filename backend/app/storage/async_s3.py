@@ -0,0 +1,111 @@
+"""Async facade over S3Client for the FastAPI request path.
+
+boto3 is synchronous, so calling it from a route handler stalls the event
+loop (and every other request on that worker) for a full S3 round trip.
+AsyncS3Client has the same methods as S3Client as coroutines: calls that
+talk to S3 run on a bounded thread pool, so at most S3_ASYNC_MAX_WORKERS
+requests wait on S3 at once and the loop keeps serving everything else.
+
+Presigning and CDN URLs are computed locally (no network), so those run
+inline rather than paying for a thread hop. Presigned GET URLs are
+memoized per expiry window (see presign_cache), so repeated list loads
+return identical, cacheable URLs.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from app.core.config import settings
+from app.storage.presign_cache import PresignedUrlCache
+from app.storage.s3 import S3Client, s3_client
+
+T = TypeVar("T")
+
+
+class AsyncS3Client:
+    """Non-blocking S3 client for async code (same API as S3Client)."""
+
+    def __init__(self, client: S3Client, max_workers: int = settings.S3_ASYNC_MAX_WORKERS):
+        """Wrap a sync client.
+
+        Args:
+            client: Sync S3Client that does the work
+            max_workers: Maximum concurrent blocking S3 calls
+        """
+        self.sync = client
+        self.bucket_name = client.bucket_name
+        self.presigned_urls = PresignedUrlCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-async")
+
+    async def _run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def check_bucket(self) -> None:
+        """HEAD the bucket (raises ClientError if it is missing or inaccessible)."""
+        await self._run(self.sync.check_bucket)
+
+    async def ensure_bucket(self, bucket: Optional[str] = None) -> None:
+        """Create bucket if it doesn't exist."""
+        await self._run(self.sync.ensure_bucket, bucket)
+
+    async def upload_file(
+        self, key: str, data: bytes, content_type: str = "application/octet-stream", server_side_encryption: bool = True
+    ) -> None:
+        """Upload file with optional server-side encryption."""
+        await self._run(self.sync.upload_file, key, data, content_type, server_side_encryption)
+
+    async def download_file(self, key: str) -> bytes:
+        """Download file from storage."""
+        return await self._run(self.sync.download_file, key)
+
+    async def get_file_size(self, key: str) -> Optional[int]:
+        """Get object size via HEAD, or None if it doesn't exist."""
+        return await self._run(self.sync.get_file_size, key)
+
+    async def delete_file(self, key: str) -> None:
+        """Delete a single file."""
+        await self._run(self.sync.delete_file, key)
+
+    async def delete_objects(self, keys: List[str]) -> List[str]:
+        """Delete objects in DeleteObjects batches, returning the keys that failed."""
+        return await self._run(self.sync.delete_objects, keys)
+
+    async def list_objects(self, prefix: str) -> List[dict]:
+        """List every object under a prefix (dicts with Key, Size, LastModified, ...)."""
+        return await self._run(self.sync.list_objects, prefix)
+
+    async def generate_presigned_url(self, key: str, expiry: int = 3600) -> str:
+        """Get a presigned URL for temporary access (GET), valid for at least expiry seconds.
+
+        Identical for every request in the same expiry window.
+        """
+        return await self.presigned_urls.get(key, expiry, self.sync.generate_presigned_url)
+
+    async def generate_presigned_put_url(
+        self, key: str, content_type: str = "image/jpeg", expiry: int = 3600
+    ) -> str:
+        """Generate a presigned URL for direct upload (PUT)."""
+        return self.sync.generate_presigned_put_url(key, content_type, expiry)
+
+    async def get_public_url(self, key: str) -> str:
+        """Get public URL for an object (CDN if configured, otherwise presigned URL)."""
+        if settings.CDN_BASE_URL:
+            return self.sync.get_public_url(key)
+        return await self.generate_presigned_url(key)
+
+    async def get_download_url(self, key: str, expiry: int = 3600) -> str:
+        """Get download URL for an object (CDN if configured, otherwise presigned GET URL)."""
+        if settings.CDN_BASE_URL:
+            return self.sync.get_download_url(key, expiry)
+        return await self.generate_presigned_url(key, expiry)
+
+    def presign_stats(self) -> Dict[str, int]:
+        """Presigned URL cache counters for this process."""
+        return self.presigned_urls.stats()
+
+
+# Global async S3 client for the API (shares the process's pooled boto3 client)
+async_s3_client = AsyncS3Client(s3_client)
@@ -0,0 +1,130 @@
+"""Parallel, complete deletion of everything under a set of prefixes.
+
+Used for account deletion, where a user can own tens of thousands of
+objects. Listing is sequential (S3 pages through a prefix in order), but
+each listed page of up to MAX_DELETE_BATCH keys is deleted with one
+DeleteObjects request on a thread pool, so deletes overlap the listing
+and each other. At most 2 x workers pages are in flight, so memory stays
+bounded however many objects there are.
+
+Deletion runs in passes: after each pass the prefixes are listed again,
+and the run only counts as complete once a pass finds nothing. That
+catches keys whose delete failed as well as objects written during the
+pass (a job that was still running when the account was deleted).
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+
+from app.storage.s3 import MAX_DELETE_BATCH
+
+logger = logging.getLogger(__name__)
+
+# Concurrent DeleteObjects requests (each one holds a pooled connection)
+BULK_DELETE_WORKERS = 8
+
+# Listing passes before giving up; the caller retries later
+MAX_PASSES = 3
+
+
+@dataclass
+class BulkDeleteProgress:
+    """Running totals of a bulk deletion."""
+
+    deleted: int = 0
+    prefixes_total: int = 0
+    prefixes_done: int = 0  # in the current pass
+    passes: int = 0
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+
+def _delete_pass(
+    client,
+    prefixes: List[str],
+    keys: List[str],
+    workers: int,
+    progress: BulkDeleteProgress,
+    on_progress: Optional[Callable[[BulkDeleteProgress], None]],
+) -> tuple[int, List[str]]:
+    """Delete everything listed once; returns (objects deleted, keys that failed)."""
+    deleted, failed = 0, []
+    in_flight: set[Future] = set()
+
+    def collect(done: Iterable[Future]) -> None:
+        nonlocal deleted
+        for future in done:
+            batch_size, batch_failed = future.result()
+            deleted += batch_size - len(batch_failed)
+            failed.extend(batch_failed)
+        progress.deleted = total_before + deleted
+
+    def submit(pool: ThreadPoolExecutor, batch: List[str]) -> None:
+        while len(in_flight) >= 2 * workers:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            collect(done)
+        in_flight.add(pool.submit(lambda: (len(batch), client.delete_objects(batch))))
+
+    total_before = progress.deleted
+    progress.passes += 1
+    progress.prefixes_done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-delete") as pool:
+        for start in range(0, len(keys), MAX_DELETE_BATCH):
+            submit(pool, keys[start : start + MAX_DELETE_BATCH])
+        for prefix in prefixes:
+            for page in client.iter_key_pages(prefix):
+                submit(pool, page)
+            progress.prefixes_done += 1
+            if on_progress:
+                on_progress(progress)
+        collect(wait(in_flight).done)
+
+    return deleted, failed
+
+
+def delete_all(
+    client,
+    prefixes: Iterable[str],
+    keys: Iterable[str] = (),
+    workers: int = BULK_DELETE_WORKERS,
+    on_progress: Optional[Callable[[BulkDeleteProgress], None]] = None,
+) -> BulkDeleteProgress:
+    """Delete every object under the prefixes, plus individual keys.
+
+    Args:
+        client: Storage client (S3Client API with iter_key_pages)
+        prefixes: Key prefixes to empty (should end in "/")
+        keys: Individual keys outside those prefixes
+        workers: Concurrent DeleteObjects requests
+        on_progress: Called after each listed prefix with the running totals
+
+    Returns:
+        Totals across passes; failed holds the keys left behind after
+        MAX_PASSES (empty once a pass verified the prefixes empty)
+    """
+    prefixes, keys = list(prefixes), list(keys)
+    progress = BulkDeleteProgress(prefixes_total=len(prefixes))
+
+    for _ in range(MAX_PASSES):
+        deleted, failed = _delete_pass(client, prefixes, keys, workers, progress, on_progress)
+        progress.failed = failed
+        if deleted == 0 and not failed:
+            break
+        logger.info(f"Bulk delete pass {progress.passes}: {deleted} deleted, {len(failed)} failed")
+        # Individual keys are not re-listed: only retry the ones that failed
+        failed_keys = set(failed)
+        keys = [key for key in keys if key in failed_keys]
+    else:
+        # The last pass still found objects: report whatever it left behind
+        remaining = {key for prefix in prefixes for page in client.iter_key_pages(prefix) for key in page}
+        progress.failed = sorted(remaining | set(keys))
+
+    if on_progress:
+        on_progress(progress)
+    return progress
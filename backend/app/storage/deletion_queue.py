@@ -0,0 +1,118 @@
+"""Deferred, batched object deletion.
+
+Deleting objects one request at a time adds S3 round trips to the
+requests and failure handlers that clean up. Instead, keys to delete go
+into a Redis set and a background task (flush_deletions) removes them
+with DeleteObjects, up to MAX_DELETE_BATCH keys per request.
+
+The pipeline is at-least-once and idempotent:
+- Adding a key twice is a no-op (it is a set).
+- Deleting a missing object succeeds in S3.
+- A key leaves the set only after its delete succeeded, so a crashed or
+  failed flush leaves it for the retry, or for the next flush.
+
+Enqueueing schedules at most one flush per FLUSH_DELAY_SECONDS, so a
+burst of deletes shares a few batches. If Redis is unreachable, keys are
+deleted inline instead, so nothing is orphaned.
+"""
+
+import logging
+from typing import Iterable, List, Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.security import redis_client
+from app.storage.async_s3 import async_s3_client
+from app.storage.s3 import MAX_DELETE_BATCH, s3_client
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "storage:pending_deletes"
+
+# Marker that a flush is already scheduled (expires when that flush starts)
+_SCHEDULED_KEY = "storage:delete_flush_scheduled"
+
+# Deletes enqueued within this window share one flush
+FLUSH_DELAY_SECONDS = 5
+
+FLUSH_TASK = "app.workers.tasks.storage_cleanup.flush_deletions"
+
+# Sync client for workers (redis_client is asyncio-only)
+_sync_redis = Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+
+
+def _present(keys: Iterable[Optional[str]]) -> List[str]:
+    return [key for key in keys if key]
+
+
+def _schedule_flush() -> None:
+    celery_app.send_task(FLUSH_TASK, countdown=FLUSH_DELAY_SECONDS)
+
+
+async def schedule_deletion(keys: Iterable[Optional[str]]) -> None:
+    """Queue objects for deletion from async code (None keys are skipped).
+
+    Args:
+        keys: Object keys to delete
+    """
+    keys = _present(keys)
+    if not keys:
+        return
+    try:
+        await redis_client.sadd(PENDING_KEY, *keys)
+        if await redis_client.set(_SCHEDULED_KEY, "1", ex=FLUSH_DELAY_SECONDS, nx=True):
+            _schedule_flush()
+    except RedisError as e:
+        logger.warning(f"Deletion queue unavailable, deleting {len(keys)} objects inline: {e}")
+        failed = await async_s3_client.delete_objects(keys)
+        if failed:
+            logger.error(f"Could not delete objects: {failed}")
+
+
+def schedule_deletion_sync(keys: Iterable[Optional[str]]) -> None:
+    """Queue objects for deletion from sync code such as Celery tasks (None keys are skipped).
+
+    Args:
+        keys: Object keys to delete
+    """
+    keys = _present(keys)
+    if not keys:
+        return
+    try:
+        _sync_redis.sadd(PENDING_KEY, *keys)
+        if _sync_redis.set(_SCHEDULED_KEY, "1", ex=FLUSH_DELAY_SECONDS, nx=True):
+            _schedule_flush()
+    except RedisError as e:
+        logger.warning(f"Deletion queue unavailable, deleting {len(keys)} objects inline: {e}")
+        failed = s3_client.delete_objects(keys)
+        if failed:
+            logger.error(f"Could not delete objects: {failed}")
+
+
+def flush_pending(batch_size: int = MAX_DELETE_BATCH) -> tuple[int, List[str]]:
+    """Delete queued objects in batches until the queue is empty or a batch fails.
+
+    Args:
+        batch_size: Keys per DeleteObjects request (at most MAX_DELETE_BATCH)
+
+    Returns:
+        Tuple of (objects deleted, keys that failed and are still queued)
+    """
+    deleted = 0
+    while True:
+        keys = _sync_redis.srandmember(PENDING_KEY, batch_size)
+        if not keys:
+            return deleted, []
+        failed = s3_client.delete_objects(keys)
+        failed_keys = set(failed)
+        done = [key for key in keys if key not in failed_keys]
+        if done:
+            _sync_redis.srem(PENDING_KEY, *done)
+            deleted += len(done)
+        if failed:
+            # Stop rather than re-drawing the same keys; the caller retries later
+            return deleted, failed
+
@@ -0,0 +1,203 @@
+"""Read-through disk cache of decoded images for Celery workers.
+
+Workers keep reloading the same objects: one processed iris feeds styles,
+AI generation and exports, and every circle fusion reloads the same
+artworks. Each decoded image is kept on local disk as an .npy file and
+served as a read-only memory map, so a hit skips both the download and the
+decode, and concurrent tasks on one machine share the same page cache.
+
+Entries are content-validated: every read is a conditional GET with the
+cached ETag, so a hit costs one bodiless round trip and a changed object
+is downloaded and re-decoded. Each entry has a JSON sidecar (ETag, encoded
+size, decoded shape) naming its data file; data files are published before
+their sidecar, with temp file + rename, so readers never see partial
+entries. The directory is bounded by IMAGE_CACHE_MAX_BYTES, evicting the
+least recently used data files (hits refresh the mtime).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.storage.s3 import s3_client
+
+logger = logging.getLogger(__name__)
+
+
+def _default_dir() -> Path:
+    """Get the configured cache directory."""
+    if settings.IMAGE_CACHE_DIR:
+        return Path(settings.IMAGE_CACHE_DIR)
+    return Path(tempfile.gettempdir()) / "irisvue-image-cache"
+
+
+def _decode(key: str, data: bytes, flags: int) -> np.ndarray:
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), flags)
+    if image is None:
+        raise ValueError(f"Could not decode image {key}")
+    return image
+
+
+def _write_atomic(path: Path, write) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class DecodedImageCache:
+    """Size-bounded, ETag-validated disk cache of decoded images."""
+
+    def __init__(self, client=None, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            client: Storage client with download_if_modified (defaults to s3_client)
+            directory: Cache directory (defaults to settings.IMAGE_CACHE_DIR)
+            max_bytes: Size bound for data files; 0 disables caching
+                (defaults to settings.IMAGE_CACHE_MAX_BYTES)
+        """
+        self.client = client or s3_client
+        self.directory = Path(directory or _default_dir())
+        self.max_bytes = settings.IMAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bytes_saved": 0, "bytes_downloaded": 0, "evictions": 0}
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def _entry_name(self, key: str, flags: int) -> str:
+        return hashlib.sha256(f"{key}\0{flags}".encode("utf-8")).hexdigest()
+
+    def _read_entry(self, name: str) -> Optional[dict]:
+        try:
+            return json.loads((self.directory / f"{name}.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _open(self, entry: dict) -> Optional[np.ndarray]:
+        """Memory-map an entry's data file, or None if it is gone or doesn't match."""
+        path = self.directory / entry["file"]
+        try:
+            image = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Discarding unreadable image cache file {path}: {e}")
+            return None
+        if list(image.shape) != entry["shape"] or image.dtype != np.uint8:
+            return None
+        return image
+
+    def get(self, key: str, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+        """Get the decoded image for an object, downloading only if it changed.
+
+        Args:
+            key: Object key
+            flags: cv2.imdecode flags (each flag set is cached separately)
+
+        Returns:
+            Decoded image; a read-only memory map when served from or stored
+            in the cache (callers must copy before modifying in place)
+
+        Raises:
+            ValueError: If the object can't be decoded
+        """
+        if self.max_bytes <= 0:
+            data = self.client.download_file(key)
+            self._count(misses=1, bytes_downloaded=len(data))
+            return _decode(key, data, flags)
+
+        name = self._entry_name(key, flags)
+        entry = self._read_entry(name)
+        data, etag = self.client.download_if_modified(key, entry["etag"] if entry else None)
+
+        if data is None:
+            image = self._open(entry)
+            if image is not None:
+                self._count(hits=1, bytes_saved=entry["size"])
+                return image
+            # Sidecar outlived its data file: fetch unconditionally
+            data, etag = self.client.download_if_modified(key, None)
+
+        self._count(misses=1, bytes_downloaded=len(data))
+        image = _decode(key, data, flags)
+        try:
+            return self._store(name, image, etag, len(data))
+        except OSError as e:
+            logger.warning(f"Could not cache decoded image {key}: {e}")
+            return image
+
+    def _store(self, name: str, image: np.ndarray, etag: str, size: int) -> np.ndarray:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Data files are per version so a sidecar never points at another version's pixels
+        data_file = f"{name}-{hashlib.sha256(etag.encode('utf-8')).hexdigest()[:16]}.npy"
+        data_path = self.directory / data_file
+        _write_atomic(data_path, lambda f: np.save(f, image))
+        entry = {"etag": etag, "size": size, "shape": list(image.shape), "file": data_file}
+        _write_atomic(self.directory / f"{name}.json", lambda f: f.write(json.dumps(entry).encode("utf-8")))
+        self._evict()
+        return np.load(data_path, mmap_mode="r")
+
+    def _evict(self) -> None:
+        """Delete least recently used data files until under max_bytes."""
+        files = []
+        total = 0
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._count(evictions=evicted)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for this process plus hit_ratio (hits / reads)."""
+        with self._lock:
+            stats = dict(self._stats)
+        reads = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / reads if reads else 0.0
+        return stats
+
+
+# Per-process cache over the global storage client (the directory is shared by all workers on a host)
+image_cache = DecodedImageCache()
+
+
+def load_image(key: str, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """Load a decoded image through the worker disk cache (read-only result)."""
+    return image_cache.get(key, flags)
+
+
+def get_image_cache_stats() -> Dict[str, float]:
+    """Get this process's image cache counters."""
+    return image_cache.stats()
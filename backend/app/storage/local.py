@@ -0,0 +1,243 @@
+"""Local filesystem storage backend for development and tests.
+
+LocalStorageClient has the same API as S3Client but keeps objects as files
+under LOCAL_STORAGE_ROOT, so the stack runs without MinIO. Presigned URLs
+point at the API's /storage/ route (app.api.routes.storage), which checks
+an HMAC of method, key and expiry made with SECRET_KEY, much like S3's
+query-string signatures.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote, urlencode
+
+from app.core.config import settings
+
+
+def default_root() -> Path:
+    """Get the configured storage root."""
+    if settings.LOCAL_STORAGE_ROOT:
+        return Path(settings.LOCAL_STORAGE_ROOT)
+    return Path(tempfile.gettempdir()) / "irisvue-storage"
+
+
+def sign(method: str, key: str, expires: int) -> str:
+    """HMAC signature of a local presigned URL."""
+    message = f"{method}\n{key}\n{expires}".encode("utf-8")
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def verify(method: str, key: str, expires: int, signature: str) -> bool:
+    """Check a local presigned URL's signature and expiry."""
+    return expires >= time.time() and hmac.compare_digest(sign(method, key, expires), signature)
+
+
+class LocalMultipartWriter:
+    """Write-only file-like object with the S3MultipartWriter interface.
+
+    Streams into a temp file that replaces the object on clean exit.
+    """
+
+    def __init__(self, storage: "LocalStorageClient", key: str, content_type: str):
+        self._storage = storage
+        self._key = key
+        self._content_type = content_type
+        path = storage.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self._file.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        """Publish the object."""
+        self._file.close()
+        self._storage.publish(self._key, self._tmp_path, self._content_type)
+
+    def abort(self) -> None:
+        """Discard the partial object."""
+        self._file.close()
+        os.unlink(self._tmp_path)
+
+    def __enter__(self) -> "LocalMultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class LocalStorageClient:
+    """Filesystem storage with the S3Client API."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """Initialize storage under root (created on demand)."""
+        self.bucket_name = settings.S3_BUCKET_NAME
+        self.root = Path(root or default_root()) / self.bucket_name
+
+    def path_for(self, key: str) -> Path:
+        """Map an object key to its file, refusing keys that escape the root."""
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()) or path == self.root.resolve():
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def _meta_path(self, path: Path) -> Path:
+        return path.with_name(f".{path.name}.meta")
+
+    def publish(self, key: str, tmp_path: str, content_type: str) -> None:
+        """Atomically move a finished temp file into place as key."""
+        path = self.path_for(key)
+        with open(tmp_path, "rb") as f:
+            digest = hashlib.md5(f.read()).hexdigest()
+        self._meta_path(path).write_text(json.dumps({"content_type": content_type, "etag": digest}))
+        os.replace(tmp_path, path)
+
+    def head(self, key: str) -> Optional[dict]:
+        """Get ContentLength, ContentType and ETag of an object, or None if missing."""
+        path = self.path_for(key)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        try:
+            meta = json.loads(self._meta_path(path).read_text())
+        except (OSError, ValueError):
+            meta = {}
+        return {
+            "ContentLength": size,
+            "ContentType": meta.get("content_type", "application/octet-stream"),
+            "ETag": meta.get("etag", ""),
+        }
+
+    def check_bucket(self) -> None:
+        """Raise if the storage root is missing."""
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Storage root {self.root} does not exist")
+
+    def ensure_bucket(self, bucket: Optional[str] = None) -> None:
+        """Create the storage root if it doesn't exist."""
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def upload_file(
+        self, key: str, data: bytes, content_type: str = "application/octet-stream", server_side_encryption: bool = True
+    ) -> None:
+        """Write an object (server_side_encryption is accepted and ignored)."""
+        with self.open_multipart_writer(key, content_type) as writer:
+            writer.write(data)
+
+    def open_multipart_writer(self, key: str, content_type: str = "application/octet-stream") -> LocalMultipartWriter:
+        """Open a streaming writer for an object (use as a context manager)."""
+        return LocalMultipartWriter(self, key, content_type)
+
+    def download_file(self, key: str) -> bytes:
+        """Read an object."""
+        return self.path_for(key).read_bytes()
+
+    def download_large_file(self, key: str) -> bytes:
+        """Read an object (same as download_file locally)."""
+        return self.download_file(key)
+
+    def download_range(self, key: str, start: int, end: int) -> bytes:
+        """Read bytes start..end (inclusive) of an object."""
+        with open(self.path_for(key), "rb") as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+
+    def download_if_modified(self, key: str, etag: Optional[str]) -> tuple[Optional[bytes], str]:
+        """Read an object unless its ETag still matches etag.
+
+        Returns:
+            Tuple of (data, or None when unchanged; current ETag)
+        """
+        head = self.head(key)
+        if head is None:
+            raise FileNotFoundError(f"No such object: {key}")
+        if etag and head["ETag"] == etag:
+            return None, etag
+        return self.download_file(key), head["ETag"]
+
+    def get_file_size(self, key: str) -> Optional[int]:
+        """Get object size, or None if it doesn't exist."""
+        head = self.head(key)
+        return head["ContentLength"] if head else None
+
+    def delete_file(self, key: str) -> None:
+        """Delete an object (missing objects are ignored, as in S3)."""
+        path = self.path_for(key)
+        for target in (path, self._meta_path(path)):
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                pass
+
+    def delete_objects(self, keys: list[str]) -> list[str]:
+        """Delete objects, returning the keys that could not be deleted."""
+        failed = []
+        for key in keys:
+            try:
+                self.delete_file(key)
+            except (OSError, ValueError):
+                failed.append(key)
+        return failed
+
+    def iter_key_pages(self, prefix: str, page_size: int = 1000) -> Iterator[list[str]]:
+        """Yield the keys under a prefix in pages of up to page_size keys."""
+        keys = [obj["Key"] for obj in self.list_objects(prefix)]
+        for start in range(0, len(keys), page_size):
+            yield keys[start : start + page_size]
+
+    def list_objects(self, prefix: str) -> list[dict]:
+        """List every object under a prefix (dicts with Key, Size, LastModified)."""
+        if not self.root.is_dir():
+            return []
+        objects = []
+        for path in sorted(self.root.rglob("*")):
+            if not path.is_file() or path.name.startswith(".") or path.suffix == ".part":
+                continue
+            key = path.relative_to(self.root).as_posix()
+            if key.startswith(prefix):
+                stat = path.stat()
+                objects.append({
+                    "Key": key,
+                    "Size": stat.st_size,
+                    "LastModified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                })
+        return objects
+
+    def _presign(self, method: str, key: str, expiry: int, extra: Optional[dict] = None) -> str:
+        expires = int(time.time()) + expiry
+        query = {"expires": expires, "signature": sign(method, key, expires), **(extra or {})}
+        return f"{settings.LOCAL_STORAGE_BASE_URL}/storage/{quote(key)}?{urlencode(query)}"
+
+    def generate_presigned_url(self, key: str, expiry: int = 3600) -> str:
+        """Generate a signed GET URL served by the API's /storage/ route."""
+        return self._presign("GET", key, expiry)
+
+    def generate_presigned_put_url(self, key: str, content_type: str = "image/jpeg", expiry: int = 3600) -> str:
+        """Generate a signed PUT URL accepted by the API's /storage/ route."""
+        return self._presign("PUT", key, expiry, {"content_type": content_type})
+
+    def get_public_url(self, key: str) -> str:
+        """Get a URL for an object (always presigned locally)."""
+        return self.generate_presigned_url(key)
+
+    def get_download_url(self, key: str, expiry: int = 3600) -> str:
+        """Get a download URL for an object (always presigned locally)."""
+        return self.generate_presigned_url(key, expiry)
@@ -0,0 +1,106 @@
+"""Presigned GET URL cache with time-aligned expiry windows.
+
+Signing on every list request costs an HMAC chain per item and yields a
+different URL each time, so clients and CDNs can never reuse a cached
+image. Instead, time is cut into windows of a quarter of the requested
+expiry. The first request for a key in a window signs a URL that expires
+one full expiry after the window ends; every later request in that window
+(in this process or, through Redis, any other API worker) gets the same
+bytes back. A served URL is therefore always valid for at least the
+requested expiry, and at most a quarter longer.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.security import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Windows are this fraction of the requested expiry
+WINDOW_DIVISOR = 4
+
+# In-process entries kept (least recently used are evicted first)
+MAX_LOCAL_ENTRIES = 10000
+
+_REDIS_PREFIX = "presigned"
+
+
+def expiry_window(expiry: int, now: float) -> Tuple[int, int]:
+    """Get the window index and the aligned expiry time for a request.
+
+    Args:
+        expiry: Requested URL lifetime in seconds
+        now: Current Unix time
+
+    Returns:
+        Tuple of (window index, Unix time the URL signed in it expires)
+    """
+    length = max(expiry // WINDOW_DIVISOR, 1)
+    index = int(now // length)
+    return index, (index + 1) * length + expiry
+
+
+class PresignedUrlCache:
+    """Two-level (process, Redis) memo of presigned URLs per (key, window)."""
+
+    def __init__(self, max_entries: int = MAX_LOCAL_ENTRIES):
+        self._local: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._max_entries = max_entries
+        self._stats = {"local_hits": 0, "redis_hits": 0, "signed": 0}
+
+    async def get(self, key: str, expiry: int, sign: Callable[[str, int], str]) -> str:
+        """Get the URL for key in the current window, signing it if needed.
+
+        Args:
+            key: S3 object key
+            expiry: Requested URL lifetime in seconds
+            sign: Signer taking (key, expires_in seconds)
+
+        Returns:
+            Presigned URL, valid for at least expiry seconds
+        """
+        now = time.time()
+        window, expires_at = expiry_window(expiry, now)
+        local_key = (key, expiry, window)
+
+        url = self._local.get(local_key)
+        if url is not None:
+            self._local.move_to_end(local_key)
+            self._stats["local_hits"] += 1
+            return url
+
+        redis_key = f"{_REDIS_PREFIX}:{expiry}:{window}:{key}"
+        ttl = max(int(expires_at - expiry - now), 1)
+        try:
+            url = await redis_client.get(redis_key)
+            if url is not None:
+                self._stats["redis_hits"] += 1
+            else:
+                url = sign(key, int(expires_at - now))
+                self._stats["signed"] += 1
+                # Another worker may have signed concurrently; keep the first URL
+                if not await redis_client.set(redis_key, url, ex=ttl, nx=True):
+                    url = await redis_client.get(redis_key) or url
+        except RedisError as e:
+            logger.warning(f"Presigned URL cache unavailable: {e}")
+            if url is None:
+                url = sign(key, int(expires_at - now))
+                self._stats["signed"] += 1
+
+        self._remember(local_key, url)
+        return url
+
+    def _remember(self, local_key: Tuple[str, int, int], url: str) -> None:
+        self._local[local_key] = url
+        self._local.move_to_end(local_key)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since process start: local_hits, redis_hits, signed."""
+        return dict(self._stats)
@@ -1,28 +1,196 @@
-"""S3-compatible storage client with encryption support."""
+"""S3-compatible storage client with encryption support.
 
-from typing import Optional
+boto3 clients are thread-safe and hold the HTTP connection pool, so each
+process keeps one per endpoint (get_client) instead of building a client
+(and a fresh pool, TLS handshakes included) per request. The registry is
+keyed by PID so Celery's forked workers never share a parent's sockets.
+"""
+
+import io
+import os
+import threading
+from typing import Iterator, Optional
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
 from app.core.config import settings
 
 
+# S3 requires every multipart part except the last to be at least 5 MiB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Objects at least this large go through the transfer manager (multipart,
+# concurrent parts); smaller ones are a single PUT/GET
+TRANSFER_THRESHOLD = 2 * MULTIPART_PART_SIZE
+
+# DeleteObjects accepts at most this many keys per request
+MAX_DELETE_BATCH = 1000
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=TRANSFER_THRESHOLD,
+    multipart_chunksize=MULTIPART_PART_SIZE,
+    max_concurrency=settings.S3_TRANSFER_CONCURRENCY,
+    use_threads=True,
+)
+
+_clients: dict[str, object] = {}
+_clients_pid: Optional[int] = None
+_clients_lock = threading.Lock()
+_client_constructions = 0
+
+
+def _client_config() -> Config:
+    return Config(
+        signature_version="s3v4",
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        retries={"mode": settings.S3_RETRY_MODE, "max_attempts": settings.S3_MAX_ATTEMPTS},
+    )
+
+
+def get_client(endpoint_url: Optional[str] = None):
+    """Get this process's pooled boto3 S3 client for an endpoint.
+
+    Args:
+        endpoint_url: S3 endpoint (defaults to settings.S3_ENDPOINT)
+
+    Returns:
+        Shared boto3 S3 client
+    """
+    global _clients_pid, _client_constructions
+
+    endpoint_url = endpoint_url or settings.S3_ENDPOINT
+    pid = os.getpid()
+    with _clients_lock:
+        if _clients_pid != pid:
+            # Forked: the parent's pools are not ours to use
+            _clients.clear()
+            _clients_pid = pid
+        client = _clients.get(endpoint_url)
+        if client is None:
+            # boto3.client() uses the default session, which is not thread-safe
+            client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=endpoint_url,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                config=_client_config(),
+            )
+            _clients[endpoint_url] = client
+            _client_constructions += 1
+        return client
+
+
+def get_client_stats() -> dict[str, int]:
+    """Get client registry counters for this process.
+
+    Returns:
+        Dict with clients_constructed (since process start), clients_cached
+        and max_pool_connections
+    """
+    with _clients_lock:
+        return {
+            "clients_constructed": _client_constructions,
+            "clients_cached": len(_clients),
+            "max_pool_connections": settings.S3_MAX_POOL_CONNECTIONS,
+        }
+
+
+class S3MultipartWriter:
+    """Write-only file-like object that streams into an S3 multipart upload.
+
+    Buffers at most one part in memory. Use as a context manager: the upload
+    is completed on clean exit and aborted if an exception escapes.
+    """
+
+    def __init__(self, client, bucket: str, key: str, content_type: str, part_size: int = MULTIPART_PART_SIZE):
+        """Start a multipart upload.
+
+        Args:
+            client: boto3 S3 client
+            bucket: Bucket name
+            key: S3 object key
+            content_type: MIME type
+            part_size: Part size in bytes (>= 5 MiB)
+        """
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._parts: list[dict] = []
+        self.bytes_written = 0
+        response = client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)
+        self._upload_id = response["UploadId"]
+
+    def write(self, data: bytes) -> int:
+        """Buffer data, uploading full parts as they fill."""
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[: self._part_size]))
+            del self._buffer[: self._part_size]
+        return len(data)
+
+    def flush(self) -> None:
+        """No-op (parts are uploaded as they fill, the remainder on close)."""
+
+    def _upload_part(self, body: bytes) -> None:
+        part_number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def close(self) -> None:
+        """Upload the final part and complete the multipart upload."""
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        self._client.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+
+    def abort(self) -> None:
+        """Abort the multipart upload, discarding uploaded parts."""
+        self._client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+
+    def __enter__(self) -> "S3MultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
 class S3Client:
     """S3-compatible storage client for MinIO/AWS S3."""
 
     def __init__(self):
-        """Initialize S3 client from settings."""
-        self.client = boto3.client(
-            "s3",
-            endpoint_url=settings.S3_ENDPOINT,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
-            config=Config(signature_version="s3v4"),
-        )
+        """Initialize S3 client from settings (cheap: the boto3 client is pooled)."""
         self.bucket_name = settings.S3_BUCKET_NAME
 
+    @property
+    def client(self):
+        """Pooled boto3 client for the current process."""
+        return get_client()
+
+    def check_bucket(self) -> None:
+        """HEAD the bucket (raises ClientError if it is missing or inaccessible)."""
+        self.client.head_bucket(Bucket=self.bucket_name)
+
     def ensure_bucket(self, bucket: Optional[str] = None) -> None:
         """Create bucket if it doesn't exist."""
         bucket = bucket or self.bucket_name
@@ -43,41 +211,124 @@ class S3Client:
             content_type: MIME type
             server_side_encryption: Enable SSE-S3 (disable for MinIO without KMS)
         """
-        put_args = {
-            "Bucket": self.bucket_name,
-            "Key": key,
-            "Body": data,
-            "ContentType": content_type,
-        }
+        extra_args = {"ContentType": content_type}
 
         # Only add ServerSideEncryption if enabled (MinIO without KMS doesn't support it)
         if server_side_encryption:
-            put_args["ServerSideEncryption"] = "AES256"
+            extra_args["ServerSideEncryption"] = "AES256"
+
+        if len(data) >= TRANSFER_THRESHOLD:
+            # Large artifacts: multipart with concurrent part uploads
+            self.client.upload_fileobj(
+                io.BytesIO(data), self.bucket_name, key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG
+            )
+        else:
+            self.client.put_object(Bucket=self.bucket_name, Key=key, Body=data, **extra_args)
+
+    def open_multipart_writer(self, key: str, content_type: str = "application/octet-stream") -> S3MultipartWriter:
+        """Open a streaming writer backed by an S3 multipart upload.
 
-        self.client.put_object(**put_args)
+        Args:
+            key: S3 object key
+            content_type: MIME type
+
+        Returns:
+            S3MultipartWriter (use as a context manager)
+        """
+        return S3MultipartWriter(self.client, self.bucket_name, key, content_type)
 
     def download_file(self, key: str) -> bytes:
         """Download file from storage."""
         response = self.client.get_object(Bucket=self.bucket_name, Key=key)
         return response["Body"].read()
 
+    def download_large_file(self, key: str) -> bytes:
+        """Download a large artifact with concurrent ranged GETs.
+
+        Costs an extra HEAD for the size, so only worth it for objects
+        expected to exceed TRANSFER_THRESHOLD (originals, HD masters).
+        """
+        buffer = io.BytesIO()
+        self.client.download_fileobj(self.bucket_name, key, buffer, Config=TRANSFER_CONFIG)
+        return buffer.getvalue()
+
+    def download_range(self, key: str, start: int, end: int) -> bytes:
+        """Download bytes start..end (inclusive) of an object (ranged GET).
+
+        Returns fewer bytes when the object is shorter than end + 1.
+        """
+        response = self.client.get_object(Bucket=self.bucket_name, Key=key, Range=f"bytes={start}-{end}")
+        return response["Body"].read()
+
+    def download_if_modified(self, key: str, etag: Optional[str]) -> tuple[Optional[bytes], str]:
+        """Download an object unless its ETag still matches etag (conditional GET).
+
+        Args:
+            key: S3 object key
+            etag: ETag of a previously downloaded copy, or None
+
+        Returns:
+            Tuple of (data, or None when unchanged; current ETag)
+        """
+        kwargs = {"IfNoneMatch": etag} if etag else {}
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=key, **kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return None, etag
+            raise
+        return response["Body"].read(), response["ETag"]
+
+    def get_file_size(self, key: str) -> Optional[int]:
+        """Get object size via HEAD (no body transfer), or None if it doesn't exist."""
+        try:
+            response = self.client.head_object(Bucket=self.bucket_name, Key=key)
+            return response["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
     def delete_file(self, key: str) -> None:
         """Delete a single file."""
         self.client.delete_object(Bucket=self.bucket_name, Key=key)
 
-    def delete_user_files(self, user_id_prefix: str) -> None:
-        """Delete all files for a user (for GDPR compliance)."""
-        # List all objects with the user's prefix
+    def delete_objects(self, keys: list[str]) -> list[str]:
+        """Delete objects with batched DeleteObjects requests (missing keys count as deleted).
+
+        Args:
+            keys: Object keys (any number; sent MAX_DELETE_BATCH at a time)
+
+        Returns:
+            Keys that could not be deleted
+        """
+        failed = []
+        for start in range(0, len(keys), MAX_DELETE_BATCH):
+            batch = keys[start : start + MAX_DELETE_BATCH]
+            response = self.client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
+    def iter_key_pages(self, prefix: str) -> Iterator[list[str]]:
+        """Yield the keys under a prefix one listing page (up to MAX_DELETE_BATCH keys) at a time."""
         paginator = self.client.get_paginator("list_objects_v2")
-        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=user_id_prefix)
+        for page in paginator.paginate(
+            Bucket=self.bucket_name, Prefix=prefix, PaginationConfig={"PageSize": MAX_DELETE_BATCH}
+        ):
+            keys = [obj["Key"] for obj in page.get("Contents", [])]
+            if keys:
+                yield keys
 
-        for page in pages:
-            if "Contents" in page:
-                objects = [{"Key": obj["Key"]} for obj in page["Contents"]]
-                if objects:
-                    self.client.delete_objects(
-                        Bucket=self.bucket_name, Delete={"Objects": objects}
-                    )
+    def list_objects(self, prefix: str) -> list[dict]:
+        """List every object under a prefix (dicts with Key, Size, LastModified, ...)."""
+        paginator = self.client.get_paginator("list_objects_v2")
+        objects = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            objects.extend(page.get("Contents", []))
+        return objects
 
     def generate_presigned_url(
         self, key: str, expiry: int = 3600
@@ -145,8 +396,23 @@ class S3Client:
             return self.generate_presigned_url(key, expiry)
 
 
-# Global S3 client instance
-s3_client = S3Client()
+def create_storage_client():
+    """Build the storage client selected by settings.STORAGE_BACKEND.
+
+    Returns:
+        S3Client, or LocalStorageClient (same API) when STORAGE_BACKEND is "local"
+    """
+    if settings.STORAGE_BACKEND == "local":
+        from app.storage.local import LocalStorageClient
+
+        return LocalStorageClient()
+    if settings.STORAGE_BACKEND != "s3":
+        raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+    return S3Client()
+
+
+# Global storage client instance
+s3_client = create_storage_client()
 
 
 def ensure_bucket(bucket: str) -> None:
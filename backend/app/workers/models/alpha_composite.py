@@ -0,0 +1,91 @@
+"""N-way alpha compositing in 16-bit fixed point.
+
+Layering sources one over another with "result = base * (1 - a) + overlay * a"
+is equivalent to a single weighted sum in which source i gets weight
+a_i * (1 - a_{i+1}) * ... * (1 - a_{n-1}) and the base gets whatever the
+overlays leave. The compositor computes those weights top-down in units of
+1/255, so they always sum to exactly 255 and every product, and the
+accumulated sum itself, fits in uint16 (255 * 255 = 65025). One pass over
+the sources, no float conversions, and the full-size work happens in the
+same few preallocated buffers however many sources there are.
+
+Compared with the float reference (exact weights, rounded once), every
+output channel is within MAX_ERROR levels; see tests/test_alpha_composite.py.
+"""
+
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+# Worst-case deviation (in 8-bit levels) from the exact float result, for
+# up to four sources: each weight is rounded once to 1/255 and the
+# rounding error carries into the weights below it (1 is what random
+# inputs reach in practice)
+MAX_ERROR = 2
+
+
+def _div255(values: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Round values / 255 for values in [0, 65025] without integer division.
+
+    Uses round(x / 255) == (y + (y >> 8)) >> 8 with y = x + 128, which is
+    exact over that range and stays within uint16.
+    """
+    np.add(values, 128, out=values)
+    np.right_shift(values, 8, out=out)
+    np.add(values, out, out=values)
+    np.right_shift(values, 8, out=values)
+    return values
+
+
+def alpha_composite(
+    images: List[np.ndarray],
+    masks: List[Optional[np.ndarray]],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Layer images over the first one using their masks as alpha.
+
+    Equivalent to blending each image i >= 1 over the running result with
+    alpha masks[i] / 255, in order, but done as one weighted sum.
+
+    Args:
+        images: Same-size uint8 images (H, W) or (H, W, C); the first is the base
+        masks: uint8 masks (H, W) matching images; masks[0] is ignored
+        out: Optional uint8 output buffer shaped like the images
+
+    Returns:
+        Composited uint8 image (out, if given)
+    """
+    base = images[0]
+    height, width = base.shape[:2]
+    channels = base.shape[2] if base.ndim == 3 else 1
+    if out is None:
+        out = np.empty_like(base)
+
+    accumulator = np.zeros(base.shape, dtype=np.uint16)
+    scratch = np.empty(base.shape, dtype=np.uint16)
+    remaining = np.full((height, width), 255, dtype=np.uint16)
+    weight = np.empty((height, width), dtype=np.uint16)
+    carry = np.empty((height, width), dtype=np.uint16)
+
+    def accumulate(image: np.ndarray, plane: np.ndarray) -> None:
+        # numpy broadcasting over a 3-wide channel axis is several times
+        # slower than cv2's packed multiply, so widen the weight plane instead
+        np.copyto(scratch, image)
+        cv2.multiply(scratch, cv2.merge([plane] * channels) if channels > 1 else plane, dst=scratch)
+        cv2.add(accumulator, scratch, dst=accumulator)
+
+    # Top-most layer first: it takes alpha of everything, the next one
+    # alpha of what is left, and so on; the base gets the remainder
+    for image, mask in zip(reversed(images[1:]), reversed(masks[1:])):
+        np.multiply(mask, remaining, out=weight, dtype=np.uint16)
+        _div255(weight, carry)
+        np.subtract(remaining, weight, out=remaining)
+        accumulate(image, weight)
+
+    accumulate(base, remaining)
+
+    # Weights sum to 255 at every pixel, so this is the weighted mean
+    _div255(accumulator, scratch)
+    np.copyto(out, accumulator, casting="unsafe")
+    return out
@@ -0,0 +1,235 @@
+"""Layout planning and single-canvas rendering for composition artworks.
+
+A composition is planned first (canvas size and one rectangle per source),
+then each source is resized straight into its rectangle of a preallocated
+canvas, so no intermediate rows, padding tiles or concatenated copies are
+made. The thumbnail is planned the same way at thumbnail scale and filled
+from the sources in the same pass, instead of downscaling the finished
+canvas.
+
+Layouts:
+    horizontal: one row; every source keeps its aspect ratio at a shared height
+    vertical: one column; every source keeps its aspect ratio at a shared width
+    grid_RxC: R rows x C columns of equal cells; sources are fitted inside
+        their cell (aspect preserved, centered), so mixed aspect ratios work
+    grid_2x2 is the 2x2 case of grid_RxC.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GRID_PATTERN = re.compile(r"^grid_(\d+)x(\d+)$")
+
+# Largest grid accepted (rows or columns)
+MAX_GRID = 4
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Destination rectangle of one source on the canvas."""
+
+    index: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class LayoutPlan:
+    """Canvas size plus where each source goes."""
+
+    width: int
+    height: int
+    placements: Tuple[Placement, ...]
+
+    def scaled(self, scale: float) -> "LayoutPlan":
+        """Plan for the same layout at another scale (e.g. the thumbnail).
+
+        Edges are rounded independently so neighbouring cells stay adjacent.
+        """
+
+        def edge(value: int) -> int:
+            return int(round(value * scale))
+
+        # Tiny sources may round to an empty rectangle; render skips those
+        placements = tuple(
+            Placement(
+                p.index,
+                edge(p.x),
+                edge(p.y),
+                edge(p.x + p.width) - edge(p.x),
+                edge(p.y + p.height) - edge(p.y),
+            )
+            for p in self.placements
+        )
+        return LayoutPlan(width=max(edge(self.width), 1), height=max(edge(self.height), 1), placements=placements)
+
+
+def parse_layout(layout: str, count: int) -> Tuple[int, int]:
+    """Get (rows, columns) for a layout name.
+
+    Args:
+        layout: "horizontal", "vertical", or "grid_RxC"
+        count: Number of sources
+
+    Returns:
+        Tuple of (rows, columns)
+
+    Raises:
+        ValueError: If the layout is unknown or has fewer cells than sources
+    """
+    if layout == "horizontal":
+        return 1, count
+    if layout == "vertical":
+        return count, 1
+
+    match = GRID_PATTERN.match(layout)
+    if not match:
+        raise ValueError(f"Unknown layout: {layout}")
+
+    rows, cols = int(match.group(1)), int(match.group(2))
+    if not (1 <= rows <= MAX_GRID and 1 <= cols <= MAX_GRID):
+        raise ValueError(f"Grid must be between 1x1 and {MAX_GRID}x{MAX_GRID}: {layout}")
+    if rows * cols < count:
+        raise ValueError(f"Layout {layout} has {rows * cols} cells for {count} sources")
+    return rows, cols
+
+
+def _fit(width: int, height: int, box_width: int, box_height: int) -> Tuple[int, int]:
+    """Largest size with the source aspect ratio that fits in the box."""
+    scale = min(box_width / width, box_height / height)
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def plan_layout(
+    sizes: List[Tuple[int, int]],
+    layout: str,
+    gutter: int = 0,
+    max_dimension: int = 2048,
+) -> LayoutPlan:
+    """Plan a composition canvas.
+
+    Sources are never upscaled past the smallest one along the shared
+    dimension, matching the previous concat-based behaviour.
+
+    Args:
+        sizes: (width, height) of each source, in order
+        layout: "horizontal", "vertical", or "grid_RxC"
+        gutter: Pixels of background between neighbouring cells
+        max_dimension: Cap for the shared height/width, or for grid cells
+
+    Returns:
+        LayoutPlan with canvas size and one placement per source
+
+    Raises:
+        ValueError: If the layout is invalid for the number of sources
+    """
+    rows, cols = parse_layout(layout, len(sizes))
+    placements = []
+
+    if layout == "horizontal":
+        # Shared height; widths follow each source's aspect ratio
+        height = min(min(h for _, h in sizes), max_dimension)
+        x = 0
+        for index, (w, h) in enumerate(sizes):
+            width = max(int(height * w / h), 1)
+            placements.append(Placement(index, x, 0, width, height))
+            x += width + gutter
+        return LayoutPlan(width=x - gutter, height=height, placements=tuple(placements))
+
+    if layout == "vertical":
+        # Shared width; heights follow each source's aspect ratio
+        width = min(min(w for w, _ in sizes), max_dimension)
+        y = 0
+        for index, (w, h) in enumerate(sizes):
+            height = max(int(width * h / w), 1)
+            placements.append(Placement(index, 0, y, width, height))
+            y += height + gutter
+        return LayoutPlan(width=width, height=y - gutter, placements=tuple(placements))
+
+    # Grid: equal cells sized from the smallest source, capped at max_dimension
+    cell_width = min(w for w, _ in sizes)
+    cell_height = min(h for _, h in sizes)
+    scale = max_dimension / max(cell_width, cell_height)
+    if scale < 1:
+        cell_width, cell_height = int(cell_width * scale), int(cell_height * scale)
+
+    for index, (w, h) in enumerate(sizes):
+        row, col = divmod(index, cols)
+        width, height = _fit(w, h, cell_width, cell_height)
+        x = col * (cell_width + gutter) + (cell_width - width) // 2
+        y = row * (cell_height + gutter) + (cell_height - height) // 2
+        placements.append(Placement(index, x, y, width, height))
+
+    return LayoutPlan(
+        width=cols * cell_width + (cols - 1) * gutter,
+        height=rows * cell_height + (rows - 1) * gutter,
+        placements=tuple(placements),
+    )
+
+
+def render_composition(
+    images: List[np.ndarray],
+    plan: LayoutPlan,
+    thumb_width: Optional[int] = 256,
+    background: int = 0,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Render a planned composition and its thumbnail in one pass.
+
+    Each source is resized directly into its rectangle of the preallocated
+    canvas (cv2.resize writes into the view) and, from the same source,
+    into the thumbnail canvas.
+
+    Args:
+        images: BGR sources, in plan order
+        plan: Layout from plan_layout
+        thumb_width: Thumbnail width (height follows the canvas), or None to skip
+        background: Gray level for gutters and letterboxing
+        on_progress: Optional callback receiving the completed fraction (0-1)
+
+    Returns:
+        Tuple of (canvas, thumbnail or None)
+    """
+    channels = images[0].shape[2] if images[0].ndim == 3 else 1
+    shape = (plan.height, plan.width, channels) if channels > 1 else (plan.height, plan.width)
+    canvas = np.full(shape, background, dtype=np.uint8)
+
+    thumbnail = None
+    thumb_plan = None
+    if thumb_width:
+        thumb_plan = plan.scaled(thumb_width / plan.width)
+        thumb_shape = (thumb_plan.height, thumb_plan.width) + shape[2:]
+        thumbnail = np.full(thumb_shape, background, dtype=np.uint8)
+
+    for done, placement in enumerate(plan.placements, start=1):
+        source = images[placement.index]
+        _resize_into(source, canvas, placement, cv2.INTER_LANCZOS4)
+        if thumb_plan is not None:
+            _resize_into(source, thumbnail, thumb_plan.placements[placement.index], cv2.INTER_AREA)
+        if on_progress:
+            on_progress(done / len(plan.placements))
+
+    return canvas, thumbnail
+
+
+def _resize_into(source: np.ndarray, target: np.ndarray, placement: Placement, interpolation: int) -> None:
+    """Resize source into the placement rectangle of target, in place."""
+    region = target[
+        placement.y : placement.y + placement.height,
+        placement.x : placement.x + placement.width,
+    ]
+    if region.size == 0:
+        return
+    if source.shape[:2] == region.shape[:2]:
+        region[...] = source
+        return
+    cv2.resize(source, (placement.width, placement.height), dst=region, interpolation=interpolation)
@@ -137,17 +137,37 @@ class ModelCache:
     def get_sd_generator(cls):
         """Get or load SDXL Turbo generator (lazy load).
 
+        Backend follows SD_BACKEND: "cuda" uses diffusers on GPU, "onnx" uses
+        ONNX Runtime CPU, "auto" tries CUDA first and falls back to ONNX CPU
+        when CUDA is unavailable and an exported graph is present.
+
         Returns:
-            SDXLTurboGenerator instance
+            SDXLTurboGenerator (or SDXLTurboONNXGenerator) instance
         """
         if cls._sd_generator is None:
             try:
+                from app.core.config import settings
                 from app.workers.models.sd_generator import SDXLTurboGenerator
-
-                cls._sd_generator = SDXLTurboGenerator()
-                cls._sd_generator.load()
-
-                logger.info("Loaded and cached SDXL Turbo generator")
+                from app.workers.models.sd_onnx_generator import (
+                    SDXLTurboONNXGenerator,
+                    onnx_model_available,
+                )
+
+                if settings.SD_BACKEND == "onnx":
+                    generator = SDXLTurboONNXGenerator()
+                    generator.load()
+                else:
+                    generator = SDXLTurboGenerator()
+                    generator.load()
+
+                    if generator.dev_mode and settings.SD_BACKEND == "auto" and onnx_model_available():
+                        logger.info("CUDA SDXL unavailable, switching to ONNX Runtime CPU backend")
+                        generator = SDXLTurboONNXGenerator()
+                        generator.load()
+
+                cls._sd_generator = generator
+
+                logger.info(f"Loaded and cached SDXL Turbo generator ({type(generator).__name__})")
 
             except Exception as e:
                 logger.error(f"Failed to load SDXL Turbo generator: {e}")
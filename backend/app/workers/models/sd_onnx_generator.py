@@ -0,0 +1,342 @@
+"""SDXL Turbo img2img on ONNX Runtime CPU for workers without CUDA."""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+from app.workers.models.sd_generator import SDXLTurboGenerator
+
+logger = logging.getLogger(__name__)
+
+# Exported graph components (Optimum ONNX layout: <component>/model.onnx)
+COMPONENTS = ("text_encoder", "text_encoder_2", "unet", "vae_encoder", "vae_decoder")
+
+# Weight file per precision (int8 files come from onnxruntime dynamic quantization)
+PRECISION_FILES = {
+    "fp16": "model.onnx",
+    "int8": "model_quantized.onnx",
+}
+
+# SDXL VAE latent scaling factor
+VAE_SCALING_FACTOR = 0.13025
+
+# SDXL Turbo scheduler configuration (EulerAncestral, scaled_linear, trailing spacing)
+NUM_TRAIN_TIMESTEPS = 1000
+BETA_START = 0.00085
+BETA_END = 0.012
+
+
+def default_model_dir() -> Path:
+    """Get the exported SDXL Turbo ONNX directory from settings."""
+    if settings.SD_ONNX_MODEL_DIR:
+        return Path(settings.SD_ONNX_MODEL_DIR)
+    return Path(__file__).parent / "weights" / "sdxl_turbo_onnx"
+
+
+def onnx_model_available(model_dir: Optional[Path] = None) -> bool:
+    """Check whether an exported SDXL Turbo ONNX graph is present."""
+    model_dir = model_dir or default_model_dir()
+    return (model_dir / "unet").is_dir() and (model_dir / "vae_decoder").is_dir()
+
+
+class EulerAncestralSchedule:
+    """Minimal NumPy port of diffusers' EulerAncestralDiscreteScheduler for img2img.
+
+    Only the "trailing" timestep spacing used by SDXL Turbo is implemented.
+    """
+
+    def __init__(self, num_steps: int, strength: float):
+        """Compute timesteps and sigmas for an img2img run.
+
+        Args:
+            num_steps: Number of inference steps requested
+            strength: Transformation strength 0-1 (truncates the schedule)
+        """
+        betas = np.linspace(BETA_START**0.5, BETA_END**0.5, NUM_TRAIN_TIMESTEPS, dtype=np.float64) ** 2
+        alphas_cumprod = np.cumprod(1.0 - betas)
+        all_sigmas = np.sqrt((1.0 - alphas_cumprod) / alphas_cumprod)
+
+        step_ratio = NUM_TRAIN_TIMESTEPS / num_steps
+        timesteps = np.round(np.arange(NUM_TRAIN_TIMESTEPS, 0, -step_ratio)).astype(np.int64) - 1
+        sigmas = np.interp(timesteps, np.arange(NUM_TRAIN_TIMESTEPS), all_sigmas)
+
+        # img2img: skip the first (1 - strength) part of the schedule, like diffusers
+        init_steps = min(int(num_steps * strength), num_steps)
+        t_start = max(num_steps - init_steps, 0)
+
+        self.timesteps = timesteps[t_start:]
+        self.sigmas = np.append(sigmas[t_start:], 0.0).astype(np.float32)
+
+    def step(
+        self, model_output: np.ndarray, index: int, latents: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """Advance latents by one ancestral Euler step."""
+        sigma_from = self.sigmas[index]
+        sigma_to = self.sigmas[index + 1]
+        sigma_up = np.sqrt(sigma_to**2 * (sigma_from**2 - sigma_to**2) / sigma_from**2)
+        sigma_down = np.sqrt(sigma_to**2 - sigma_up**2)
+
+        denoised = latents - sigma_from * model_output
+        derivative = (latents - denoised) / sigma_from
+        latents = latents + derivative * (sigma_down - sigma_from)
+
+        if sigma_up > 0:
+            latents = latents + rng.standard_normal(latents.shape).astype(latents.dtype) * sigma_up
+        return latents
+
+
+class SDXLTurboONNXGenerator(SDXLTurboGenerator):
+    """SDXL Turbo image-to-image generator running on ONNX Runtime CPU.
+
+    Runs an exported SDXL Turbo graph (text encoders, UNet, VAE) with fp16
+    or int8 weights. With sequential mode enabled, only one component is
+    resident at a time so peak RAM stays at roughly the UNet size.
+
+    Dev-mode fallback: Uses OpenCV artistic filters when the graph is missing.
+    """
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        precision: Optional[str] = None,
+        sequential: Optional[bool] = None,
+        resolution: int = 1024,
+    ):
+        """Initialize generator (sessions loaded lazily).
+
+        Args:
+            model_dir: Exported ONNX directory (default: SD_ONNX_MODEL_DIR)
+            precision: "fp16" or "int8" (default: SD_ONNX_PRECISION)
+            sequential: Keep one component resident at a time (default: SD_ONNX_SEQUENTIAL)
+            resolution: Square generation resolution in pixels (multiple of 8)
+        """
+        super().__init__()
+        self.model_dir = Path(model_dir) if model_dir else default_model_dir()
+        self.precision = precision or settings.SD_ONNX_PRECISION
+        self.sequential = settings.SD_ONNX_SEQUENTIAL if sequential is None else sequential
+        self.resolution = resolution
+        self.device = "cpu"
+        self.sessions: dict = {}
+        self.tokenizer = None
+        self.tokenizer_2 = None
+
+    def load(self):
+        """Load tokenizers and (unless sequential) all ONNX sessions.
+
+        Falls back to dev-mode OpenCV if onnxruntime or the exported graph is unavailable.
+        """
+        if self.precision not in PRECISION_FILES:
+            logger.warning(f"Unknown SD_ONNX_PRECISION {self.precision!r}, using fp16")
+            self.precision = "fp16"
+
+        if not onnx_model_available(self.model_dir):
+            logger.warning(
+                f"SDXL Turbo ONNX graph not found at {self.model_dir}. "
+                "Using OpenCV simulation (dev mode)."
+            )
+            self.dev_mode = True
+            return
+
+        try:
+            import onnxruntime  # noqa: F401
+            from transformers import CLIPTokenizer
+
+            self.tokenizer = CLIPTokenizer.from_pretrained(str(self.model_dir / "tokenizer"))
+            self.tokenizer_2 = CLIPTokenizer.from_pretrained(str(self.model_dir / "tokenizer_2"))
+
+            if not self.sequential:
+                for component in COMPONENTS:
+                    self._session(component)
+
+            self.pipeline = "onnx"
+            logger.info(
+                f"SDXL Turbo ONNX backend ready (precision={self.precision}, "
+                f"sequential={self.sequential}, resolution={self.resolution})"
+            )
+
+        except ImportError:
+            logger.warning(
+                "onnxruntime or transformers not available. Using OpenCV simulation (dev mode)."
+            )
+            self.dev_mode = True
+        except Exception as e:
+            logger.error(f"Failed to load SDXL Turbo ONNX graph: {e}")
+            logger.warning("Falling back to OpenCV simulation (dev mode)")
+            self.dev_mode = True
+
+    def _model_path(self, component: str) -> Path:
+        """Resolve the weight file for a component, preferring the configured precision."""
+        preferred = self.model_dir / component / PRECISION_FILES[self.precision]
+        if preferred.exists():
+            return preferred
+        # Quantization is usually applied to the UNet only; other parts stay fp16
+        return self.model_dir / component / PRECISION_FILES["fp16"]
+
+    def _session(self, component: str):
+        """Get an ONNX session, evicting other components in sequential mode."""
+        if component in self.sessions:
+            return self.sessions[component]
+
+        import onnxruntime as ort
+
+        if self.sequential:
+            self.sessions.clear()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.SD_ONNX_NUM_THREADS > 0:
+            options.intra_op_num_threads = settings.SD_ONNX_NUM_THREADS
+        if self.sequential:
+            # Arena memory is never returned to the OS; disable it so evictions free RAM
+            options.enable_cpu_mem_arena = False
+
+        model_path = self._model_path(component)
+        logger.debug(f"Loading ONNX component {component} from {model_path}")
+        session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.sessions[component] = session
+        return session
+
+    def _run(self, component: str, feeds: dict) -> list:
+        """Run a component, casting float inputs to the graph's declared dtype."""
+        session = self._session(component)
+
+        typed_feeds = {}
+        for graph_input in session.get_inputs():
+            if graph_input.name not in feeds:
+                continue
+            value = feeds[graph_input.name]
+            if graph_input.type == "tensor(float16)":
+                value = value.astype(np.float16)
+            elif graph_input.type == "tensor(float)":
+                value = value.astype(np.float32)
+            elif graph_input.type == "tensor(int32)":
+                value = value.astype(np.int32)
+            elif graph_input.type == "tensor(int64)":
+                value = value.astype(np.int64)
+            typed_feeds[graph_input.name] = value
+
+        outputs = session.run(None, typed_feeds)
+        return [np.asarray(output, dtype=np.float32) for output in outputs]
+
+    def _encode_prompt(self, prompt: str) -> tuple[np.ndarray, np.ndarray]:
+        """Encode prompt with both CLIP text encoders.
+
+        Returns:
+            Tuple of (prompt_embeds (1, 77, 2048), pooled_embeds (1, 1280))
+        """
+        hidden_states = []
+        pooled_embeds = None
+
+        for tokenizer, component in ((self.tokenizer, "text_encoder"), (self.tokenizer_2, "text_encoder_2")):
+            input_ids = tokenizer(
+                prompt,
+                padding="max_length",
+                max_length=tokenizer.model_max_length,
+                truncation=True,
+                return_tensors="np",
+            ).input_ids
+            outputs = self._run(component, {"input_ids": input_ids})
+            # SDXL conditions on the penultimate hidden layer of each encoder
+            hidden_states.append(outputs[-2])
+            if component == "text_encoder_2":
+                pooled_embeds = outputs[0]
+
+        return np.concatenate(hidden_states, axis=-1), pooled_embeds
+
+    def _encode_image(self, iris_image: Image.Image) -> np.ndarray:
+        """Encode the source image into scaled VAE latents."""
+        image = iris_image.convert("RGB").resize((self.resolution, self.resolution), Image.LANCZOS)
+        sample = np.asarray(image, dtype=np.float32) / 127.5 - 1.0
+        sample = sample.transpose(2, 0, 1)[np.newaxis]
+
+        latents = self._run("vae_encoder", {"sample": sample})[0]
+        if latents.shape[1] == 8:
+            # Graph exported latent distribution parameters: take the mean
+            latents = latents[:, :4]
+        return latents * VAE_SCALING_FACTOR
+
+    def _decode_latents(self, latents: np.ndarray) -> Image.Image:
+        """Decode latents into a PIL image."""
+        decoded = self._run("vae_decoder", {"latent_sample": latents / VAE_SCALING_FACTOR})[0]
+        image = np.clip((decoded[0].transpose(1, 2, 0) + 1.0) * 127.5, 0, 255).astype(np.uint8)
+        return Image.fromarray(image)
+
+    def generate(
+        self,
+        iris_image: Image.Image,
+        prompt: str,
+        control_image: Optional[Image.Image] = None,
+        num_steps: int = 4,
+        strength: float = 0.8,
+    ) -> Image.Image:
+        """Generate artistic composition from iris image.
+
+        Args:
+            iris_image: Source iris image (PIL Image)
+            prompt: Text prompt describing desired art style
+            control_image: Unused (kept for interface parity with the CUDA backend)
+            num_steps: Number of inference steps (default: 4 for Turbo)
+            strength: Transformation strength 0-1 (default: 0.8)
+
+        Returns:
+            Generated artistic image at 1024x1024 (PIL Image)
+        """
+        if self.dev_mode or self.pipeline is None:
+            return self._generate_dev_mode(iris_image, prompt)
+
+        try:
+            schedule = EulerAncestralSchedule(num_steps, strength)
+            if len(schedule.timesteps) == 0:
+                raise ValueError("num_steps * strength must be >= 1 for SDXL Turbo img2img")
+
+            rng = np.random.default_rng()
+            prompt_embeds, pooled_embeds = self._encode_prompt(prompt)
+            init_latents = self._encode_image(iris_image)
+
+            # Noise the source latents to the first sigma of the truncated schedule
+            noise = rng.standard_normal(init_latents.shape).astype(np.float32)
+            latents = init_latents + noise * schedule.sigmas[0]
+
+            size = float(self.resolution)
+            time_ids = np.array([[size, size, 0.0, 0.0, size, size]], dtype=np.float32)
+
+            for index, timestep in enumerate(schedule.timesteps):
+                sigma = schedule.sigmas[index]
+                scaled = latents / np.sqrt(sigma**2 + 1.0)
+                noise_pred = self._run(
+                    "unet",
+                    {
+                        "sample": scaled,
+                        "timestep": np.array([timestep]),
+                        "encoder_hidden_states": prompt_embeds,
+                        "text_embeds": pooled_embeds,
+                        "time_ids": time_ids,
+                    },
+                )[0]
+                latents = schedule.step(noise_pred, index, latents, rng)
+
+            result = self._decode_latents(latents)
+            if result.size != (1024, 1024):
+                result = result.resize((1024, 1024), Image.LANCZOS)
+            return result
+
+        except Exception as e:
+            logger.error(f"SDXL ONNX generation failed: {e}")
+            logger.warning("Falling back to dev-mode generation")
+            return self._generate_dev_mode(iris_image, prompt)
+
+        finally:
+            if self.sequential:
+                self.sessions.clear()
+
+    def unload(self):
+        """Release all ONNX sessions and tokenizers."""
+        self.sessions.clear()
+        self.tokenizer = None
+        self.tokenizer_2 = None
+        self.pipeline = None
+        logger.info("Unloaded SDXL Turbo ONNX sessions")
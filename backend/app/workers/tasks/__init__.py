@@ -1,4 +1,4 @@
 """Celery task modules."""
 
 # Import tasks so they get auto-discovered by Celery
-from app.workers.tasks import email, exports  # noqa: F401
+from app.workers.tasks import account_deletion, email, exports, storage_cleanup, upload_finalization  # noqa: F401
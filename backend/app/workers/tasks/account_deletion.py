@@ -0,0 +1,89 @@
+"""Background deletion of a deleted account's stored objects."""
+
+import logging
+
+from botocore.exceptions import BotoCoreError, ClientError
+from celery import Task
+from redis.exceptions import RedisError
+
+from app.services.account_deletion import DELETE_TASK, account_prefixes, update_deletion_status
+from app.storage.bulk_delete import BulkDeleteProgress, delete_all
+from app.storage.s3 import s3_client
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+class AccountDeletionIncompleteError(RuntimeError):
+    """Objects were left behind (failed deletes, or still being written)."""
+
+
+class RetryableAccountDeletionTask(Task):
+    """Base task class retrying until the account's objects are all gone."""
+
+    autoretry_for = (
+        AccountDeletionIncompleteError,
+        ClientError,
+        BotoCoreError,
+        RedisError,
+        ConnectionError,
+        TimeoutError,
+    )
+    retry_backoff = True
+    retry_backoff_max = 3600  # 1 hour max backoff
+    retry_jitter = True
+    max_retries = 10
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """Record the permanent failure (objects remain; an operator can re-run the task)."""
+        logger.error(f"Account deletion {task_id} permanently failed: {type(exc).__name__}: {exc}")
+        try:
+            update_deletion_status(task_id, status="failed")
+        except RedisError as e:
+            logger.warning(f"Could not record failure of account deletion {task_id}: {e}")
+
+
+@celery_app.task(bind=True, base=RetryableAccountDeletionTask, name=DELETE_TASK)
+def delete_account_objects(self, user_id: str, extra_keys: list[str]) -> dict:
+    """Delete every stored object of a deleted account.
+
+    Empties the account prefixes and deletes the extra keys (fusion
+    results) in parallel batches, reporting progress under the task ID.
+    Idempotent: a retry lists and deletes whatever is left.
+
+    Args:
+        user_id: ID of the deleted user
+        extra_keys: Keys outside the account prefixes
+
+    Returns:
+        Dict with the number of objects deleted
+
+    Raises:
+        AccountDeletionIncompleteError: If objects remain (retried)
+    """
+    deletion_id = self.request.id
+
+    def report(progress: BulkDeleteProgress) -> None:
+        fields = {
+            "deleted": progress.deleted,
+            "failed": len(progress.failed),
+            "passes": progress.passes,
+            "prefixes_done": progress.prefixes_done,
+            "prefixes_total": progress.prefixes_total,
+        }
+        try:
+            update_deletion_status(deletion_id, status="running", **fields)
+        except RedisError as e:
+            logger.warning(f"Could not record progress of account deletion {deletion_id}: {e}")
+        self.update_state(state="PROGRESS", meta=fields)
+
+    progress = delete_all(s3_client, account_prefixes(user_id), extra_keys, on_progress=report)
+
+    if not progress.complete:
+        raise AccountDeletionIncompleteError(
+            f"{len(progress.failed)} objects left for user {user_id}, e.g. {progress.failed[0]}"
+        )
+
+    update_deletion_status(deletion_id, status="completed")
+    logger.info(f"Account deletion {deletion_id}: {progress.deleted} objects deleted for user {user_id}")
+    return {"deleted": progress.deleted}
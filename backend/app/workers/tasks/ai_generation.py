@@ -1,16 +1,20 @@
 """Celery tasks for AI-unique art generation using Stable Diffusion."""
 
-import io
 import logging
 import time
 
 import cv2
-import numpy as np
 from celery import Task
 from PIL import Image
 
 from app.core.db import get_sync_session_maker
 from app.models.style_job import StyleJob
+from app.services.encoding import FORMAT_EXTENSIONS, encode_image
+from app.services.fusion_sources import refresh_best_artifacts
+from app.services.placeholders import compute_placeholders
+from app.services.renditions import all_rendition_keys, write_renditions
+from app.storage.deletion_queue import schedule_deletion_sync
+from app.storage.image_cache import load_image
 from app.storage.s3 import s3_client
 from app.workers.celery_app import celery_app
 from app.workers.models.model_cache import ModelCache
@@ -39,6 +43,7 @@ class RetryableAIGenerationTask(Task):
         """
         job_id = args[0] if args else kwargs.get("job_id")
         user_id = args[1] if len(args) > 1 else kwargs.get("user_id")
+        preview_format = args[6] if len(args) > 6 else kwargs.get("preview_format", "jpeg")
 
         if not job_id:
             return
@@ -46,24 +51,15 @@ class RetryableAIGenerationTask(Task):
         SessionMaker = get_sync_session_maker()
         logger.error(f"AI generation job {job_id} permanently failed: {type(exc).__name__}: {exc}")
 
-        # Clean up partial S3 objects
+        # Queue any partial S3 objects for batched deletion
         if user_id:
             try:
-                preview_s3_key = f"ai_art/{user_id}/{job_id}_preview.jpg"
                 result_s3_key = f"ai_art/{user_id}/{job_id}.jpg"
-
-                try:
-                    s3_client.delete_file(preview_s3_key)
-                    logger.info(f"Cleaned up partial preview: {preview_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial preview to clean: {preview_s3_key} - {e}")
-
-                try:
-                    s3_client.delete_file(result_s3_key)
-                    logger.info(f"Cleaned up partial result: {result_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial result to clean: {result_s3_key} - {e}")
-
+                schedule_deletion_sync([
+                    f"ai_art/{user_id}/{job_id}_preview.{FORMAT_EXTENSIONS[preview_format]}",
+                    result_s3_key,
+                    *all_rendition_keys(result_s3_key),
+                ])
             except Exception as e:
                 logger.warning(f"Error during S3 cleanup for AI job {job_id}: {e}")
 
@@ -116,6 +112,7 @@ def generate_ai_art(
     processing_job_id: str,
     prompt: str = None,
     style_hint: str = None,
+    preview_format: str = "jpeg",
 ):
     """Generate AI-unique artistic composition from iris patterns.
 
@@ -129,6 +126,7 @@ def generate_ai_art(
         processing_job_id: ProcessingJob ID (processed iris image)
         prompt: Optional user prompt (default: auto-generated from iris)
         style_hint: Optional style hint (cosmic, abstract, watercolor, etc.)
+        preview_format: Preview output format requested by the client (jpeg, webp, avif)
 
     Pipeline steps:
         1. Load processed iris from S3
@@ -162,13 +160,8 @@ def generate_ai_art(
 
             iris_s3_key = processing_job.result_s3_key
 
-        # Download processed iris from S3
-        image_bytes = s3_client.download_file(iris_s3_key)
-        image_array = np.frombuffer(image_bytes, np.uint8)
-        iris_cv = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-
-        if iris_cv is None:
-            raise ValueError("Failed to decode processed iris image")
+        # Load the decoded processed iris through the worker disk cache
+        iris_cv = load_image(iris_s3_key, cv2.IMREAD_COLOR)
 
         # Convert to PIL for diffusers
         iris_rgb = cv2.cvtColor(iris_cv, cv2.COLOR_BGR2RGB)
@@ -272,17 +265,15 @@ def generate_ai_art(
         # Generate preview (256x256)
         preview_pil = generated_art.resize((256, 256), Image.LANCZOS)
 
-        # Save preview to buffer
-        preview_buffer = io.BytesIO()
-        preview_pil.save(preview_buffer, format="JPEG", quality=70)
-        preview_bytes = preview_buffer.getvalue()
+        # Encode preview (quality-targeted, in the client's preferred format)
+        encoded_preview = encode_image(preview_pil, "ai_art_preview", fmt=preview_format)
 
         # Upload preview to S3
-        preview_s3_key = f"ai_art/{user_id}/{job_id}_preview.jpg"
+        preview_s3_key = f"ai_art/{user_id}/{job_id}_preview.{encoded_preview.extension}"
         s3_client.upload_file(
             preview_s3_key,
-            preview_bytes,
-            content_type="image/jpeg",
+            encoded_preview.data,
+            content_type=encoded_preview.content_type,
             server_side_encryption=False,
         )
 
@@ -294,18 +285,18 @@ def generate_ai_art(
             meta={"step": "Refining the details...", "progress": 85, "job_id": job_id},
         )
 
-        # Save full-res result (1024x1024)
-        result_buffer = io.BytesIO()
-        generated_art.save(result_buffer, format="JPEG", quality=90)
-        result_bytes = result_buffer.getvalue()
+        # Save full-res result (1024x1024, quality-targeted JPEG)
+        encoded_result = encode_image(generated_art, "ai_art")
 
         result_s3_key = f"ai_art/{user_id}/{job_id}.jpg"
         s3_client.upload_file(
             result_s3_key,
-            result_bytes,
-            content_type="image/jpeg",
+            encoded_result.data,
+            content_type=encoded_result.content_type,
             server_side_encryption=False,
         )
+        renditions = write_renditions(s3_client, generated_art, result_s3_key)
+        placeholders = compute_placeholders(generated_art)
 
         _update_style_job_sync(
             SessionMaker, job_id, "processing", current_step="Almost done...", progress=90
@@ -327,6 +318,8 @@ def generate_ai_art(
             progress=100,
             preview_s3_key=preview_s3_key,
             result_s3_key=result_s3_key,
+            renditions=renditions,
+            **placeholders,
             result_width=result_width,
             result_height=result_height,
             processing_time_ms=processing_time_ms,
@@ -393,6 +386,8 @@ def generate_ai_art(
 def _update_style_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
     """Update style job status using sync session.
 
+    Completing a job also refreshes the best-artifact columns of its photo.
+
     Args:
         SessionMaker: Sync session maker
         job_id: Job ID
@@ -406,4 +401,7 @@ def _update_style_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
             for key, value in kwargs.items():
                 if hasattr(job, key):
                     setattr(job, key, value)
+            if status == "completed":
+                db.flush()
+                refresh_best_artifacts(db, job.photo_id)
             db.commit()
@@ -1,19 +1,21 @@
-"""Celery tasks for composition artwork creation using side-by-side layouts."""
+"""Celery tasks for composition artwork creation using side-by-side and grid layouts."""
 
 import io
 import logging
 import time
 from typing import List
 
-import cv2
-import numpy as np
 from celery import Task
 
 from app.core.db import get_sync_session_maker
 from app.models.fusion_artwork import FusionArtwork
+from app.services.encoding import encode_image
+from app.services.placeholders import compute_placeholders
+from app.services.renditions import write_renditions
 from app.storage.s3 import s3_client
 from app.workers.celery_app import celery_app
-from app.workers.tasks.fusion_blending import _load_best_source_image
+from app.workers.models.composition_engine import plan_layout, render_composition
+from app.workers.tasks.fusion_blending import load_source_images, preview_size, publish_preview
 
 logger = logging.getLogger(__name__)
 
@@ -58,14 +60,18 @@ class RetryableCompositionTask(Task):
     soft_time_limit=50,  # 50 seconds soft limit
 )
 def create_composition(
-    self, fusion_id: str, artwork_ids: List[str], layout: str = "horizontal"
+    self, fusion_id: str, artwork_ids: List[str], layout: str = "horizontal", gutter: int = 0
 ):
-    """Create composition artwork using side-by-side layouts.
+    """Create composition artwork using side-by-side or grid layouts.
+
+    A preview-resolution render is published as the thumbnail before the
+    full-resolution render.
 
     Args:
         fusion_id: FusionArtwork ID
         artwork_ids: List of photo IDs to compose
-        layout: "horizontal", "vertical", or "grid_2x2"
+        layout: "horizontal", "vertical", or "grid_RxC" (e.g. "grid_2x2")
+        gutter: Pixels of black background between neighbouring cells
     """
     start_time = time.time()
     SessionMaker = get_sync_session_maker()
@@ -85,117 +91,64 @@ def create_composition(
         self.update_state(state="PROGRESS", meta={"step": "loading", "progress": 10, "job_id": fusion_id})
 
         # Load source images (we don't need masks for composition)
-        images = []
+        def report_loading(fraction: float) -> None:
+            progress = 10 + int(fraction * 20)  # 10-30%
+            self.update_state(state="PROGRESS", meta={"step": "loading", "progress": progress, "job_id": fusion_id})
 
+        logger.info(f"Loading {len(artwork_ids)} source images")
         with SessionMaker() as db:
-            for i, artwork_id in enumerate(artwork_ids):
-                logger.info(f"Loading image {i+1}/{len(artwork_ids)}: {artwork_id}")
-                image, _ = _load_best_source_image(artwork_id, db)
-                images.append(image)
-
-                progress = 10 + int((i + 1) / len(artwork_ids) * 20)  # 10-30%
-                self.update_state(state="PROGRESS", meta={"step": "loading", "progress": progress, "job_id": fusion_id})
-
-        self.update_state(state="PROGRESS", meta={"step": "composing", "progress": 40, "job_id": fusion_id})
-
-        # Determine target dimensions based on layout
-        if layout == "horizontal":
-            # Use minimum height to avoid quality loss
-            target_height = min(img.shape[0] for img in images)
-            target_height = min(target_height, MAX_DIMENSION)
-            target_width = None  # Will be proportional
-
-        elif layout == "vertical":
-            # Use minimum width to avoid quality loss
-            target_width = min(img.shape[1] for img in images)
-            target_width = min(target_width, MAX_DIMENSION)
-            target_height = None  # Will be proportional
-
-        else:  # grid_2x2
-            # Use minimum dimensions
-            min_height = min(img.shape[0] for img in images)
-            min_width = min(img.shape[1] for img in images)
-            # Cap at MAX_DIMENSION
-            scale = MAX_DIMENSION / max(min_height, min_width)
-            if scale < 1:
-                target_height = int(min_height * scale)
-                target_width = int(min_width * scale)
-            else:
-                target_height = min_height
-                target_width = min_width
-
-        # Resize images
-        resized_images = []
-
-        for i, img in enumerate(images):
-            if layout == "horizontal":
-                # Resize to target height, maintain aspect ratio
-                aspect = img.shape[1] / img.shape[0]
-                new_width = int(target_height * aspect)
-                img_resized = cv2.resize(img, (new_width, target_height), interpolation=cv2.INTER_LANCZOS4)
-
-            elif layout == "vertical":
-                # Resize to target width, maintain aspect ratio
-                aspect = img.shape[0] / img.shape[1]
-                new_height = int(target_width * aspect)
-                img_resized = cv2.resize(img, (target_width, new_height), interpolation=cv2.INTER_LANCZOS4)
-
-            else:  # grid_2x2
-                # Resize to exact target dimensions
-                img_resized = cv2.resize(img, (target_width, target_height), interpolation=cv2.INTER_LANCZOS4)
-
-            resized_images.append(img_resized)
-
-            progress = 40 + int((i + 1) / len(images) * 20)  # 40-60%
-            self.update_state(state="PROGRESS", meta={"step": "composing", "progress": progress, "job_id": fusion_id})
-
-        # Create composition based on layout
-        if layout == "horizontal":
-            # Concatenate horizontally
-            result = cv2.hconcat(resized_images)
-
-        elif layout == "vertical":
-            # Concatenate vertically
-            result = cv2.vconcat(resized_images)
-
-        else:  # grid_2x2
-            # Pad to 4 images if needed with black images
-            while len(resized_images) < 4:
-                black = np.zeros_like(resized_images[0])
-                resized_images.append(black)
-
-            # Create 2x2 grid
-            top_row = cv2.hconcat([resized_images[0], resized_images[1]])
-            bottom_row = cv2.hconcat([resized_images[2], resized_images[3]])
-            result = cv2.vconcat([top_row, bottom_row])
+            sources = load_source_images(artwork_ids, db, with_masks=False, on_progress=report_loading)
+        images = [image for image, _ in sources]
+
+        # Plan the layout once; both passes resize every source straight into
+        # one preallocated canvas
+        plan = plan_layout(
+            [(img.shape[1], img.shape[0]) for img in images],
+            layout,
+            gutter=gutter,
+            max_dimension=MAX_DIMENSION,
+        )
 
-        logger.info(f"Composition result dimensions: {result.shape[1]}x{result.shape[0]}")
+        # Phase 1: render at preview resolution and publish it as the thumbnail
+        self.update_state(state="PROGRESS", meta={"step": "preview", "progress": 30, "job_id": fusion_id})
+        preview_width, _ = preview_size(plan.width, plan.height)
+        preview, _ = render_composition(images, plan.scaled(preview_width / plan.width), thumb_width=None)
+        thumbnail_s3_key = f"fusion/{fusion_id}_thumb.jpg"
+        publish_preview(SessionMaker, fusion_id, preview, thumbnail_s3_key, "composition_thumb")
+        logger.info(f"Composition {fusion_id} preview published ({preview.shape[1]}x{preview.shape[0]})")
+
+        # Phase 2: full resolution (40-60%)
+        def report_composing(fraction: float) -> None:
+            progress = 40 + int(fraction * 20)
+            self.update_state(
+                state="PROGRESS",
+                meta={"step": "composing", "progress": progress, "job_id": fusion_id, "preview_ready": True},
+            )
+
+        self.update_state(
+            state="PROGRESS",
+            meta={"step": "composing", "progress": 40, "job_id": fusion_id, "preview_ready": True},
+        )
+        result, _ = render_composition(images, plan, thumb_width=None, on_progress=report_composing)
 
-        self.update_state(state="PROGRESS", meta={"step": "saving", "progress": 80, "job_id": fusion_id})
+        logger.info(f"Composition result dimensions: {result.shape[1]}x{result.shape[0]}")
 
-        # Generate thumbnail (256px wide, proportional height)
-        thumb_width = 256
-        aspect = result.shape[0] / result.shape[1]
-        thumb_height = int(thumb_width * aspect)
-        thumbnail = cv2.resize(result, (thumb_width, thumb_height), interpolation=cv2.INTER_AREA)
-        _, thumb_buffer = cv2.imencode(".jpg", thumbnail, [cv2.IMWRITE_JPEG_QUALITY, 70])
-        thumbnail_s3_key = f"fusion/{fusion_id}_thumb.jpg"
-        s3_client.upload_file(
-            thumbnail_s3_key,
-            thumb_buffer.tobytes(),
-            content_type="image/jpeg",
-            server_side_encryption=False,
+        self.update_state(
+            state="PROGRESS",
+            meta={"step": "saving", "progress": 80, "job_id": fusion_id, "preview_ready": True},
         )
 
-        # Save full result as JPEG
-        _, result_buffer = cv2.imencode(".jpg", result, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        # Save full result as quality-targeted JPEG
+        encoded_result = encode_image(result, "composition")
         result_s3_key = f"fusion/{fusion_id}.jpg"
         s3_client.upload_file(
             result_s3_key,
-            result_buffer.tobytes(),
-            content_type="image/jpeg",
+            encoded_result.data,
+            content_type=encoded_result.content_type,
             server_side_encryption=False,
         )
+        renditions = write_renditions(s3_client, result, result_s3_key)
+        placeholders = compute_placeholders(result)
 
         # Calculate processing time
         processing_time_ms = int((time.time() - start_time) * 1000)
@@ -207,6 +160,9 @@ def create_composition(
                 fusion.status = "completed"
                 fusion.result_s3_key = result_s3_key
                 fusion.thumbnail_s3_key = thumbnail_s3_key
+                fusion.renditions = renditions
+                fusion.blurhash = placeholders["blurhash"]
+                fusion.placeholder = placeholders["placeholder"]
                 fusion.processing_time_ms = processing_time_ms
                 from datetime import datetime, timezone
                 fusion.completed_at = datetime.now(timezone.utc)
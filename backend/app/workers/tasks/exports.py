@@ -6,7 +6,7 @@ import uuid
 from app.core.db import async_session_maker
 from app.core.security import redis_client
 from app.services.user import export_user_data
-from app.storage.s3 import s3_client
+from app.storage.async_s3 import async_s3_client
 from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
@@ -33,7 +33,7 @@ def export_user_data_task(user_id: str) -> None:
         async def _run_export():
             async with async_session_maker() as db:
                 try:
-                    download_url = await export_user_data(db, user_uuid, s3_client)
+                    download_url = await export_user_data(db, user_uuid, async_s3_client)
                     return download_url
                 except Exception as e:
                     await db.rollback()
@@ -1,28 +1,38 @@
-"""Celery tasks for fusion artwork creation using Poisson blending."""
+"""Celery tasks for fusion artwork creation using Poisson or multi-band blending."""
 
-import io
 import logging
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 from celery import Task
-from PIL import Image
 
 from app.core.db import get_sync_session_maker
 from app.models.fusion_artwork import FusionArtwork
-from app.models.photo import Photo
-from app.models.processing_job import ProcessingJob
-from app.models.style_job import StyleJob
+from app.services.encoding import encode_image
+from app.services.fusion_sources import SourceArtifact, pick_source_keys, source_keys_statement
+from app.services.placeholders import compute_placeholders
+from app.services.renditions import write_renditions
+from app.storage.image_cache import load_image
 from app.storage.s3 import s3_client
 from app.workers.celery_app import celery_app
+from app.workers.models.alpha_composite import alpha_composite
+from app.workers.models.mask_codec import decode_mask
+from app.workers.models.poisson_blend import poisson_blend
 
 logger = logging.getLogger(__name__)
 
 # Maximum image dimension to prevent memory exhaustion
 MAX_DIMENSION = 2048
 
+# Concurrent S3 downloads when loading fusion/composition sources
+LOAD_WORKERS = 8
+
+# Long edge of the phase-1 preview published before the full-res pass
+PREVIEW_SIZE = 512
+
 
 class RetryableFusionTask(Task):
     """Base task class with retry configuration for fusion tasks."""
@@ -52,100 +62,299 @@ class RetryableFusionTask(Task):
                 db.commit()
 
 
-def alpha_blend_fallback(base: np.ndarray, overlay: np.ndarray, mask: np.ndarray) -> np.ndarray:
-    """Fallback alpha blending when Poisson blending fails.
+def sequential_blend(
+    images: List[np.ndarray],
+    masks: List[np.ndarray],
+    blend_mode: str = "poisson",
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> np.ndarray:
+    """Layer sources pairwise onto the first image.
+
+    Each overlay is Poisson-blended (mixed gradients) over its mask with the
+    ROI-restricted DST solver in poisson_blend, alpha-blending any overlay
+    whose solve fails. For blend_mode "alpha", all overlays are composited
+    in one fixed-point pass by alpha_composite.
 
     Args:
-        base: Base image (numpy array)
-        overlay: Overlay image (numpy array)
-        mask: Binary mask (numpy array)
+        images: Same-size BGR images; the first is the base
+        masks: Matching uint8 masks (already smoothed)
+        blend_mode: "poisson" or "alpha"
+        on_progress: Optional callback receiving the completed fraction (0-1)
 
     Returns:
         Blended image
     """
-    # Normalize mask to 0-1 float
-    if mask.dtype != np.float32:
-        mask = mask.astype(np.float32) / 255.0
-
-    # Expand mask to 3 channels if needed
-    if len(mask.shape) == 2:
-        mask = np.stack([mask] * 3, axis=-1)
-
-    # Ensure all images have same shape
-    if base.shape != overlay.shape:
-        overlay = cv2.resize(overlay, (base.shape[1], base.shape[0]))
-    if mask.shape[:2] != base.shape[:2]:
-        mask = cv2.resize(mask, (base.shape[1], base.shape[0]))
-        if len(mask.shape) == 2:
-            mask = np.stack([mask] * 3, axis=-1)
-
-    # Alpha blend: result = base * (1 - alpha) + overlay * alpha
-    result = (base * (1.0 - mask) + overlay * mask).astype(np.uint8)
+    if blend_mode == "alpha":
+        result = alpha_composite(images, masks)
+        if on_progress:
+            on_progress(1.0)
+        return result
+
+    result = images[0].copy()
+
+    for i in range(1, len(images)):
+        logger.info(f"Blending image {i+1}/{len(images)}")
+
+        overlay = images[i]
+        mask = masks[i]
+
+        try:
+            # Sources are aligned to the canvas, so no re-centering is needed
+            result = poisson_blend(result, overlay, mask, mixed=True)
+            logger.info(f"Poisson blend {i} successful")
+        except (cv2.error, ValueError) as e:
+            # Fallback to alpha blending
+            logger.warning(f"Poisson blend {i} failed: {e}. Falling back to alpha blend.")
+            alpha_composite([result, overlay], [None, mask], out=result)
+
+        if on_progress:
+            on_progress(i / (len(images) - 1))
+
     return result
 
 
-def _load_best_source_image(photo_id: str, db) -> tuple[np.ndarray, np.ndarray]:
-    """Load the best available processed image and mask for a photo.
+def _pyramid_levels(height: int, width: int, min_size: int = 16, max_levels: int = 8) -> int:
+    """Number of pyramid levels so the coarsest level stays >= min_size."""
+    levels = 1
+    while levels < max_levels and min(height, width) >> levels >= min_size:
+        levels += 1
+    return levels
+
+
+def multiband_blend(
+    images: List[np.ndarray],
+    masks: List[np.ndarray],
+    levels: Optional[int] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> np.ndarray:
+    """Blend all sources in one pass with Laplacian pyramids (Burt-Adelson).
+
+    Layer weights reproduce the sequential stacking order of sequential_blend
+    (later sources on top, the first image as base):
+    w_i = m_i * prod_{j>i}(1 - m_j), w_0 = prod_{j>0}(1 - m_j). Each source's
+    Laplacian pyramid is weighted by the Gaussian pyramid of its weight map
+    and accumulated, so low frequencies blend over wide regions and fine
+    detail over narrow seams without solving a Poisson system. Only the
+    accumulator and one source pyramid are alive at a time.
+
+    Args:
+        images: Same-size BGR uint8 images; the first is the base
+        masks: Matching uint8 masks (already smoothed)
+        levels: Pyramid depth (default: down to ~16px at the coarsest level)
+        on_progress: Optional callback receiving the completed fraction (0-1)
+
+    Returns:
+        Blended BGR uint8 image
+    """
+    height, width = images[0].shape[:2]
+    if levels is None:
+        levels = _pyramid_levels(height, width)
+
+    # Stacking weights, top layer first; they sum to 1 everywhere
+    remaining = np.ones((height, width), dtype=np.float32)
+    weights: List[Optional[np.ndarray]] = [None] * len(images)
+    for i in range(len(images) - 1, 0, -1):
+        alpha = masks[i].astype(np.float32) * (1.0 / 255.0)
+        weights[i] = alpha * remaining
+        remaining *= 1.0 - alpha
+    weights[0] = remaining
+
+    accumulator: List[Optional[np.ndarray]] = [None] * levels
+
+    for i, (image, weight) in enumerate(zip(images, weights)):
+        # Gaussian pyramid of the source and of its weight map
+        gaussian = [image.astype(np.float32)]
+        weight_pyramid = [weight]
+        for _ in range(levels - 1):
+            gaussian.append(cv2.pyrDown(gaussian[-1]))
+            weight_pyramid.append(cv2.pyrDown(weight_pyramid[-1]))
+
+        # Laplacian bands weighted in place, coarsest level kept as-is
+        for level in range(levels):
+            if level < levels - 1:
+                fine = gaussian[level]
+                band = fine - cv2.pyrUp(gaussian[level + 1], dstsize=(fine.shape[1], fine.shape[0]))
+            else:
+                band = gaussian[level]
+            band *= weight_pyramid[level][..., np.newaxis]
+
+            if accumulator[level] is None:
+                accumulator[level] = band
+            else:
+                accumulator[level] += band
+
+        del gaussian, weight_pyramid
+        weights[i] = None
+
+        if on_progress:
+            on_progress((i + 1) / len(images))
+
+    # Collapse: upsample from coarsest and add bands
+    result = accumulator[-1]
+    for level in range(levels - 2, -1, -1):
+        band = accumulator[level]
+        result = cv2.pyrUp(result, dstsize=(band.shape[1], band.shape[0]))
+        result += band
 
-    Priority: StyleJob result > ProcessingJob result
-    Returns tuple of (image, mask) as numpy arrays.
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+def resolve_source_keys(photo_ids: List[str], db) -> Dict[str, SourceArtifact]:
+    """Resolve the best image and mask for a set of photos in one query.
+
+    Priority per photo: latest completed StyleJob result (with its
+    ProcessingJob's mask) > latest completed ProcessingJob result and mask.
 
     Args:
-        photo_id: Photo ID
+        photo_ids: Photo IDs
         db: Sync database session
 
     Returns:
-        Tuple of (image array, mask array)
+        Mapping of photo ID to SourceArtifact (image key, mask key, parametric mask)
 
     Raises:
-        ValueError: If no processed image found
+        ValueError: If a photo has no processed image with a mask
     """
-    # Try StyleJob first (highest quality)
-    style_job = (
-        db.query(StyleJob)
-        .filter(StyleJob.photo_id == photo_id, StyleJob.status == "completed")
-        .order_by(StyleJob.created_at.desc())
-        .first()
-    )
+    rows = db.execute(source_keys_statement(photo_ids)).all()
+    return pick_source_keys(rows, photo_ids)
 
-    if style_job and style_job.result_s3_key:
-        image_bytes = s3_client.download_file(style_job.result_s3_key)
-        image_array = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
 
-        # Get mask from processing job
-        processing_job = (
-            db.query(ProcessingJob)
-            .filter(ProcessingJob.id == style_job.processing_job_id)
-            .first()
-        )
-        if processing_job and processing_job.mask_s3_key:
-            mask_bytes = s3_client.download_file(processing_job.mask_s3_key)
-            mask_array = np.frombuffer(mask_bytes, np.uint8)
-            mask = cv2.imdecode(mask_array, cv2.IMREAD_GRAYSCALE)
-            return image, mask
-
-    # Try ProcessingJob
-    processing_job = (
-        db.query(ProcessingJob)
-        .filter(ProcessingJob.photo_id == photo_id, ProcessingJob.status == "completed")
-        .order_by(ProcessingJob.created_at.desc())
-        .first()
-    )
+def _download_image(key: str, flags: int) -> np.ndarray:
+    """Load one decoded image through the worker disk cache (read-only)."""
+    return load_image(key, flags)
+
+
+def load_source_images(
+    photo_ids: List[str],
+    db,
+    with_masks: bool = True,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> List[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Load the best processed image (and mask) for each photo concurrently.
+
+    Keys are resolved with a single query (resolve_source_keys), then all
+    downloads and decodes run on a bounded thread pool (boto3 and
+    cv2.imdecode release the GIL), so load time is close to one download.
+    Masks with a parametric encoding are rasterized at the image size
+    instead of downloading the PNG.
+
+    Args:
+        photo_ids: Photo IDs, in output order
+        db: Sync database session
+        with_masks: Whether to download masks (composition doesn't need them)
+        on_progress: Optional callback receiving the completed fraction (0-1)
+
+    Returns:
+        List of (image, mask) tuples in photo_ids order; mask is None when
+        with_masks is False
 
-    if processing_job and processing_job.result_s3_key:
-        image_bytes = s3_client.download_file(processing_job.result_s3_key)
-        image_array = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+    Raises:
+        ValueError: If a photo has no processed image or a download can't be decoded
+    """
+    keys = resolve_source_keys(photo_ids, db)
+
+    # One download per image/mask, each tagged with its output slot
+    downloads = []
+    for index, photo_id in enumerate(photo_ids):
+        source = keys[str(photo_id)]
+        downloads.append((index, 0, source.image_key, cv2.IMREAD_COLOR))
+        if with_masks and not source.mask_vector:
+            downloads.append((index, 1, source.mask_key, cv2.IMREAD_GRAYSCALE))
+
+    loaded: List[List[Optional[np.ndarray]]] = [[None, None] for _ in photo_ids]
+    with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(downloads))) as executor:
+        futures = {
+            executor.submit(_download_image, key, flags): (index, slot)
+            for index, slot, key, flags in downloads
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            index, slot = futures[future]
+            loaded[index][slot] = future.result()
+            if on_progress:
+                on_progress(done / len(downloads))
+
+    if with_masks:
+        for index, photo_id in enumerate(photo_ids):
+            mask_vector = keys[str(photo_id)].mask_vector
+            if mask_vector:
+                height, width = loaded[index][0].shape[:2]
+                loaded[index][1] = decode_mask(mask_vector, width, height)
+
+    return [(image, mask) for image, mask in loaded]
+
+
+def preview_size(width: int, height: int) -> Tuple[int, int]:
+    """Size of the phase-1 preview: the target scaled down to PREVIEW_SIZE."""
+    scale = min(PREVIEW_SIZE / max(width, height), 1.0)
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+def blend_sources(
+    images: List[np.ndarray],
+    masks: List[np.ndarray],
+    size: Tuple[int, int],
+    blend_mode: str,
+    interpolation: int = cv2.INTER_LANCZOS4,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> np.ndarray:
+    """Resize sources and masks to size, smooth the masks and blend.
+
+    Args:
+        images: BGR sources; the first is the base
+        masks: Matching uint8 masks
+        size: Output (width, height)
+        blend_mode: "poisson", "alpha", or "multiband"
+        interpolation: Image resize interpolation (masks use INTER_LINEAR)
+        on_progress: Optional callback receiving the completed fraction (0-1)
+
+    Returns:
+        Blended image (height, width, 3)
+    """
+    width, height = size
+    resized_images = []
+    smoothed_masks = []
+
+    for img, mask in zip(images, masks):
+        if img.shape[:2] != (height, width):
+            img = cv2.resize(img, (width, height), interpolation=interpolation)
+        if mask.shape[:2] != (height, width):
+            mask = cv2.resize(mask, (width, height), interpolation=cv2.INTER_LINEAR)
+
+        resized_images.append(img)
+        # Apply Gaussian blur to mask edges for smoother blending
+        smoothed_masks.append(cv2.GaussianBlur(mask, (5, 5), 0))
 
-        if processing_job.mask_s3_key:
-            mask_bytes = s3_client.download_file(processing_job.mask_s3_key)
-            mask_array = np.frombuffer(mask_bytes, np.uint8)
-            mask = cv2.imdecode(mask_array, cv2.IMREAD_GRAYSCALE)
-            return image, mask
+    if blend_mode == "multiband":
+        return multiband_blend(resized_images, smoothed_masks, on_progress=on_progress)
+    return sequential_blend(resized_images, smoothed_masks, blend_mode, on_progress=on_progress)
 
-    # No processed image found
-    raise ValueError(f"No processed image found for photo {photo_id}")
+
+def publish_preview(SessionMaker, fusion_id: str, preview: np.ndarray, thumbnail_s3_key: str, artifact: str) -> None:
+    """Upload a phase-1 preview as the artwork thumbnail and record it right away.
+
+    The artwork stays "processing"; status endpoints serve the thumbnail
+    as soon as thumbnail_s3_key is set.
+
+    Args:
+        SessionMaker: Sync session factory
+        fusion_id: FusionArtwork ID
+        preview: Preview image (BGR)
+        thumbnail_s3_key: Destination key
+        artifact: Encoding profile ("fusion_thumb" or "composition_thumb")
+    """
+    encoded = encode_image(preview, artifact)
+    s3_client.upload_file(
+        thumbnail_s3_key,
+        encoded.data,
+        content_type=encoded.content_type,
+        server_side_encryption=False,
+    )
+
+    with SessionMaker() as db:
+        fusion = db.query(FusionArtwork).filter(FusionArtwork.id == fusion_id).first()
+        if fusion:
+            fusion.thumbnail_s3_key = thumbnail_s3_key
+            db.commit()
 
 
 @celery_app.task(
@@ -159,12 +368,15 @@ def _load_best_source_image(photo_id: str, db) -> tuple[np.ndarray, np.ndarray]:
 def create_fusion_artwork(
     self, fusion_id: str, artwork_ids: List[str], blend_mode: str = "poisson"
 ):
-    """Create fusion artwork using Poisson blending or alpha blending.
+    """Create fusion artwork using Poisson, alpha, or multi-band blending.
+
+    Runs in two phases: a PREVIEW_SIZE blend that is uploaded and published
+    as the thumbnail immediately, then the full-resolution blend.
 
     Args:
         fusion_id: FusionArtwork ID
         artwork_ids: List of photo IDs to blend
-        blend_mode: "poisson" or "alpha"
+        blend_mode: "poisson", "alpha", or "multiband" (single-pass Laplacian pyramid)
     """
     start_time = time.time()
     SessionMaker = get_sync_session_maker()
@@ -184,18 +396,15 @@ def create_fusion_artwork(
         self.update_state(state="PROGRESS", meta={"step": "loading", "progress": 10, "job_id": fusion_id})
 
         # Load source images and masks
-        images = []
-        masks = []
+        def report_loading(fraction: float) -> None:
+            progress = 10 + int(fraction * 10)  # 10-20%
+            self.update_state(state="PROGRESS", meta={"step": "loading", "progress": progress, "job_id": fusion_id})
 
+        logger.info(f"Loading {len(artwork_ids)} source images")
         with SessionMaker() as db:
-            for i, artwork_id in enumerate(artwork_ids):
-                logger.info(f"Loading image {i+1}/{len(artwork_ids)}: {artwork_id}")
-                image, mask = _load_best_source_image(artwork_id, db)
-                images.append(image)
-                masks.append(mask)
-
-                progress = 10 + int((i + 1) / len(artwork_ids) * 10)  # 10-20%
-                self.update_state(state="PROGRESS", meta={"step": "loading", "progress": progress, "job_id": fusion_id})
+            sources = load_source_images(artwork_ids, db, on_progress=report_loading)
+        images = [image for image, _ in sources]
+        masks = [mask for _, mask in sources]
 
         # Determine target dimensions (use largest, capped at MAX_DIMENSION)
         max_height = max(img.shape[0] for img in images)
@@ -212,91 +421,56 @@ def create_fusion_artwork(
 
         logger.info(f"Target dimensions: {target_width}x{target_height}")
 
-        # Resize all images and masks to target dimensions
-        resized_images = []
-        resized_masks = []
-
-        for i, (img, mask) in enumerate(zip(images, masks)):
-            if img.shape[:2] != (target_height, target_width):
-                img_resized = cv2.resize(img, (target_width, target_height), interpolation=cv2.INTER_LANCZOS4)
-            else:
-                img_resized = img
-
-            if mask.shape[:2] != (target_height, target_width):
-                mask_resized = cv2.resize(mask, (target_width, target_height), interpolation=cv2.INTER_LINEAR)
-            else:
-                mask_resized = mask
-
-            resized_images.append(img_resized)
-            resized_masks.append(mask_resized)
+        # Phase 1: blend at preview resolution and publish it as the thumbnail
+        # so clients can show something long before the full-res pass is done
+        preview_width, preview_height = preview_size(target_width, target_height)
+        self.update_state(state="PROGRESS", meta={"step": "preview", "progress": 20, "job_id": fusion_id})
 
-        self.update_state(state="PROGRESS", meta={"step": "blending", "progress": 30, "job_id": fusion_id})
-
-        # Apply Gaussian blur to mask edges for smoother blending
-        smoothed_masks = []
-        for mask in resized_masks:
-            # Apply Gaussian blur (kernel size 5x5)
-            smoothed = cv2.GaussianBlur(mask, (5, 5), 0)
-            smoothed_masks.append(smoothed)
-
-        # Blend images
-        result = resized_images[0].copy()
-
-        for i in range(1, len(resized_images)):
-            logger.info(f"Blending image {i+1}/{len(resized_images)}")
-
-            overlay = resized_images[i]
-            mask = smoothed_masks[i]
-
-            # Calculate mask center for Poisson blending
-            mask_moments = cv2.moments(mask)
-            if mask_moments["m00"] > 0:
-                center_x = int(mask_moments["m10"] / mask_moments["m00"])
-                center_y = int(mask_moments["m01"] / mask_moments["m00"])
-                center = (center_x, center_y)
-            else:
-                center = (target_width // 2, target_height // 2)
-
-            if blend_mode == "poisson":
-                try:
-                    # Try Poisson blending
-                    result = cv2.seamlessClone(
-                        overlay, result, mask, center, cv2.MIXED_CLONE
-                    )
-                    logger.info(f"Poisson blend {i} successful")
-                except cv2.error as e:
-                    # Fallback to alpha blending
-                    logger.warning(f"Poisson blend {i} failed: {e}. Falling back to alpha blend.")
-                    result = alpha_blend_fallback(result, overlay, mask)
-            else:
-                # Direct alpha blending
-                result = alpha_blend_fallback(result, overlay, mask)
+        preview = blend_sources(
+            images, masks, (preview_width, preview_height), blend_mode, interpolation=cv2.INTER_AREA
+        )
+        thumbnail_s3_key = f"fusion/{fusion_id}_thumb.jpg"
+        publish_preview(SessionMaker, fusion_id, preview, thumbnail_s3_key, "fusion_thumb")
+        logger.info(f"Fusion {fusion_id} preview published ({preview_width}x{preview_height})")
 
-            progress = 30 + int(i / (len(resized_images) - 1) * 50)  # 30-80%
-            self.update_state(state="PROGRESS", meta={"step": "blending", "progress": progress, "job_id": fusion_id})
+        self.update_state(
+            state="PROGRESS",
+            meta={"step": "blending", "progress": 30, "job_id": fusion_id, "preview_ready": True},
+        )
 
-        self.update_state(state="PROGRESS", meta={"step": "saving", "progress": 90, "job_id": fusion_id})
+        # Phase 2: full resolution (30-85%)
+        def report_blend_progress(fraction: float):
+            progress = 30 + int(fraction * 55)
+            self.update_state(
+                state="PROGRESS",
+                meta={"step": "blending", "progress": progress, "job_id": fusion_id, "preview_ready": True},
+            )
+
+        result = blend_sources(
+            images,
+            masks,
+            (target_width, target_height),
+            blend_mode,
+            interpolation=cv2.INTER_LANCZOS4,
+            on_progress=report_blend_progress,
+        )
 
-        # Generate thumbnail (256x256)
-        thumbnail = cv2.resize(result, (256, 256), interpolation=cv2.INTER_AREA)
-        _, thumb_buffer = cv2.imencode(".jpg", thumbnail, [cv2.IMWRITE_JPEG_QUALITY, 70])
-        thumbnail_s3_key = f"fusion/{fusion_id}_thumb.jpg"
-        s3_client.upload_file(
-            thumbnail_s3_key,
-            thumb_buffer.tobytes(),
-            content_type="image/jpeg",
-            server_side_encryption=False,
+        self.update_state(
+            state="PROGRESS",
+            meta={"step": "saving", "progress": 90, "job_id": fusion_id, "preview_ready": True},
         )
 
-        # Save full result as JPEG
-        _, result_buffer = cv2.imencode(".jpg", result, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        # Save full result as quality-targeted JPEG
+        encoded_result = encode_image(result, "fusion")
         result_s3_key = f"fusion/{fusion_id}.jpg"
         s3_client.upload_file(
             result_s3_key,
-            result_buffer.tobytes(),
-            content_type="image/jpeg",
+            encoded_result.data,
+            content_type=encoded_result.content_type,
             server_side_encryption=False,
         )
+        renditions = write_renditions(s3_client, result, result_s3_key)
+        placeholders = compute_placeholders(result)
 
         # Calculate processing time
         processing_time_ms = int((time.time() - start_time) * 1000)
@@ -308,6 +482,9 @@ def create_fusion_artwork(
                 fusion.status = "completed"
                 fusion.result_s3_key = result_s3_key
                 fusion.thumbnail_s3_key = thumbnail_s3_key
+                fusion.renditions = renditions
+                fusion.blurhash = placeholders["blurhash"]
+                fusion.placeholder = placeholders["placeholder"]
                 fusion.processing_time_ms = processing_time_ms
                 from datetime import datetime, timezone
                 fusion.completed_at = datetime.now(timezone.utc)
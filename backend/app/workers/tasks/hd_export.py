@@ -1,7 +1,8 @@
 """Celery tasks for HD export with watermark."""
 
-import io
+import hashlib
 import logging
+import tempfile
 import time
 
 import cv2
@@ -10,14 +11,212 @@ from celery import Task
 from PIL import Image
 
 from app.core.db import get_sync_session_maker
-from app.models.export_job import ExportJob
-from app.services.watermark import apply_watermark
+from app.models.export_job import EXPORT_SIZE_PIXELS, ExportJob, ExportSizePreset
+from app.services.encoding import ENCODING_PROFILES, encode_image
+from app.services.renditions import (
+    RENDITION_FORMATS,
+    RENDITION_SIZES,
+    all_rendition_keys,
+    rendition_key,
+    write_renditions,
+)
+from app.services.watermark import apply_watermark, blend_watermark, get_watermark_mask
+from app.storage.deletion_queue import schedule_deletion_sync
+from app.storage.image_cache import load_image
 from app.storage.s3 import s3_client
 from app.workers.celery_app import celery_app
 from app.workers.models.model_cache import ModelCache
 
 logger = logging.getLogger(__name__)
 
+# HD export edge length in pixels (larger presets use the tiled pipeline)
+HD_SIZE = 2048
+
+# Output rows per band in the tiled print-size pipeline
+TILE_ROWS = 256
+
+
+def _upscaler_version(enhancement_model) -> str:
+    """Identify the upscaler so masters are regenerated when the model changes."""
+    # Real-ESRGAN inference is not wired up yet; both paths currently use Lanczos
+    return "lanczos-v1"
+
+
+def _master_s3_key(user_id: str, source_s3_key: str, upscaler_version: str, size: int = HD_SIZE) -> str:
+    """Build the S3 key of the clean HD master for a source image.
+
+    Args:
+        user_id: User ID (masters live under the user's exports prefix)
+        source_s3_key: S3 key of the source image
+        upscaler_version: Upscaler identifier from _upscaler_version
+        size: Output edge length in pixels
+
+    Returns:
+        Deterministic master S3 key
+    """
+    source_hash = hashlib.sha256(source_s3_key.encode("utf-8")).hexdigest()[:16]
+    return f"exports/{user_id}/masters/{source_hash}_{size}_{upscaler_version}.jpg"
+
+
+def _existing_master_renditions(master_s3_key: str, size: int) -> dict | None:
+    """Manifest of the renditions written with an existing master, if any.
+
+    Masters are shared across exports, so a reused master's renditions were
+    written by whichever job created it (masters from before renditions have
+    none). Probes the largest rendition in each format.
+    """
+    sizes = [s for s in RENDITION_SIZES if s < size]
+    formats = [
+        fmt for fmt in RENDITION_FORMATS
+        if s3_client.get_file_size(rendition_key(master_s3_key, sizes[-1], fmt)) is not None
+    ]
+    if not formats:
+        return None
+    return {"sizes": sizes, "formats": formats, "full": size}
+
+
+def _upscale_tiled(source_rgb: np.ndarray, canvas: np.ndarray, tile_rows: int = TILE_ROWS):
+    """Lanczos-upscale source into canvas one horizontal band at a time.
+
+    Each output pixel is sampled independently (cv2.remap), so bands have no
+    seams and only one band of intermediates is alive at a time.
+
+    Args:
+        source_rgb: Source image (h, w, 3) uint8
+        canvas: Output array (H, W, >=3) uint8, typically a disk-backed memmap
+        tile_rows: Output rows per band
+
+    Yields:
+        Number of output rows completed after each band
+    """
+    src_h, src_w = source_rgb.shape[:2]
+    out_h, out_w = canvas.shape[:2]
+
+    map_x = (np.arange(out_w, dtype=np.float32) + 0.5) * np.float32(src_w / out_w) - 0.5
+
+    for y0 in range(0, out_h, tile_rows):
+        y1 = min(y0 + tile_rows, out_h)
+        rows = (np.arange(y0, y1, dtype=np.float32) + 0.5) * np.float32(src_h / out_h) - 0.5
+        band_x = np.ascontiguousarray(np.broadcast_to(map_x, (y1 - y0, out_w)))
+        band_y = np.ascontiguousarray(np.broadcast_to(rows[:, np.newaxis], (y1 - y0, out_w)))
+        canvas[y0:y1, :, :3] = cv2.remap(
+            source_rgb, band_x, band_y, cv2.INTER_LANCZOS4, borderMode=cv2.BORDER_REPLICATE
+        )
+        yield y1
+
+
+def _stream_jpeg(canvas: np.ndarray, s3_key: str) -> int:
+    """Encode an RGBX canvas as JPEG straight into an S3 multipart upload.
+
+    The canvas is mapped into PIL without a copy and libjpeg encodes it row
+    by row, so only one upload part is buffered in memory.
+
+    Args:
+        canvas: Image array (H, W, 4) uint8 with RGBX layout
+        s3_key: Destination S3 key
+
+    Returns:
+        Uploaded object size in bytes
+    """
+    height, width = canvas.shape[:2]
+    image = Image.frombuffer("RGBX", (width, height), canvas, "raw", "RGBX", 0, 1)
+
+    with s3_client.open_multipart_writer(s3_key, content_type="image/jpeg") as writer:
+        # Baseline (not progressive/optimized): those modes make libjpeg buffer the whole image
+        image.save(writer, format="JPEG", quality=ENCODING_PROFILES["export"].max_quality)
+
+    return writer.bytes_written
+
+
+def _export_tiled(
+    task,
+    SessionMaker,
+    job_id: str,
+    user_id: str,
+    source_s3_key: str,
+    is_paid: bool,
+    output_size: int,
+    master_s3_key: str,
+    master_size: int | None,
+) -> tuple[str | None, int, dict | None, dict | None]:
+    """Print-size export: tiled upscale and streamed encode/upload.
+
+    The upscaled image lives in a disk-backed memmap; upscaling, watermarking
+    and JPEG encoding all walk it in bands, so worker memory stays bounded by
+    the tile size plus one multipart upload part.
+
+    As in the 2048 path, only paid exports reuse an existing master (it is
+    the result as-is). Free exports re-upscale from the source even when the
+    master exists and watermark the clean pixels; decoding the stored master
+    would also add a JPEG generation and need the whole decoded image
+    (~200 MB at 8192px) in memory, which is what this pipeline avoids.
+
+    Args:
+        task: Bound Celery task (for progress reporting)
+        SessionMaker: Sync session maker
+        job_id: ExportJob ID
+        user_id: User ID
+        source_s3_key: S3 key of source image
+        is_paid: Whether user paid for watermark-free export
+        output_size: Output edge length in pixels
+        master_s3_key: S3 key of the clean master for this size
+        master_size: Existing master size in bytes, or None if missing
+
+    Returns:
+        Tuple of (watermarked S3 key or None if paid, result file size in bytes,
+        master renditions manifest or None if the master was reused,
+        watermarked renditions manifest or None if paid)
+    """
+
+    def report(step: str, progress: int):
+        _update_export_job_sync(SessionMaker, job_id, "processing", current_step=step, progress=progress)
+        task.update_state(state="PROGRESS", meta={"step": step, "progress": progress, "job_id": job_id})
+
+    if is_paid and master_size is not None:
+        logger.info(f"Job {job_id}: Reusing {output_size}px master {master_s3_key}")
+        return None, master_size, None, None
+
+    source_cv = load_image(source_s3_key, cv2.IMREAD_COLOR)
+    source_rgb = cv2.cvtColor(source_cv, cv2.COLOR_BGR2RGB)
+    del source_cv
+
+    with tempfile.TemporaryFile(prefix="export-", suffix=".rgbx") as canvas_file:
+        canvas = np.memmap(canvas_file, dtype=np.uint8, mode="w+", shape=(output_size, output_size, 4))
+        canvas[..., 3] = 255
+
+        # Step 2: Tiled upscale (10-60%)
+        logger.info(f"Job {job_id}: Tiled upscale to {output_size}px")
+        for rows_done in _upscale_tiled(source_rgb, canvas):
+            if rows_done == output_size or rows_done % (TILE_ROWS * 8) == 0:
+                report("Upscaling to print size...", 10 + int(50 * rows_done / output_size))
+
+        # Step 3: Stream clean master (60-75%)
+        file_size_bytes = master_size
+        master_renditions = None
+        if master_size is None:
+            report("Saving your masterpiece...", 65)
+            file_size_bytes = _stream_jpeg(canvas, master_s3_key)
+            master_renditions = write_renditions(s3_client, canvas, master_s3_key, bgr=False)
+
+        if is_paid:
+            return None, file_size_bytes, master_renditions, None
+
+        # Step 4: Watermark in bands and stream (75-100%)
+        report("Applying finishing touches...", 75)
+        mask = get_watermark_mask(output_size, output_size)
+        for y0 in range(0, output_size, TILE_ROWS):
+            band = canvas[y0 : y0 + TILE_ROWS, :, :3]
+            blend_watermark(band, mask[y0 : y0 + TILE_ROWS], out=band)
+
+        report("Saving your masterpiece...", 90)
+        watermarked_s3_key = f"exports/{user_id}/{job_id}.jpg"
+        file_size_bytes = _stream_jpeg(canvas, watermarked_s3_key)
+        watermarked_renditions = write_renditions(s3_client, canvas, watermarked_s3_key, bgr=False)
+
+        del canvas
+
+    return watermarked_s3_key, file_size_bytes, master_renditions, watermarked_renditions
+
 
 class RetryableExportTask(Task):
     """Base task class with retry configuration for HD export tasks."""
@@ -47,17 +246,11 @@ class RetryableExportTask(Task):
         SessionMaker = get_sync_session_maker()
         logger.error(f"Export job {job_id} permanently failed: {type(exc).__name__}: {exc}")
 
-        # Clean up partial S3 objects
+        # Queue any partial S3 object for batched deletion
         if user_id:
             try:
-                result_s3_key = f"exports/{user_id}/{job_id}.jpg"
-
-                try:
-                    s3_client.delete_file(result_s3_key)
-                    logger.info(f"Cleaned up partial result: {result_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial result to clean: {result_s3_key} - {e}")
-
+                watermarked_s3_key = f"exports/{user_id}/{job_id}.jpg"
+                schedule_deletion_sync([watermarked_s3_key, *all_rendition_keys(watermarked_s3_key)])
             except Exception as e:
                 logger.warning(f"Error during S3 cleanup for export job {job_id}: {e}")
 
@@ -107,22 +300,31 @@ def export_hd_image(
     user_id: str,
     source_s3_key: str,
     is_paid: bool,
+    size_preset: str = "hd",
 ):
     """Export image in HD resolution with watermark for free users.
 
     Upscales source image to 2048x2048 using Real-ESRGAN (or OpenCV Lanczos
-    in dev mode), then applies watermark based on payment status.
+    in dev mode) into a clean HD master stored once per (source, upscaler
+    version), then applies watermark based on payment status. Paid exports
+    point directly at the master, and skip upscaling when it already exists.
+    Free exports always upscale and watermark the in-memory pixels, so the
+    watermarked variant never carries a second generation of JPEG loss.
+
+    Print presets (4096/8192) go through a tiled streaming pipeline instead,
+    so peak memory is bounded by the tile size rather than the output size.
 
     Args:
         job_id: ExportJob ID
         user_id: User ID
         source_s3_key: S3 key of source image (1024x1024)
         is_paid: Whether user paid for watermark-free export
+        size_preset: Output size preset (hd, print, print_xl)
 
     Pipeline steps:
-        1. Load source image from S3
-        2. Upscale to HD (2048x2048) with Real-ESRGAN or Lanczos
-        3. Apply watermark based on is_paid flag
+        1. Look up the clean HD master for this source
+        2. If missing, upscale to HD (2048x2048) with Real-ESRGAN or Lanczos and store it
+        3. Apply watermark to the master if not paid
         4. Save to S3 and update ExportJob
     """
     start_time = time.time()
@@ -131,7 +333,7 @@ def export_hd_image(
     logger.info(f"Starting HD export for job {job_id} (paid: {is_paid})")
 
     try:
-        # Step 1: Load source image (0-10%)
+        # Step 1: Locate HD master (0-10%)
         _update_export_job_sync(
             SessionMaker, job_id, "processing", current_step="Preparing for HD export...", progress=5
         )
@@ -140,36 +342,6 @@ def export_hd_image(
             meta={"step": "Preparing for HD export...", "progress": 5, "job_id": job_id},
         )
 
-        # Download source image from S3
-        image_bytes = s3_client.download_file(source_s3_key)
-        image_array = np.frombuffer(image_bytes, np.uint8)
-        source_cv = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-
-        if source_cv is None:
-            raise ValueError("Failed to decode source image")
-
-        # Convert to PIL for processing
-        source_rgb = cv2.cvtColor(source_cv, cv2.COLOR_BGR2RGB)
-        source_pil = Image.fromarray(source_rgb)
-
-        _update_export_job_sync(
-            SessionMaker, job_id, "processing", current_step="Preparing for HD export...", progress=10
-        )
-        self.update_state(
-            state="PROGRESS",
-            meta={"step": "Preparing for HD export...", "progress": 10, "job_id": job_id},
-        )
-
-        # Step 2: Upscale to HD (10-70%)
-        logger.info(f"Job {job_id}: Upscaling to HD")
-        _update_export_job_sync(
-            SessionMaker, job_id, "processing", current_step="Upscaling to HD...", progress=20
-        )
-        self.update_state(
-            state="PROGRESS",
-            meta={"step": "Upscaling to HD...", "progress": 20, "job_id": job_id},
-        )
-
         # Free GPU memory before loading Real-ESRGAN
         ModelCache.clear_sd_generator()
         ModelCache.clear_style_models()
@@ -177,83 +349,156 @@ def export_hd_image(
         # Try Real-ESRGAN, fall back to OpenCV Lanczos
         enhancement_model = ModelCache.get_enhancement_model()
 
-        if enhancement_model is not None:
-            # Real-ESRGAN upscaling
-            logger.info("Using Real-ESRGAN for HD upscaling")
-            # Real-ESRGAN would go here when model is available
-            # For now, falling back to Lanczos
-            hd_pil = source_pil.resize((2048, 2048), Image.LANCZOS)
-        else:
-            # OpenCV Lanczos fallback (dev mode)
-            logger.info("Real-ESRGAN not available, using Lanczos upscaling (dev mode)")
-            hd_pil = source_pil.resize((2048, 2048), Image.LANCZOS)
-
-        _update_export_job_sync(
-            SessionMaker, job_id, "processing", current_step="Upscaling to HD...", progress=70
-        )
-        self.update_state(
-            state="PROGRESS",
-            meta={"step": "Upscaling to HD...", "progress": 70, "job_id": job_id},
+        # Clean master is shared by every export of this source with this upscaler
+        output_size = EXPORT_SIZE_PIXELS[ExportSizePreset(size_preset)]
+        master_s3_key = _master_s3_key(
+            user_id, source_s3_key, _upscaler_version(enhancement_model), output_size
         )
+        master_size = s3_client.get_file_size(master_s3_key)
 
-        # Step 3: Apply watermark (70-85%)
-        logger.info(f"Job {job_id}: Applying watermark (paid: {is_paid})")
         _update_export_job_sync(
-            SessionMaker, job_id, "processing", current_step="Applying finishing touches...", progress=75
+            SessionMaker,
+            job_id,
+            "processing",
+            current_step="Preparing for HD export...",
+            progress=10,
+            master_s3_key=master_s3_key,
         )
         self.update_state(
             state="PROGRESS",
-            meta={"step": "Applying finishing touches...", "progress": 75, "job_id": job_id},
+            meta={"step": "Preparing for HD export...", "progress": 10, "job_id": job_id},
         )
 
-        # Apply watermark based on payment status
-        watermarked_pil = apply_watermark(hd_pil, is_paid)
+        if output_size > HD_SIZE:
+            watermarked_s3_key, file_size_bytes, master_renditions, watermarked_renditions = _export_tiled(
+                self,
+                SessionMaker,
+                job_id,
+                user_id,
+                source_s3_key,
+                is_paid,
+                output_size,
+                master_s3_key,
+                master_size,
+            )
+            result_width, result_height = output_size, output_size
 
-        _update_export_job_sync(
-            SessionMaker, job_id, "processing", current_step="Applying finishing touches...", progress=85
-        )
-        self.update_state(
-            state="PROGRESS",
-            meta={"step": "Applying finishing touches...", "progress": 85, "job_id": job_id},
-        )
+        else:
+            # Step 2: Upscale to HD (10-70%), skipped for paid exports when the
+            # master already exists. Free exports always upscale: the watermark
+            # goes onto clean pixels, not a decoded master JPEG (a second
+            # generation of JPEG loss).
+            hd_pil = None
+            master_renditions = None
+            if is_paid and master_size is not None:
+                logger.info(f"Job {job_id}: Reusing HD master {master_s3_key}")
+            else:
+                logger.info(f"Job {job_id}: Upscaling to HD")
+                _update_export_job_sync(
+                    SessionMaker, job_id, "processing", current_step="Upscaling to HD...", progress=20
+                )
+                self.update_state(
+                    state="PROGRESS",
+                    meta={"step": "Upscaling to HD...", "progress": 20, "job_id": job_id},
+                )
+
+                # Load the decoded source through the worker disk cache
+                source_cv = load_image(source_s3_key, cv2.IMREAD_COLOR)
+
+                # Convert to PIL for processing
+                source_rgb = cv2.cvtColor(source_cv, cv2.COLOR_BGR2RGB)
+                source_pil = Image.fromarray(source_rgb)
+
+                if enhancement_model is not None:
+                    # Real-ESRGAN upscaling
+                    logger.info("Using Real-ESRGAN for HD upscaling")
+                    # Real-ESRGAN would go here when model is available
+                    # For now, falling back to Lanczos
+                    hd_pil = source_pil.resize((HD_SIZE, HD_SIZE), Image.LANCZOS)
+                else:
+                    # OpenCV Lanczos fallback (dev mode)
+                    logger.info("Real-ESRGAN not available, using Lanczos upscaling (dev mode)")
+                    hd_pil = source_pil.resize((HD_SIZE, HD_SIZE), Image.LANCZOS)
+
+                # Store the clean master once; later paid exports and upgrades reuse it
+                if master_size is None:
+                    master_bytes = encode_image(hd_pil, "export").data
+                    s3_client.upload_file(
+                        master_s3_key,
+                        master_bytes,
+                        content_type="image/jpeg",
+                        server_side_encryption=False,
+                    )
+                    master_renditions = write_renditions(s3_client, hd_pil, master_s3_key)
+                    master_size = len(master_bytes)
 
-        # Step 4: Save to S3 (85-100%)
-        logger.info(f"Job {job_id}: Saving HD export")
-        _update_export_job_sync(
-            SessionMaker, job_id, "processing", current_step="Saving your masterpiece...", progress=90
-        )
-        self.update_state(
-            state="PROGRESS",
-            meta={"step": "Saving your masterpiece...", "progress": 90, "job_id": job_id},
-        )
+            _update_export_job_sync(
+                SessionMaker, job_id, "processing", current_step="Upscaling to HD...", progress=70
+            )
+            self.update_state(
+                state="PROGRESS",
+                meta={"step": "Upscaling to HD...", "progress": 70, "job_id": job_id},
+            )
 
-        # Save to buffer with high quality
-        result_buffer = io.BytesIO()
-        watermarked_pil.save(result_buffer, format="JPEG", quality=95)
-        result_bytes = result_buffer.getvalue()
-
-        # Upload to S3
-        result_s3_key = f"exports/{user_id}/{job_id}.jpg"
-        s3_client.upload_file(
-            result_s3_key,
-            result_bytes,
-            content_type="image/jpeg",
-            server_side_encryption=False,
-        )
+            # Step 3: Derive watermarked variant from the upscaled pixels (70-90%)
+            watermarked_s3_key = None
+            watermarked_renditions = None
+            if is_paid:
+                # Paid exports are the master itself
+                result_width, result_height = HD_SIZE, HD_SIZE
+                file_size_bytes = master_size
+            else:
+                logger.info(f"Job {job_id}: Applying watermark (paid: {is_paid})")
+                _update_export_job_sync(
+                    SessionMaker, job_id, "processing", current_step="Applying finishing touches...", progress=75
+                )
+                self.update_state(
+                    state="PROGRESS",
+                    meta={"step": "Applying finishing touches...", "progress": 75, "job_id": job_id},
+                )
+
+                watermarked_pil = apply_watermark(hd_pil, is_paid)
+
+                # Step 4: Save to S3 (90-100%)
+                logger.info(f"Job {job_id}: Saving HD export")
+                _update_export_job_sync(
+                    SessionMaker, job_id, "processing", current_step="Saving your masterpiece...", progress=90
+                )
+                self.update_state(
+                    state="PROGRESS",
+                    meta={"step": "Saving your masterpiece...", "progress": 90, "job_id": job_id},
+                )
+
+                # Encode with the export profile (high quality)
+                result_bytes = encode_image(watermarked_pil, "export").data
+
+                # Upload to S3
+                watermarked_s3_key = f"exports/{user_id}/{job_id}.jpg"
+                s3_client.upload_file(
+                    watermarked_s3_key,
+                    result_bytes,
+                    content_type="image/jpeg",
+                    server_side_encryption=False,
+                )
+                watermarked_renditions = write_renditions(s3_client, watermarked_pil, watermarked_s3_key)
+
+                result_width, result_height = watermarked_pil.size
+                file_size_bytes = len(result_bytes)
+
+        if master_renditions is None and (is_paid or watermarked_s3_key is None):
+            master_renditions = _existing_master_renditions(master_s3_key, output_size)
 
         # Calculate metrics
         processing_time_ms = int((time.time() - start_time) * 1000)
-        result_width, result_height = watermarked_pil.size
-        file_size_bytes = len(result_bytes)
 
-        # Update job as completed
-        _update_export_job_sync(
+        # Update job as completed (points at the master if paid meanwhile)
+        _complete_export_job_sync(
             SessionMaker,
             job_id,
-            "completed",
-            current_step="completed",
-            progress=100,
-            result_s3_key=result_s3_key,
+            master_s3_key=master_s3_key,
+            watermarked_s3_key=watermarked_s3_key,
+            master_renditions=master_renditions,
+            watermarked_renditions=watermarked_renditions,
             result_width=result_width,
             result_height=result_height,
             file_size_bytes=file_size_bytes,
@@ -319,6 +564,54 @@ def export_hd_image(
         raise
 
 
+def _complete_export_job_sync(
+    SessionMaker,
+    job_id: str,
+    master_s3_key: str,
+    watermarked_s3_key: str | None,
+    master_renditions: dict | None = None,
+    watermarked_renditions: dict | None = None,
+    **kwargs,
+):
+    """Mark export job completed, resolving the result against current payment state.
+
+    A purchase can land while the job is running; in that case the result
+    points at the clean master instead of the watermarked variant, and the
+    renditions manifest and file size follow it.
+
+    Args:
+        SessionMaker: Sync session maker
+        job_id: Job ID
+        master_s3_key: S3 key of the clean HD master
+        watermarked_s3_key: S3 key of the watermarked variant (None for paid exports)
+        master_renditions: Renditions manifest of the master
+        watermarked_renditions: Renditions manifest of the watermarked variant
+        **kwargs: Additional fields to update
+    """
+    with SessionMaker() as db:
+        job = db.query(ExportJob).filter(ExportJob.id == job_id).first()
+        if job:
+            job.status = "completed"
+            job.current_step = "completed"
+            job.progress = 100
+            job.master_s3_key = master_s3_key
+            if job.is_paid or watermarked_s3_key is None:
+                job.result_s3_key = master_s3_key
+                job.renditions = master_renditions
+            else:
+                job.result_s3_key = watermarked_s3_key
+                job.renditions = watermarked_renditions
+            for key, value in kwargs.items():
+                if hasattr(job, key):
+                    setattr(job, key, value)
+            if job.is_paid and watermarked_s3_key is not None:
+                # file_size_bytes was the watermarked variant's
+                master_size = s3_client.get_file_size(master_s3_key)
+                if master_size is not None:
+                    job.file_size_bytes = master_size
+            db.commit()
+
+
 def _update_export_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
     """Update export job status using sync session.
 
@@ -12,9 +12,15 @@ from PIL import Image
 
 from app.core.db import get_sync_session_maker
 from app.models.processing_job import ProcessingJob
+from app.services.encoding import encode_image
+from app.services.fusion_sources import refresh_best_artifacts
+from app.services.placeholders import compute_placeholders
+from app.services.renditions import all_rendition_keys, write_renditions
+from app.storage.deletion_queue import schedule_deletion_sync
 from app.storage.s3 import s3_client
 from app.workers.celery_app import celery_app
 from app.workers.models.enhancement_model import enhance_iris
+from app.workers.models.mask_codec import encode_mask
 from app.workers.models.reflection_model import remove_reflections
 from app.workers.models.segmentation_model import segment_iris
 
@@ -65,25 +71,13 @@ class RetryableProcessingTask(Task):
         SessionMaker = get_sync_session_maker()
         logger.error(f"Job {job_id} permanently failed after retries: {type(exc).__name__}: {exc}")
 
-        # Clean up partial S3 objects created during failed processing
+        # Queue any partial S3 objects for batched deletion
         if user_id:
             try:
-                # Try to delete any partial result files
                 result_s3_key = f"processed/{user_id}/{job_id}.jpg"
-                mask_s3_key = f"processed/{user_id}/{job_id}_mask.png"
-
-                try:
-                    s3_client.delete_file(result_s3_key)
-                    logger.info(f"Cleaned up partial result: {result_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial result to clean: {result_s3_key} - {e}")
-
-                try:
-                    s3_client.delete_file(mask_s3_key)
-                    logger.info(f"Cleaned up partial mask: {mask_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial mask to clean: {mask_s3_key} - {e}")
-
+                schedule_deletion_sync(
+                    [result_s3_key, f"processed/{user_id}/{job_id}_mask.png", *all_rendition_keys(result_s3_key)]
+                )
             except Exception as e:
                 logger.warning(f"Error during S3 cleanup for job {job_id}: {e}")
 
@@ -202,14 +196,20 @@ def process_iris_pipeline(self, job_id: str, photo_id: str, user_id: str):
 
         # Save processed image
         result_s3_key = f"processed/{user_id}/{job_id}.jpg"
-        _, buffer = cv2.imencode(".jpg", enhanced_image, [cv2.IMWRITE_JPEG_QUALITY, 95])
-        s3_client.upload_file(result_s3_key, buffer.tobytes(), content_type="image/jpeg", server_side_encryption=False)
+        encoded = encode_image(enhanced_image, "processed")
+        s3_client.upload_file(result_s3_key, encoded.data, content_type=encoded.content_type, server_side_encryption=False)
+        renditions = write_renditions(s3_client, enhanced_image, result_s3_key)
+        placeholders = compute_placeholders(enhanced_image)
 
         # Save mask
         mask_s3_key = f"processed/{user_id}/{job_id}_mask.png"
         _, mask_buffer = cv2.imencode(".png", mask)
         s3_client.upload_file(mask_s3_key, mask_buffer.tobytes(), content_type="image/png", server_side_encryption=False)
 
+        # Compact parametric copy stored on the job row, so fusion can
+        # rasterize the mask at any size without downloading the PNG
+        mask_vector = encode_mask(mask)
+
         # Calculate processing time
         processing_time_ms = int((time.time() - start_time) * 1000)
 
@@ -223,6 +223,9 @@ def process_iris_pipeline(self, job_id: str, photo_id: str, user_id: str):
             progress=100,
             result_s3_key=result_s3_key,
             mask_s3_key=mask_s3_key,
+            mask_vector=mask_vector,
+            renditions=renditions,
+            **placeholders,
             result_width=result_width,
             result_height=result_height,
             processing_time_ms=processing_time_ms,
@@ -291,6 +294,8 @@ def process_iris_pipeline(self, job_id: str, photo_id: str, user_id: str):
 def _update_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
     """Update job status using sync session.
 
+    Completing a job also refreshes the best-artifact columns of its photo.
+
     Args:
         SessionMaker: Sync session maker
         job_id: Job ID
@@ -304,4 +309,7 @@ def _update_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
             for key, value in kwargs.items():
                 if hasattr(job, key):
                     setattr(job, key, value)
+            if status == "completed":
+                db.flush()
+                refresh_best_artifacts(db, job.photo_id)
             db.commit()
@@ -0,0 +1,40 @@
+"""Background flush of the deferred object deletion queue."""
+
+import logging
+
+from botocore.exceptions import BotoCoreError, ClientError
+from redis.exceptions import RedisError
+
+from app.storage.deletion_queue import FLUSH_TASK, flush_pending
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+class DeletionIncompleteError(RuntimeError):
+    """Some queued objects could not be deleted (they stay queued)."""
+
+
+@celery_app.task(
+    bind=True,
+    name=FLUSH_TASK,
+    autoretry_for=(DeletionIncompleteError, ClientError, BotoCoreError, RedisError, ConnectionError, TimeoutError),
+    retry_backoff=True,
+    retry_backoff_max=600,  # 10 minutes max backoff
+    retry_jitter=True,
+    max_retries=5,
+)
+def flush_deletions(self) -> dict:
+    """Delete every queued object with batched DeleteObjects requests.
+
+    Safe to run concurrently and to retry: keys are only dequeued once
+    their delete succeeded, and deleting a missing object is a no-op.
+
+    Returns:
+        Dict with the number of objects deleted
+    """
+    deleted, failed = flush_pending()
+    logger.info(f"Deleted {deleted} queued objects")
+    if failed:
+        raise DeletionIncompleteError(f"{len(failed)} objects could not be deleted, e.g. {failed[0]}")
+    return {"deleted": deleted}
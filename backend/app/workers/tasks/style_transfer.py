@@ -5,11 +5,16 @@ import logging
 import time
 
 import cv2
-import numpy as np
 from celery import Task
 
 from app.core.db import get_sync_session_maker
 from app.models.style_job import StyleJob
+from app.services.encoding import FORMAT_EXTENSIONS, encode_image
+from app.services.fusion_sources import refresh_best_artifacts
+from app.services.placeholders import compute_placeholders
+from app.services.renditions import all_rendition_keys, write_renditions
+from app.storage.deletion_queue import schedule_deletion_sync
+from app.storage.image_cache import load_image
 from app.storage.s3 import s3_client
 from app.workers.celery_app import celery_app
 from app.workers.models.model_cache import ModelCache
@@ -38,6 +43,7 @@ class RetryableStyleTask(Task):
         """
         job_id = args[0] if args else kwargs.get("job_id")
         user_id = args[1] if len(args) > 1 else kwargs.get("user_id")
+        preview_format = args[5] if len(args) > 5 else kwargs.get("preview_format", "jpeg")
 
         if not job_id:
             return
@@ -45,24 +51,15 @@ class RetryableStyleTask(Task):
         SessionMaker = get_sync_session_maker()
         logger.error(f"Style job {job_id} permanently failed: {type(exc).__name__}: {exc}")
 
-        # Clean up partial S3 objects
+        # Queue any partial S3 objects for batched deletion
         if user_id:
             try:
-                preview_s3_key = f"styled/{user_id}/{job_id}_preview.jpg"
                 result_s3_key = f"styled/{user_id}/{job_id}.jpg"
-
-                try:
-                    s3_client.delete_file(preview_s3_key)
-                    logger.info(f"Cleaned up partial preview: {preview_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial preview to clean: {preview_s3_key} - {e}")
-
-                try:
-                    s3_client.delete_file(result_s3_key)
-                    logger.info(f"Cleaned up partial result: {result_s3_key}")
-                except Exception as e:
-                    logger.debug(f"No partial result to clean: {result_s3_key} - {e}")
-
+                schedule_deletion_sync([
+                    f"styled/{user_id}/{job_id}_preview.{FORMAT_EXTENSIONS[preview_format]}",
+                    result_s3_key,
+                    *all_rendition_keys(result_s3_key),
+                ])
             except Exception as e:
                 logger.warning(f"Error during S3 cleanup for style job {job_id}: {e}")
 
@@ -104,6 +101,7 @@ def apply_style_preset(
     photo_s3_key: str,
     style_preset_name: str,
     style_model_path: str,
+    preview_format: str = "jpeg",
 ):
     """Apply artistic style preset to an iris image.
 
@@ -115,6 +113,7 @@ def apply_style_preset(
         photo_s3_key: S3 key of source image (processed iris or original photo)
         style_preset_name: Style preset name (for model caching)
         style_model_path: Path to ONNX model weights
+        preview_format: Preview output format requested by the client (jpeg, webp, avif)
 
     Pipeline steps:
         1. Load source image from S3
@@ -137,13 +136,8 @@ def apply_style_preset(
             meta={"step": "Preparing your canvas...", "progress": 5, "job_id": job_id},
         )
 
-        # Download image from S3
-        image_bytes = s3_client.download_file(photo_s3_key)
-        image_array = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-
-        if image is None:
-            raise ValueError("Failed to decode source image")
+        # Load the decoded source through the worker disk cache
+        image = load_image(photo_s3_key, cv2.IMREAD_COLOR)
 
         _update_style_job_sync(
             SessionMaker, job_id, "processing", current_step="Preparing your canvas...", progress=10
@@ -206,13 +200,13 @@ def apply_style_preset(
             meta={"step": "Adding final touches...", "progress": 75, "job_id": job_id},
         )
 
-        # Upload preview (JPEG quality 70 for smaller file size)
-        preview_s3_key = f"styled/{user_id}/{job_id}_preview.jpg"
-        _, preview_buffer = cv2.imencode(".jpg", preview, [cv2.IMWRITE_JPEG_QUALITY, 70])
+        # Upload preview (quality-targeted, in the client's preferred format)
+        encoded_preview = encode_image(preview, "styled_preview", fmt=preview_format)
+        preview_s3_key = f"styled/{user_id}/{job_id}_preview.{encoded_preview.extension}"
         s3_client.upload_file(
             preview_s3_key,
-            preview_buffer.tobytes(),
-            content_type="image/jpeg",
+            encoded_preview.data,
+            content_type=encoded_preview.content_type,
             server_side_encryption=False,
         )
 
@@ -224,15 +218,17 @@ def apply_style_preset(
             meta={"step": "Adding final touches...", "progress": 85, "job_id": job_id},
         )
 
-        # Upload full result (JPEG quality 90)
+        # Upload full result (quality-targeted JPEG; later stages decode it)
         result_s3_key = f"styled/{user_id}/{job_id}.jpg"
-        _, result_buffer = cv2.imencode(".jpg", full_result, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        encoded_result = encode_image(full_result, "styled")
         s3_client.upload_file(
             result_s3_key,
-            result_buffer.tobytes(),
-            content_type="image/jpeg",
+            encoded_result.data,
+            content_type=encoded_result.content_type,
             server_side_encryption=False,
         )
+        renditions = write_renditions(s3_client, full_result, result_s3_key)
+        placeholders = compute_placeholders(full_result)
 
         _update_style_job_sync(
             SessionMaker, job_id, "processing", current_step="Almost done...", progress=90
@@ -254,6 +250,8 @@ def apply_style_preset(
             progress=100,
             preview_s3_key=preview_s3_key,
             result_s3_key=result_s3_key,
+            renditions=renditions,
+            **placeholders,
             result_width=result_width,
             result_height=result_height,
             processing_time_ms=processing_time_ms,
@@ -320,6 +318,8 @@ def apply_style_preset(
 def _update_style_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
     """Update style job status using sync session.
 
+    Completing a job also refreshes the best-artifact columns of its photo.
+
     Args:
         SessionMaker: Sync session maker
         job_id: Job ID
@@ -333,4 +333,7 @@ def _update_style_job_sync(SessionMaker, job_id: str, status: str, **kwargs):
             for key, value in kwargs.items():
                 if hasattr(job, key):
                     setattr(job, key, value)
+            if status == "completed":
+                db.flush()
+                refresh_best_artifacts(db, job.photo_id)
             db.commit()
@@ -0,0 +1,88 @@
+"""Upload finalization: verify a confirmed photo upload and write its thumbnails."""
+
+import logging
+
+from celery import Task
+
+from app.core.db import get_sync_session_maker
+from app.models.photo import Photo
+from app.services.fusion_sources import refresh_best_artifacts
+from app.services.upload_finalization import GALLERY_THUMBNAIL_SIZE, UploadRejected, finalize_object
+from app.storage.deletion_queue import schedule_deletion_sync
+from app.storage.s3 import s3_client
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+class RetryableFinalizationTask(Task):
+    """Base task class with retry configuration for upload finalization."""
+
+    autoretry_for = (ConnectionError, TimeoutError, RuntimeError)
+    retry_backoff = True
+    retry_backoff_max = 600  # 10 minutes max backoff
+    retry_jitter = True
+    max_retries = 3
+
+
+@celery_app.task(
+    bind=True,
+    base=RetryableFinalizationTask,
+    name="app.workers.tasks.upload_finalization.finalize_photo_upload",
+)
+def finalize_photo_upload(self, photo_id: str) -> dict:
+    """Verify an uploaded photo and record its server-side metadata and thumbnails.
+
+    Replaces the client-reported size and dimensions. A photo that fails
+    verification is marked "failed" and its object queued for deletion.
+    Safe to re-run: thumbnails are written to fixed keys.
+
+    Args:
+        photo_id: Photo ID
+
+    Returns:
+        Dict with photo_id and the resulting upload_status
+    """
+    SessionMaker = get_sync_session_maker()
+
+    with SessionMaker() as db:
+        photo = db.query(Photo).filter(Photo.id == photo_id).first()
+        if not photo:
+            logger.info(f"Photo {photo_id} deleted before finalization")
+            return {"photo_id": photo_id, "upload_status": None}
+        s3_key, user_id = photo.s3_key, photo.user_id
+
+    try:
+        finalized = finalize_object(s3_client, s3_key, user_id, photo_id)
+    except UploadRejected as e:
+        logger.warning(f"Rejected upload for photo {photo_id}: {e}")
+        with SessionMaker() as db:
+            photo = db.query(Photo).filter(Photo.id == photo_id).first()
+            if photo:
+                photo.upload_status = "failed"
+                db.commit()
+        schedule_deletion_sync([s3_key])
+        return {"photo_id": photo_id, "upload_status": "failed"}
+
+    with SessionMaker() as db:
+        photo = db.query(Photo).filter(Photo.id == photo_id).first()
+        if not photo:
+            # Deleted while we worked: the thumbnails are orphans
+            schedule_deletion_sync(finalized.thumbnail_keys.values())
+            return {"photo_id": photo_id, "upload_status": None}
+        photo.file_size = finalized.file_size
+        photo.width = finalized.width
+        photo.height = finalized.height
+        photo.content_type = finalized.content_type
+        photo.content_hash = finalized.content_hash
+        photo.thumbnail_s3_key = finalized.thumbnail_keys[GALLERY_THUMBNAIL_SIZE]
+        photo.blurhash = finalized.placeholders["blurhash"]
+        photo.placeholder = finalized.placeholders["placeholder"]
+        photo.perceptual_hash = finalized.perceptual_hash
+        photo.upload_status = "uploaded"
+        db.flush()
+        # The photo thumbnail is the fallback best thumbnail
+        refresh_best_artifacts(db, photo.id)
+        db.commit()
+
+    return {"photo_id": photo_id, "upload_status": "uploaded"}
@@ -0,0 +1 @@
+"""Performance benchmarks for worker image pipelines (run with python -m benchmarks.<name>)."""
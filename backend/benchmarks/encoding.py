@@ -0,0 +1,87 @@
+"""Benchmark quality-targeted encoding against the legacy fixed-quality JPEGs.
+
+For every artifact class, reports legacy bytes/encode time (cv2 JPEG at the
+previously hard-coded quality) next to the quality-targeted JPEG, WebP and
+AVIF output, with the chosen quality and full-image SSIM.
+
+Usage (from backend/):
+    python -m benchmarks.encoding [--image PATH]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from app.services.encoding import ENCODING_PROFILES, encode_image, get_encoding_stats, ssim, supported_formats
+
+# Artifact size each class is produced at by the worker tasks
+ARTIFACT_SIZES = {
+    "processed": 1024,
+    "styled": 1024,
+    "styled_preview": 256,
+    "ai_art": 1024,
+    "ai_art_preview": 256,
+    "export": 2048,
+    "fusion": 1024,
+    "fusion_thumb": 256,
+    "composition": 2048,
+    "composition_thumb": 256,
+}
+
+
+def _synthetic_iris(size: int = 1024) -> np.ndarray:
+    """Build a deterministic iris-like BGR test image (radial fibres, soft noise)."""
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[:size, :size]
+    dx, dy = xx - size / 2, yy - size / 2
+    radius = np.hypot(dx, dy) / (size / 2)
+    angle = np.arctan2(dy, dx)
+    fibres = np.sin(angle * 180 + np.sin(radius * 30) * 3) * 0.5 + 0.5
+    iris = fibres * (radius > 0.25) * (radius < 0.9)
+    image = np.stack([iris * 90 + 30, iris * 150 + 40, iris * 110 + 20], axis=-1)
+    image += cv2.GaussianBlur(rng.normal(0, 20, image.shape), (0, 0), 1.2)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image", default=None, help="Source image (default: synthetic iris)")
+    args = parser.parse_args()
+
+    source = cv2.imread(args.image) if args.image else _synthetic_iris(2048)
+    formats = supported_formats()[::-1]  # jpeg first
+
+    print(f"{'artifact':>18} {'format':>6} {'q':>3} {'bytes':>9} {'vs legacy':>9} {'ssim':>7} {'ms':>7}")
+    for artifact, size in ARTIFACT_SIZES.items():
+        image = cv2.resize(source, (size, size), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        legacy_quality = ENCODING_PROFILES[artifact].legacy_quality
+
+        start = time.perf_counter()
+        _, legacy = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, legacy_quality])
+        legacy_ms = (time.perf_counter() - start) * 1000
+        legacy_ssim = ssim(gray, cv2.imdecode(legacy, cv2.IMREAD_GRAYSCALE))
+        print(
+            f"{artifact:>18} {'legacy':>6} {legacy_quality:>3} {legacy.nbytes:>9} "
+            f"{'':>9} {legacy_ssim:>7.4f} {legacy_ms:>7.1f}"
+        )
+
+        for fmt in formats:
+            encoded = encode_image(image, artifact, fmt=fmt)
+            decoded = cv2.imdecode(np.frombuffer(encoded.data, np.uint8), cv2.IMREAD_GRAYSCALE)
+            full_ssim = ssim(gray, decoded) if decoded is not None else float("nan")
+            ratio = len(encoded.data) / legacy.nbytes
+            print(
+                f"{'':>18} {fmt:>6} {encoded.quality:>3} {len(encoded.data):>9} "
+                f"{ratio:>8.0%} {full_ssim:>7.4f} {encoded.encode_ms:>7.1f}"
+            )
+
+    print("\nIn-process encoding stats:")
+    for key, entry in get_encoding_stats().items():
+        print(f"  {key:>24}: {entry['mean_bytes']:>9.0f} bytes, {entry['mean_encode_ms']:.1f} ms/encode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Load test event-loop lag with blocking vs async storage calls.
+
+Runs a burst of concurrent request-like coroutines that each make storage
+calls (HEAD an object, then presign it), the way route handlers do,
+while a monitor coroutine measures how late the event loop wakes it up.
+"blocking" calls the sync S3Client from the coroutines (the previous
+behaviour); "async" awaits AsyncS3Client. Reports loop lag p50/p99/max and
+total wall time for each mode.
+
+Needs the S3 endpoint from settings (e.g. MinIO from docker-compose).
+
+Usage (from backend/):
+    python -m benchmarks.event_loop_lag [--requests 200] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.storage.async_s3 import async_s3_client
+from app.storage.s3 import s3_client
+
+# How often the monitor asks to be woken up
+TICK_SECONDS = 0.005
+
+
+async def _monitor(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how far past each tick the loop resumes us."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def _blocking_request(key: str) -> None:
+    s3_client.get_file_size(key)
+    s3_client.generate_presigned_url(key, expiry=3600)
+
+
+async def _async_request(key: str) -> None:
+    await async_s3_client.get_file_size(key)
+    await async_s3_client.generate_presigned_url(key, expiry=3600)
+
+
+async def _run(request, total: int, concurrency: int) -> tuple[list[float], float]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor(lags, stop))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            await request(f"benchmarks/event-loop-lag/{index}.jpg")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    return lags, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'mode':>9} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11} {'wall s':>7}")
+    for mode, request in (("blocking", _blocking_request), ("async", _async_request)):
+        lags, elapsed = asyncio.run(_run(request, args.requests, args.concurrency))
+        lag_ms = np.array(lags or [0.0]) * 1000
+        print(
+            f"{mode:>9} {np.percentile(lag_ms, 50):>11.1f} {np.percentile(lag_ms, 99):>11.1f} "
+            f"{lag_ms.max():>11.1f} {elapsed:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
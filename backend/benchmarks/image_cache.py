@@ -0,0 +1,73 @@
+"""Benchmark worker image loads with and without the decoded-image disk cache.
+
+Simulates a circle reusing the same artworks: uploads --sources PNG
+artworks to a temporary local storage backend, then loads all of them
+--rounds times, the way repeated fusions do. Reports mean milliseconds per
+load for the uncached path (download + decode every time) and the cached
+path, plus the cache's hit ratio and bytes saved. Validation is a local
+file check here, so on S3 each hit also costs one bodiless conditional GET.
+
+Usage (from backend/):
+    python -m benchmarks.image_cache [--sources 8] [--rounds 5] [--size 1024]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app.storage.image_cache import DecodedImageCache
+from app.storage.local import LocalStorageClient
+
+
+def _timed_rounds(cache: DecodedImageCache, keys: list[str], rounds: int) -> float:
+    """Return mean milliseconds per image load."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            cache.get(key, cv2.IMREAD_COLOR)
+    return (time.perf_counter() - start) * 1000 / (rounds * len(keys))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        storage = LocalStorageClient(root=Path(workdir) / "storage")
+        storage.ensure_bucket()
+        keys = []
+        for index in range(args.sources):
+            # Smooth noise compresses like a photo rather than like pure noise
+            noise = rng.integers(0, 256, (args.size // 8, args.size // 8, 3), dtype=np.uint8)
+            image = cv2.resize(noise, (args.size, args.size), interpolation=cv2.INTER_CUBIC)
+            keys.append(f"benchmarks/artwork-{index}.png")
+            storage.upload_file(keys[-1], cv2.imencode(".png", image)[1].tobytes(), "image/png")
+
+        uncached = DecodedImageCache(storage, Path(workdir) / "off", max_bytes=0)
+        cached = DecodedImageCache(storage, Path(workdir) / "cache", max_bytes=4 * 1024**3)
+
+        uncached_ms = _timed_rounds(uncached, keys, args.rounds)
+        cached_ms = _timed_rounds(cached, keys, args.rounds)
+        stats = cached.stats()
+
+    print(f"{'mode':>9} {'ms/load':>8}")
+    print(f"{'uncached':>9} {uncached_ms:>8.2f}")
+    print(f"{'cached':>9} {cached_ms:>8.2f}")
+    print(
+        f"hit ratio {stats['hit_ratio']:.2f}, "
+        f"{stats['bytes_saved'] / 1024**2:.1f} MiB saved, "
+        f"{stats['bytes_downloaded'] / 1024**2:.1f} MiB downloaded"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Tests for the fixed-point N-way alpha compositor."""
+
+import numpy as np
+import pytest
+
+from app.workers.models.alpha_composite import MAX_ERROR, alpha_composite
+
+
+def _layered(images, masks) -> np.ndarray:
+    """Exact float layering of each image over the running result, rounded once."""
+    result = images[0].astype(np.float64)
+    for image, mask in zip(images[1:], masks[1:]):
+        alpha = mask / 255.0
+        if image.ndim == 3:
+            alpha = alpha[..., np.newaxis]
+        result = result * (1.0 - alpha) + image * alpha
+    return np.round(result)
+
+
+def test_two_sources_exact():
+    """A single overlay matches the rounded float blend for every input."""
+    values = np.arange(256, dtype=np.uint8)
+    base, overlay, mask = (v.reshape(-1, 256) for v in np.meshgrid(values, values, values, indexing="ij"))
+
+    result = alpha_composite([base, overlay], [None, mask])
+
+    assert np.array_equal(result, _layered([base, overlay], [None, mask]))
+
+
+@pytest.mark.parametrize("count", [3, 4])
+def test_error_bound(count: int):
+    """N-way results stay within MAX_ERROR of the float layering."""
+    rng = np.random.default_rng(count)
+    images = [rng.integers(0, 256, (256, 256, 3), dtype=np.uint8) for _ in range(count)]
+    masks = [rng.integers(0, 256, (256, 256), dtype=np.uint8) for _ in range(count)]
+
+    result = alpha_composite(images, masks)
+
+    assert result.dtype == np.uint8
+    assert np.abs(result - _layered(images, masks)).max() <= MAX_ERROR
+
+
+def test_opaque_and_transparent_masks():
+    """Opaque overlays replace the base and transparent ones leave it alone."""
+    base = np.full((8, 8, 3), 10, dtype=np.uint8)
+    overlay = np.full((8, 8, 3), 200, dtype=np.uint8)
+    mask = np.zeros((8, 8), dtype=np.uint8)
+    mask[:, 4:] = 255
+
+    result = alpha_composite([base, overlay], [None, mask])
+
+    assert (result[:, :4] == 10).all()
+    assert (result[:, 4:] == 200).all()
+
+
+def test_in_place_output():
+    """Compositing into the base buffer gives the same result."""
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, (32, 32, 3), dtype=np.uint8) for _ in range(3)]
+    masks = [rng.integers(0, 256, (32, 32), dtype=np.uint8) for _ in range(3)]
+    expected = alpha_composite(images, masks)
+
+    base = images[0].copy()
+    alpha_composite([base] + images[1:], masks, out=base)
+
+    assert np.array_equal(base, expected)
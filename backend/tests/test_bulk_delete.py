@@ -0,0 +1,41 @@
+"""Tests for parallel prefix deletion over the local storage backend."""
+
+from app.services.account_deletion import account_prefixes
+from app.storage.bulk_delete import delete_all
+
+
+def test_deletes_every_account_prefix(storage):
+    """All of the user's objects go, in pages, and nobody else's."""
+    for prefix in account_prefixes("u"):
+        for i in range(30):
+            storage.upload_file(f"{prefix}{i}.jpg", b"x")
+    storage.upload_file("fusion/f1.jpg", b"x")
+    storage.upload_file("iris/other/keep.jpg", b"x")
+
+    reports = []
+    progress = delete_all(storage, account_prefixes("u"), ["fusion/f1.jpg"], workers=4, on_progress=reports.append)
+
+    assert progress.complete
+    assert progress.deleted == 30 * len(account_prefixes("u")) + 1
+    assert reports[-1].prefixes_done == len(account_prefixes("u"))
+    assert [obj["Key"] for obj in storage.list_objects("")] == ["iris/other/keep.jpg"]
+
+
+def test_objects_written_during_deletion_are_caught(storage, monkeypatch):
+    """A late write (a job still running) is removed by the verification pass."""
+    storage.upload_file("processed/u/1.jpg", b"x")
+    original = storage.delete_objects
+    writes = []
+
+    def delete_objects(keys):
+        failed = original(keys)
+        if not writes:
+            writes.append(storage.upload_file("processed/u/late.jpg", b"x"))
+        return failed
+
+    monkeypatch.setattr(storage, "delete_objects", delete_objects)
+
+    progress = delete_all(storage, ["processed/u/"])
+
+    assert progress.complete and progress.passes == 3
+    assert storage.list_objects("processed/u/") == []
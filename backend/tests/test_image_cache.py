@@ -0,0 +1,52 @@
+"""Tests for the worker decoded-image cache over the local storage backend."""
+
+import cv2
+import numpy as np
+
+from app.storage.image_cache import DecodedImageCache
+
+
+def _png(value: int) -> bytes:
+    image = np.full((8, 12, 3), value, dtype=np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+def test_hit_serves_read_only_memmap(storage, tmp_path):
+    """The second read is a validated hit that skips the download."""
+    storage.upload_file("a.png", _png(7), "image/png")
+    cache = DecodedImageCache(storage, tmp_path / "cache", max_bytes=1 << 20)
+
+    first = cache.get("a.png")
+    second = cache.get("a.png")
+
+    assert isinstance(second, np.memmap) and not second.flags.writeable
+    assert np.array_equal(first, second) and second[0, 0, 0] == 7
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["bytes_saved"] == storage.get_file_size("a.png")
+
+
+def test_changed_object_is_reloaded(storage, tmp_path):
+    """A new version of the object invalidates the cached pixels."""
+    storage.upload_file("a.png", _png(7), "image/png")
+    cache = DecodedImageCache(storage, tmp_path / "cache", max_bytes=1 << 20)
+    cache.get("a.png")
+
+    storage.upload_file("a.png", _png(200), "image/png")
+
+    assert cache.get("a.png")[0, 0, 0] == 200
+    assert cache.stats()["misses"] == 2
+
+
+def test_size_bound_evicts_least_recently_used(storage, tmp_path):
+    """Entries beyond max_bytes are evicted, oldest first."""
+    for name in ("a", "b", "c"):
+        storage.upload_file(f"{name}.png", _png(1), "image/png")
+    entry_bytes = 8 * 12 * 3 + 128  # pixels plus .npy header
+    cache = DecodedImageCache(storage, tmp_path / "cache", max_bytes=2 * entry_bytes)
+
+    for name in ("a", "b", "c"):
+        cache.get(f"{name}.png")
+
+    assert cache.stats()["evictions"] == 1
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
@@ -0,0 +1,46 @@
+"""Tests for the parametric iris mask encoding."""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.workers.models.mask_codec import decode_mask, encode_mask, mask_iou
+
+
+def _iris_mask(size: int = 1024, eyelid: bool = True) -> np.ndarray:
+    """Iris annulus with an off-center pupil and an optional eyelid cut."""
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv2.ellipse(mask, (size // 2 + 7, size // 2 - 3), (int(size * 0.33), int(size * 0.31)), 12, 0, 360, 255, -1)
+    cv2.circle(mask, (size // 2, size // 2 + 5), int(size * 0.1), 0, -1)
+    if eyelid:
+        cv2.rectangle(mask, (0, 0), (size, int(size * 0.25)), 0, -1)
+    return mask
+
+
+@pytest.mark.parametrize("eyelid", [False, True])
+def test_round_trip_iou(eyelid: bool):
+    """Decoding at native resolution reproduces the PNG mask."""
+    mask = _iris_mask(eyelid=eyelid)
+    png = cv2.imdecode(cv2.imencode(".png", mask)[1], cv2.IMREAD_GRAYSCALE)
+
+    encoded = encode_mask(png)
+    decoded = decode_mask(encoded)
+
+    assert decoded.shape == png.shape
+    assert mask_iou(png, decoded) >= 0.99
+    assert len(encoded) < 1024
+
+
+def test_rasterize_at_other_resolution():
+    """Decoding at a smaller size matches a nearest-neighbour resize."""
+    mask = _iris_mask()
+    decoded = decode_mask(encode_mask(mask), 512, 512)
+    reference = cv2.resize(mask, (512, 512), interpolation=cv2.INTER_NEAREST)
+
+    assert decoded.shape == (512, 512)
+    assert mask_iou(reference, decoded) >= 0.98
+
+
+def test_rejects_invalid_data():
+    with pytest.raises(ValueError):
+        decode_mask(b"not a mask")
@@ -0,0 +1,40 @@
+"""Tests for perceptual hashing of uploaded photos."""
+
+import cv2
+import numpy as np
+
+from app.services.perceptual_hash import MAX_DUPLICATE_DISTANCE, hamming_distance, perceptual_hash
+
+
+def _eye(seed: int) -> np.ndarray:
+    """A synthetic capture: dark pupil and textured iris on a skin-toned background."""
+    rng = np.random.default_rng(seed)
+    image = np.full((480, 640, 3), (150, 170, 200), dtype=np.uint8)
+    center = (320 + int(rng.integers(-60, 60)), 240 + int(rng.integers(-40, 40)))
+    cv2.circle(image, center, 150, (60, 90, 40), -1)
+    for _ in range(40):
+        angle = rng.uniform(0, 2 * np.pi)
+        end = (int(center[0] + 150 * np.cos(angle)), int(center[1] + 150 * np.sin(angle)))
+        cv2.line(image, center, end, tuple(int(c) for c in rng.integers(0, 255, 3)), 6)
+    cv2.circle(image, center, 50, (10, 10, 10), -1)
+    return image
+
+
+def test_recapture_is_near_duplicate():
+    """Re-encoding and a small exposure change stay within the duplicate distance."""
+    image = _eye(0)
+    recapture = cv2.imdecode(cv2.imencode(".jpg", cv2.convertScaleAbs(image, alpha=1.05, beta=5))[1], 1)
+
+    assert hamming_distance(perceptual_hash(image), perceptual_hash(recapture)) <= MAX_DUPLICATE_DISTANCE
+
+
+def test_different_captures_are_distinct():
+    """Different eyes are far apart."""
+    assert hamming_distance(perceptual_hash(_eye(0)), perceptual_hash(_eye(1))) > MAX_DUPLICATE_DISTANCE
+
+
+def test_hash_fits_bigint():
+    """Hashes are signed 64-bit and compare across the sign bit."""
+    value = perceptual_hash(_eye(2))
+    assert -(1 << 63) <= value < 1 << 63
+    assert hamming_distance(-1, 0) == 64
@@ -0,0 +1,32 @@
+"""Tests for inline BlurHash and tiny JPEG placeholders."""
+
+import base64
+import io
+
+import numpy as np
+from PIL import Image
+
+from app.services.placeholders import PLACEHOLDER_SIZE, blurhash_encode, compute_placeholders
+
+
+def test_blurhash_matches_reference():
+    """Output matches the reference encoder (woltapp/blurhash) for the same pixels."""
+    image = np.random.default_rng(1).integers(0, 256, (24, 32, 3), dtype=np.uint8)
+
+    assert blurhash_encode(image, 4, 3) == "L7G]En}@tK#w:{vftxRkn4KY$zU5"
+
+
+def test_compute_placeholders():
+    """The data URI decodes to a tiny JPEG with the artifact's aspect ratio."""
+    image = np.zeros((600, 900, 3), dtype=np.uint8)
+    image[..., 2] = 255  # red in BGR
+
+    placeholders = compute_placeholders(image)
+
+    assert len(placeholders["blurhash"]) == 4 + 2 * 4 * 3
+    prefix, encoded = placeholders["placeholder"].split(",", 1)
+    assert prefix == "data:image/jpeg;base64"
+    tiny = Image.open(io.BytesIO(base64.b64decode(encoded)))
+    assert tiny.size == (PLACEHOLDER_SIZE, round(PLACEHOLDER_SIZE * 600 / 900))
+    red, green, blue = tiny.convert("RGB").getpixel((10, 10))
+    assert red > 200 and green < 50 and blue < 50
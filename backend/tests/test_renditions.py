@@ -0,0 +1,39 @@
+"""Tests for result renditions over the local storage backend."""
+
+import cv2
+import numpy as np
+
+from app.services.renditions import rendition_key, rendition_keys, write_renditions
+
+
+def test_write_renditions(storage):
+    """Every size below the result is written, and the URL map points at them."""
+    image = np.random.default_rng(0).integers(0, 256, (600, 800, 3), dtype=np.uint8)
+
+    manifest = write_renditions(storage, image, "art/u/job.png")
+
+    assert manifest["sizes"] == [256, 512]
+    assert manifest["full"] == 800
+    for size in manifest["sizes"]:
+        for fmt in manifest["formats"]:
+            data = storage.download_file(rendition_key("art/u/job.png", size, fmt))
+            rendition = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            assert max(rendition.shape[:2]) == size
+
+    keys = rendition_keys("art/u/job.png", manifest)
+    assert keys[800] == "art/u/job.png"
+    assert keys[256] == rendition_key("art/u/job.png", 256, manifest["formats"][0])
+
+
+def test_rgbx_canvas(storage):
+    """The padding channel of RGBX canvases is dropped."""
+    canvas = np.full((1200, 1200, 4), 255, dtype=np.uint8)
+
+    manifest = write_renditions(storage, canvas, "exports/u/master.jpg", bgr=False)
+
+    assert manifest["sizes"] == [256, 512, 1024]
+
+
+def test_no_manifest():
+    """Jobs without renditions have no URL map."""
+    assert rendition_keys("art/u/job.png", None) == {}
@@ -0,0 +1,46 @@
+"""Tests for upload verification and thumbnail generation over the local storage backend."""
+
+import hashlib
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.upload_finalization import (
+    THUMBNAIL_SIZES,
+    UploadRejected,
+    finalize_object,
+    reduced_decode_flag,
+)
+
+
+def test_finalize_jpeg(storage):
+    """Server-side metadata, hash and every thumbnail size are produced."""
+    image = np.random.default_rng(0).integers(0, 256, (1500, 2400, 3), dtype=np.uint8)
+    data = cv2.imencode(".jpg", image)[1].tobytes()
+    storage.upload_file("iris/u/p.jpg", data, "image/jpeg")
+
+    finalized = finalize_object(storage, "iris/u/p.jpg", "u", "p")
+
+    assert (finalized.width, finalized.height, finalized.file_size) == (2400, 1500, len(data))
+    assert finalized.content_type == "image/jpeg"
+    assert finalized.content_hash == hashlib.sha256(data).hexdigest()
+    assert finalized.placeholders["placeholder"].startswith("data:image/jpeg;base64,")
+    for size in THUMBNAIL_SIZES:
+        thumbnail = cv2.imdecode(np.frombuffer(storage.download_file(finalized.thumbnail_keys[size]), np.uint8), 1)
+        assert max(thumbnail.shape[:2]) == size
+
+
+def test_rejects_non_image(storage):
+    """Objects that don't parse as JPEG or PNG are rejected."""
+    storage.upload_file("iris/u/p.jpg", b"not an image" * 100, "image/jpeg")
+
+    with pytest.raises(UploadRejected):
+        finalize_object(storage, "iris/u/p.jpg", "u", "p")
+
+
+def test_reduced_decode_keeps_largest_thumbnail():
+    """The decode scale never drops the long edge below the largest thumbnail."""
+    assert reduced_decode_flag(4096, 3072, 512) == cv2.IMREAD_REDUCED_COLOR_8
+    assert reduced_decode_flag(2400, 1500, 512) == cv2.IMREAD_REDUCED_COLOR_4
+    assert reduced_decode_flag(600, 400, 512) == cv2.IMREAD_COLOR